@@ -0,0 +1 @@
+"""Benchmarks for the ICAET MCP server."""
@@ -0,0 +1,333 @@
+"""Load-testing benchmark for the ICAET query path.
+
+Drives configurable concurrency and question mixes against a local stand-in
+server and reports latency percentiles, throughput, CPU time and memory for
+three targets:
+
+- ``impl``: ``_query_impl``, the upstream path (disk cache, limiter, breaker,
+  retries) without the in-memory caches or coalescing
+- ``cached``: ``_cached_query``, the whole query path the ``query`` tool uses
+- ``mcp``: the ``query`` tool through a full in-memory fastmcp client session
+
+Usage:
+    python -m benchmarks.run_benchmark --concurrency 1,8,32 --requests 500 --output bench.json
+    python -m benchmarks.run_benchmark --output new.json --baseline bench.json
+
+The ICAET_* environment is used as-is, except that credentials, the API URL
+and the disk cache and search index locations are pointed at benchmark
+values, logging defaults to WARNING and the token bucket defaults to
+unlimited.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(-(-percent * len(ordered) // 100)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def current_rss_mb() -> float:
+    """Return the current resident set size in MiB, or peak RSS where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def build_questions(requests: int, unique: int) -> list[str]:
+    """Build a deterministic request mix with the given number of distinct questions."""
+    unique = max(min(unique, requests), 1)
+    return [f"Benchmark question {i % unique}?" for i in range(requests)]
+
+
+def configure_environment(url: str, cache_dir: str) -> None:
+    """Point the server configuration at the stand-in before icsaet_mcp is imported.
+    
+    Cache warm-up and hot refresh are turned off so that no background
+    upstream calls run alongside the measured requests.
+    """
+    os.environ.setdefault("ICAET_API_KEY", "bench-api-key-000000")
+    os.environ.setdefault("USER_EMAIL", "bench@example.com")
+    os.environ.setdefault("ICAET_LOG_LEVEL", "WARNING")
+    os.environ.setdefault("ICAET_RATE_LIMIT_RPS", "0")
+    os.environ["ICAET_API_URL"] = f"{url.rstrip('/')}/query"
+    os.environ["ICAET_DISK_CACHE_PATH"] = str(Path(cache_dir) / "answers.db")
+    os.environ["ICAET_SEARCH_INDEX_PATH"] = str(Path(cache_dir) / "answers.json.gz")
+    os.environ["ICAET_WARMUP_ENABLED"] = "false"
+    os.environ["ICAET_HOT_REFRESH_ENABLED"] = "false"
+
+
+def reset_state() -> None:
+    """Clear caches, adaptive state, metrics, the tracer and the replay archive so every run starts cold."""
+    from icsaet_mcp.cache import reset_response_cache
+    from icsaet_mcp.circuit_breaker import reset_circuit_breaker
+    from icsaet_mcp.disk_cache import close_disk_cache, default_cache_path
+    from icsaet_mcp.hedging import reset_hedger
+    from icsaet_mcp.metrics import reset_metrics
+    from icsaet_mcp.negative_cache import reset_negative_cache
+    from icsaet_mcp.popularity import reset_popularity_tracker
+    from icsaet_mcp.ratelimit import reset_upstream_limiter
+    from icsaet_mcp.replay import reset_replay_archive
+    from icsaet_mcp.search_index import close_search_index, default_index_path
+    from icsaet_mcp.semantic_cache import reset_semantic_cache
+    from icsaet_mcp.tracing import reset_tracer
+    
+    reset_response_cache()
+    reset_semantic_cache()
+    reset_negative_cache()
+    reset_popularity_tracker()
+    close_disk_cache()
+    for suffix in ("", "-wal", "-shm"):
+        path = Path(f"{default_cache_path()}{suffix}")
+        if path.exists():
+            path.unlink()
+    close_search_index()
+    default_index_path().unlink(missing_ok=True)
+    reset_upstream_limiter()
+    reset_hedger()
+    reset_circuit_breaker()
+    reset_metrics()
+    reset_tracer()
+    reset_replay_archive()
+
+
+async def _drive(call, questions: list[str], concurrency: int) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for question in questions:
+        queue.put_nowait(question)
+    
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            try:
+                question = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                ok = await call(question)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+    
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def run_target(target: str, questions: list[str], concurrency: int, warmup: int) -> dict:
+    """Run one benchmark configuration and return its measurements."""
+    from icsaet_mcp import http_client
+    from icsaet_mcp.server import ICAET_API_KEY, USER_EMAIL, mcp
+    from icsaet_mcp.tools import _cached_query, _query_impl
+    
+    reset_state()
+    http_client.reset_client_stats()
+    
+    if target in ("impl", "cached"):
+        query = _query_impl if target == "impl" else _cached_query
+        
+        async def call(question: str) -> bool:
+            result = await query(question, ICAET_API_KEY, USER_EMAIL)
+            return isinstance(result, dict) and "error" not in result
+        
+        measured = await _measure(call, questions, concurrency, warmup)
+    else:
+        from fastmcp import Client
+        
+        async with Client(mcp) as client:
+            async def call(question: str) -> bool:
+                result = await client.call_tool("query", {"question": question}, raise_on_error=False)
+                return not result.is_error and "error" not in (result.data or {})
+            
+            measured = await _measure(call, questions, concurrency, warmup)
+    
+    await http_client.aclose_client()
+    measured.update({
+        "target": target,
+        "concurrency": concurrency,
+        "requests": len(questions),
+        "unique_questions": len(set(questions)),
+        "connections": http_client.get_client_stats()
+    })
+    return measured
+
+
+async def _measure(call, questions: list[str], concurrency: int, warmup: int) -> dict:
+    if warmup:
+        await _drive(call, [f"Warmup question {i}?" for i in range(warmup)], concurrency)
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    latencies, errors = await _drive(call, questions, concurrency)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return {
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "max": round(max(latencies, default=0.0) * 1000, 3)
+        },
+        "rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(cpu, 4),
+        "rss_mb": round(current_rss_mb(), 2),
+        "errors": errors
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Compare results to a baseline run and return a description of each regression."""
+    previous = {(r["target"], r["concurrency"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get((result["target"], result["concurrency"]))
+        if base is None:
+            continue
+        label = f"{result['target']} c={result['concurrency']}"
+        base_p95 = base["latency_ms"]["p95"]
+        new_p95 = result["latency_ms"]["p95"]
+        if base_p95 and new_p95 > base_p95 * (1 + tolerance):
+            regressions.append(f"{label}: p95 {base_p95:.2f} ms -> {new_p95:.2f} ms")
+        if base["rps"] and result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{label}: rps {base['rps']:.1f} -> {result['rps']:.1f}")
+    return regressions
+
+
+def format_table(results: list[dict]) -> str:
+    """Render results as a fixed-width text table."""
+    lines = [
+        f"{'target':<6} {'conc':>5} {'reqs':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'rps':>9} {'cpu s':>7} {'rss MB':>8} {'errors':>6}"
+    ]
+    for r in results:
+        lat = r["latency_ms"]
+        lines.append(
+            f"{r['target']:<6} {r['concurrency']:>5} {r['requests']:>6} {lat['p50']:>9.2f} "
+            f"{lat['p95']:>9.2f} {lat['p99']:>9.2f} {r['rps']:>9.1f} {r['cpu_seconds']:>7.2f} "
+            f"{r['rss_mb']:>8.1f} {r['errors']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def start_standin(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    """Start the mock ICAET server in a child process and wait until it is ready."""
+    command = [sys.executable, "-m", "tests.mock_server", "--latency-seconds", str(args.latency)]
+    command += shlex.split(args.server_args)
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline().strip()
+    if not line.startswith("READY "):
+        process.kill()
+        raise RuntimeError(f"Stand-in server failed to start: {line!r}")
+    return process, line.split(" ", 1)[1]
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    """Run every requested target and concurrency level."""
+    questions = build_questions(args.requests, args.unique or args.requests)
+    results = []
+    for target in args.targets:
+        for concurrency in args.concurrency:
+            results.append(await run_target(target, questions, concurrency, args.warmup))
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "unique_questions": args.unique or args.requests,
+            "standin_latency": args.latency,
+            "server_args": args.server_args
+        },
+        "results": results
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the ICAET query path")
+    parser.add_argument("--targets", default="impl,cached,mcp", help="Comma-separated targets: impl, cached, mcp")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per run")
+    parser.add_argument("--unique", type=int, default=0, help="Distinct questions in the mix (default: all unique)")
+    parser.add_argument("--warmup", type=int, default=10, help="Uncounted warmup requests per run")
+    parser.add_argument("--latency", type=float, default=0.005, help="Stand-in server latency in seconds")
+    parser.add_argument("--server-args", default="", help="Extra mock server options, e.g. \"--latency lognormal\"")
+    parser.add_argument("--url", help="Use an already running mock server at this base URL")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a previous JSON result and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression as a fraction")
+    args = parser.parse_args(argv)
+    args.targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    args.concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    unknown = set(args.targets) - {"impl", "cached", "mcp"}
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_standin(args)
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            configure_environment(url, cache_dir)
+            report = asyncio.run(run_benchmark(args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+    
+    print(format_table(report["results"]))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(report["results"], baseline["results"], args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""In-memory LRU + TTL cache for query responses."""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from .structured_logging import get_logger
+from .utils import env_bool, env_float, env_int, normalize_question
+
+logger = get_logger(__name__)
+
+
+def cache_key(question: str, user_email: str) -> str:
+    """Build a cache key from the normalized question and user email."""
+    raw = f"{user_email}\x00{normalize_question(question)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _serialize(value: dict) -> bytes:
+    """Canonical JSON bytes of a value; their length approximates its memory cost."""
+    try:
+        return json.dumps(value, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    except (TypeError, ValueError):
+        return repr(value).encode("utf-8")
+
+
+def content_hash(value: dict) -> str:
+    """Hash of a value's canonical JSON; equal answers hash equal regardless of key order."""
+    return hashlib.sha256(_serialize(value)).hexdigest()
+
+
+class CacheEntry(NamedTuple):
+    """A cached value with its expiry times, validators and refresh backoff."""
+    
+    expires_at: float
+    stale_at: float
+    size: int
+    value: dict
+    etag: str | None
+    digest: str
+    refresh_failures: int = 0
+    retry_at: float = 0.0
+
+
+class Revalidation:
+    """Conditional-request state threaded through one upstream fetch.
+    
+    cached is the stale answer being refreshed, or None for an ordinary
+    fetch; if_none_match is sent as If-None-Match when set. refresh makes
+    the fetch skip the disk cache and go to the upstream; it is implied by
+    cached. After the fetch, etag holds the ETag of the response and
+    not_modified is True if the upstream answered 304 Not Modified.
+    """
+    
+    def __init__(self, cached: dict | None = None, if_none_match: str | None = None, refresh: bool = False):
+        self.cached = cached
+        self.if_none_match = if_none_match
+        self.refresh = refresh or cached is not None
+        self.etag: str | None = None
+        self.not_modified = False
+
+
+class ResponseCache:
+    """Bounded LRU cache with a per-entry TTL and an optional soft TTL.
+    
+    Entries are evicted least-recently-used first whenever either the entry
+    count or the total approximate byte size exceeds its limit. Past
+    soft_ttl an entry is still returned but reported stale, so the caller
+    can serve it while refreshing it in the background; past ttl it is gone.
+    After a failed refresh the entry is not refreshed again for
+    refresh_backoff seconds, doubling with each consecutive failure up to
+    max_refresh_backoff.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 5 * 1024 * 1024,
+        ttl: float = 3600.0,
+        soft_ttl: float | None = None,
+        refresh_backoff: float = 30.0,
+        max_refresh_backoff: float = 600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.soft_ttl = soft_ttl
+        self.refresh_backoff = refresh_backoff
+        self.max_refresh_backoff = max_refresh_backoff
+        self._clock = clock
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> dict | None:
+        """Return a cached value, or None if missing or expired."""
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else None
+    
+    def get_entry(self, key: str) -> CacheEntry | None:
+        """Return a cached entry, or None if missing or expired; check is_stale() on it."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        now = self._clock()
+        if now >= entry.expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if now >= entry.stale_at:
+            self.stale_hits += 1
+        return entry
+    
+    def is_stale(self, entry: CacheEntry) -> bool:
+        """Whether an entry is past its soft TTL and should be refreshed."""
+        return self._clock() >= entry.stale_at
+    
+    def refresh_due(self, entry: CacheEntry) -> bool:
+        """Whether the backoff after a failed refresh of an entry, if any, has passed."""
+        return self._clock() >= entry.retry_at
+    
+    def refresh_failed(self, key: str) -> float | None:
+        """Back off refreshing an entry after a failed attempt.
+        
+        Returns:
+            Seconds until the entry may be refreshed again, or None if the
+            key is no longer cached
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        failures = entry.refresh_failures + 1
+        delay = min(self.refresh_backoff * 2 ** (failures - 1), self.max_refresh_backoff)
+        self._entries[key] = entry._replace(refresh_failures=failures, retry_at=self._clock() + delay)
+        return delay
+    
+    def peek(self, key: str) -> CacheEntry | None:
+        """Return an unexpired entry without counting a hit or refreshing its LRU position."""
+        entry = self._entries.get(key)
+        if entry is None or self._clock() >= entry.expires_at:
+            return None
+        return entry
+    
+    def expires_in(self, entry: CacheEntry) -> float:
+        """Seconds until an entry reaches its hard TTL."""
+        return entry.expires_at - self._clock()
+    
+    def set(self, key: str, value: dict, ttl: float | None = None, etag: str | None = None) -> bool:
+        """Store a value, evicting old entries as needed.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Hard TTL overriding the cache default
+            etag: Upstream ETag to send when revalidating the entry
+            
+        Returns:
+            False if the value is larger than the whole cache and was not stored
+        """
+        data = _serialize(value)
+        size = len(data)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        now = self._clock()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        stale_at = min(now + self.soft_ttl, expires_at) if self.soft_ttl else expires_at
+        self._entries[key] = CacheEntry(expires_at, stale_at, size, value, etag, hashlib.sha256(data).hexdigest())
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+    
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        if key in self._entries:
+            self._remove(key)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._bytes = 0
+    
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key).size
+    
+    def stats(self) -> dict:
+        """Return hit, miss and size counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+_response_cache: ResponseCache | None = None
+_response_cache_loaded = False
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the process-wide response cache, or None if caching is disabled."""
+    global _response_cache, _response_cache_loaded
+    if not _response_cache_loaded:
+        _response_cache_loaded = True
+        if env_bool("ICAET_CACHE_ENABLED", True):
+            _response_cache = ResponseCache(
+                max_entries=env_int("ICAET_CACHE_MAX_ENTRIES", 256),
+                max_bytes=env_int("ICAET_CACHE_MAX_BYTES", 5 * 1024 * 1024),
+                ttl=env_float("ICAET_CACHE_TTL", 3600.0),
+                soft_ttl=env_float("ICAET_CACHE_SOFT_TTL", 0.0) or None,
+                refresh_backoff=env_float("ICAET_CACHE_REFRESH_BACKOFF", 30.0),
+                max_refresh_backoff=env_float("ICAET_CACHE_REFRESH_BACKOFF_MAX", 600.0)
+            )
+            logger.info(
+                "Response cache enabled",
+                max_entries=_response_cache.max_entries,
+                max_bytes=_response_cache.max_bytes,
+                ttl=_response_cache.ttl,
+                soft_ttl=_response_cache.soft_ttl
+            )
+    return _response_cache
+
+
+def reset_response_cache() -> None:
+    """Drop the process-wide cache so it is rebuilt from the environment on next use."""
+    global _response_cache, _response_cache_loaded
+    _response_cache = None
+    _response_cache_loaded = False
@@ -0,0 +1,219 @@
+"""Circuit breaker that fails fast while the upstream is unhealthy."""
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable
+
+from .structured_logging import get_logger
+from .utils import env_bool, env_float, env_int
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the breaker is open."""
+    
+    def __init__(self, retry_in: float):
+        super().__init__(f"Circuit breaker open, upstream unavailable (retry in {retry_in:.0f}s)")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker driven by a rolling outcome window.
+    
+    Outcomes from the last window seconds are kept. Once at least min_calls
+    are in the window, the breaker opens if the error rate reaches
+    error_rate or the share of calls slower than slow_call_seconds reaches
+    slow_call_rate. After open_seconds it lets half_open_calls probes
+    through; they close the breaker if all succeed and reopen it otherwise.
+    """
+    
+    def __init__(
+        self,
+        window: float = 30.0,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.window = window
+        self.min_calls = max(min_calls, 1)
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(half_open_calls, 1)
+        self._clock = clock
+        self._outcomes: deque[tuple[float, bool, bool]] = deque()
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.opened = 0
+        self.rejected = 0
+    
+    def allow(self) -> bool:
+        """Return True if a call may go upstream now, reserving a probe when half-open."""
+        if self.state == OPEN:
+            if self._clock() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight + self._probe_successes >= self.half_open_calls:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+    
+    def retry_in(self) -> float:
+        """Seconds until the breaker will allow probe calls again."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self.open_seconds - (self._clock() - self._opened_at), 0.0)
+    
+    def record(self, success: bool, latency: float) -> None:
+        """Record the outcome of an allowed call."""
+        now = self._clock()
+        slow = latency >= self.slow_call_seconds
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+            if not success or slow:
+                self._trip(reason="probe failed", latency=round(latency, 3))
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._transition(CLOSED)
+            return
+        
+        self._outcomes.append((now, not success, slow))
+        self._prune(now)
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            error_rate, slow_rate = self._rates()
+            if error_rate >= self.error_rate or slow_rate >= self.slow_call_rate:
+                self._trip(error_rate=round(error_rate, 2), slow_rate=round(slow_rate, 2), calls=len(self._outcomes))
+    
+    def release(self) -> None:
+        """Give back a half-open probe whose call was cancelled before completing."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+    
+    def _prune(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+    
+    def _rates(self) -> tuple[float, float]:
+        calls = len(self._outcomes)
+        if not calls:
+            return 0.0, 0.0
+        errors = sum(1 for _, failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, _, is_slow in self._outcomes if is_slow)
+        return errors / calls, slow / calls
+    
+    def _trip(self, **fields: Any) -> None:
+        self.opened += 1
+        self._opened_at = self._clock()
+        self._transition(OPEN)
+        logger.warning("Circuit breaker opened", **fields)
+    
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+        if state != OPEN:
+            logger.info("Circuit breaker state changed", previous=previous, state=state)
+    
+    def stats(self) -> dict:
+        """Return the breaker state and rolling window rates."""
+        self._prune(self._clock())
+        error_rate, slow_rate = self._rates()
+        return {
+            "state": self.state,
+            "calls": len(self._outcomes),
+            "error_rate": round(error_rate, 4),
+            "slow_rate": round(slow_rate, 4),
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_in_seconds": round(self.retry_in(), 3)
+        }
+
+
+class BreakerGuard:
+    """Async context manager that checks the breaker and records the call outcome."""
+    
+    def __init__(self, breaker: CircuitBreaker | None):
+        self._breaker = breaker
+        self._start = 0.0
+        self.status_code: int | None = None
+    
+    def observe(self, response: "httpx.Response") -> None:
+        """Record the status code of the upstream response."""
+        self.status_code = response.status_code
+    
+    def start(self) -> None:
+        """Restart the latency clock, once the call has waited its turn and goes upstream."""
+        self._start = time.monotonic()
+    
+    async def __aenter__(self) -> "BreakerGuard":
+        if self._breaker is not None and not self._breaker.allow():
+            raise CircuitOpenError(self._breaker.retry_in())
+        self._start = time.monotonic()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        if self._breaker is None:
+            return
+        latency = time.monotonic() - self._start
+        if exc_type is None:
+            self._breaker.record(self.status_code is None or self.status_code < 500, latency)
+        elif issubclass(exc_type, asyncio.CancelledError):
+            self._breaker.release()
+        else:
+            self._breaker.record(False, latency)
+
+
+_breaker: CircuitBreaker | None = None
+_breaker_loaded = False
+
+
+def get_circuit_breaker() -> CircuitBreaker | None:
+    """Return the process-wide circuit breaker, or None if disabled."""
+    global _breaker, _breaker_loaded
+    if not _breaker_loaded:
+        _breaker_loaded = True
+        if env_bool("ICAET_BREAKER_ENABLED", True):
+            _breaker = CircuitBreaker(
+                window=env_float("ICAET_BREAKER_WINDOW", 30.0),
+                min_calls=env_int("ICAET_BREAKER_MIN_CALLS", 5),
+                error_rate=env_float("ICAET_BREAKER_ERROR_RATE", 0.5),
+                slow_call_seconds=env_float("ICAET_BREAKER_SLOW_CALL_SECONDS", 10.0),
+                slow_call_rate=env_float("ICAET_BREAKER_SLOW_CALL_RATE", 0.8),
+                open_seconds=env_float("ICAET_BREAKER_OPEN_SECONDS", 30.0),
+                half_open_calls=env_int("ICAET_BREAKER_HALF_OPEN_CALLS", 1)
+            )
+    return _breaker
+
+
+def breaker_guard() -> BreakerGuard:
+    """Return a guard for one upstream call using the process-wide breaker."""
+    return BreakerGuard(get_circuit_breaker())
+
+
+def reset_circuit_breaker() -> None:
+    """Drop the process-wide breaker so it is rebuilt from the environment on next use."""
+    global _breaker, _breaker_loaded
+    _breaker = None
+    _breaker_loaded = False
@@ -0,0 +1,157 @@
+"""Splitting of multi-part and comparison questions and merging of their answers."""
+
+import json
+import re
+
+from .search_index import answer_text
+
+_QUESTION_WORDS = r"(?:what|how|why|who|whom|which|when|where|is|are|do|does|did|can|could|should|would|will)"
+_SENTENCE = re.compile(r"(?<=[?;])\s+|\n+")
+_ENUMERATION = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+_JOINED_QUESTION = re.compile(rf",?\s+(?:and|also|plus)\s+(?={_QUESTION_WORDS}\b)", re.IGNORECASE)
+_COMPARISON = re.compile(
+    r"\b(?:compare[sd]?|comparing|contrast|differences?\s+between)\s+(?P<a>.+?)\s+"
+    r"(?:and|with|to|vs\.?|versus)\s+(?P<b>.+?)[\s?.!]*$",
+    re.IGNORECASE
+)
+_ASKS = re.compile(
+    rf"^(?:{_QUESTION_WORDS}|tell|summari[sz]e|explain|describe|list|give|show|compare)\b",
+    re.IGNORECASE
+)
+_WORD = re.compile(r"[a-z']+")
+# A preposition that starts a qualifier ("the talks by X", "X for small
+# teams"); when only one side of a comparison has one, both sides share it.
+_QUALIFIER = re.compile(
+    r"\b(?:by|of|from|on|about|in|for|at|according to|regarding|during|within|among|across)\b",
+    re.IGNORECASE
+)
+# Words that show a comparison side is a clause rather than a noun phrase,
+# as in "compare what Alice and Bob said", which is not split.
+_CLAUSE_WORDS = frozenset("""
+    what how why who whom whose which when where is are was were do does did said say says talked think thought
+""".split())
+
+# Words that point back into an earlier clause; a sub-question containing
+# one is sent with that clause as context so it still makes sense alone.
+_ANAPHORA = frozenset("""
+    former he her him his it its latter she such that their theirs them these they this those which whose
+""".split())
+
+MIN_PART_WORDS = 3
+
+
+def _as_question(text: str) -> str:
+    """Capitalize text and end it with a question mark."""
+    text = text.strip().rstrip(",.;:!? ")
+    return text[:1].upper() + text[1:] + "?" if text else ""
+
+
+def _split_joined(sentence: str) -> list[str]:
+    """Split "How does X work and what does Y cost?" into its two questions."""
+    pieces = [piece for piece in _JOINED_QUESTION.split(sentence) if piece.strip()]
+    if len(pieces) < 2 or any(len(_WORD.findall(piece.lower())) < MIN_PART_WORDS for piece in pieces):
+        return [sentence]
+    return [_as_question(piece) for piece in pieces]
+
+
+def _with_context(parts: list[str]) -> list[str]:
+    """Append the first part as context to later parts that refer back to it."""
+    context = parts[0].rstrip("?")
+    return parts[:1] + [
+        f"{part} (context: {context})" if _ANAPHORA.intersection(_WORD.findall(part.lower())) else part
+        for part in parts[1:]
+    ]
+
+
+def _comparison_parts(match: re.Match) -> list[str] | None:
+    """Turn "compare A and B" into one question per side, or None if a side is not a noun phrase."""
+    a, b = match.group("a").strip(), match.group("b").strip()
+    prefix = suffix = ""
+    a_qualifiers = list(_QUALIFIER.finditer(a))
+    b_qualifier = _QUALIFIER.search(b)
+    if a_qualifiers and b_qualifier is None:
+        last = a_qualifiers[-1]
+        prefix, a = a[:last.end()] + " ", a[last.end():].strip()
+    elif b_qualifier is not None and not a_qualifiers:
+        b, suffix = b[:b_qualifier.start()].strip(), " " + b[b_qualifier.start():].strip()
+    if not a or not b or _CLAUSE_WORDS.intersection(_WORD.findall(f"{a} {b}".lower())):
+        return None
+    return [_as_question(f"What was said about {prefix}{side}{suffix}") for side in (a, b)]
+
+
+def split_question(question: str, max_parts: int = 4) -> list[str]:
+    """Split a compound question into independent sub-questions.
+    
+    Separate sentences, numbered or bulleted lines, questions joined with
+    "and what/how/why/..." and "compare A and B" comparisons are split; a
+    qualifier on one side of a comparison ("the talks by A and B", "A and
+    B for small teams") is shared by both sides.
+    Anything else returns the question unchanged as the only part, as does
+    a split with more than max_parts parts or with a part that is not a
+    question or request, or is shorter than MIN_PART_WORDS words, since
+    such a part is usually context for the others. A later part that
+    refers back with a pronoun ("it", "they", ...) gets the first part
+    appended as context.
+    """
+    sentences = [_ENUMERATION.sub("", s).strip() for s in _SENTENCE.split(question.strip())]
+    sentences = [s for s in sentences if s]
+    parts = []
+    for sentence in sentences:
+        parts.extend(_split_joined(sentence))
+    
+    if len(parts) == 1:
+        match = _COMPARISON.search(parts[0])
+        if match:
+            parts = _comparison_parts(match) or parts
+    
+    if len(parts) < 2 or len(parts) > max_parts:
+        return [question]
+    for part in parts:
+        if len(_WORD.findall(part.lower())) < MIN_PART_WORDS or not (part.endswith("?") or _ASKS.match(part)):
+            return [question]
+    return _with_context(parts)
+
+
+def _source_key(source: object) -> str:
+    return source if isinstance(source, str) else json.dumps(source, sort_keys=True, default=str)
+
+
+def merge_answers(question: str, results: list[tuple[str, dict]]) -> dict:
+    """Merge the results of the sub-questions of question into one response.
+    
+    Args:
+        question: The original question
+        results: (sub-question, result) pairs in order
+        
+    Returns:
+        Dictionary with the combined answer text, the sources of all parts
+        without duplicates, and a "parts" list attributing each answer and
+        its sources to its sub-question; error dict if every part failed
+    """
+    errors = [result["error"] for _, result in results if "error" in result]
+    if len(errors) == len(results):
+        return {"error": "All sub-questions failed: " + "; ".join(errors)}
+    
+    sections = []
+    parts = []
+    sources = []
+    seen = set()
+    for sub_question, result in results:
+        if "error" in result:
+            sections.append(f"**{sub_question}**\n(No answer: {result['error']})")
+            parts.append({"question": sub_question, "error": result["error"]})
+            continue
+        part_sources = result.get("sources") if isinstance(result.get("sources"), list) else []
+        sections.append(f"**{sub_question}**\n{answer_text(result)}")
+        parts.append({"question": sub_question, "answer": answer_text(result), "sources": part_sources})
+        for source in part_sources:
+            key = _source_key(source)
+            if key not in seen:
+                seen.add(key)
+                sources.append(source)
+    return {
+        "answer": "\n\n".join(sections),
+        "sources": sources,
+        "question": question,
+        "parts": parts
+    }
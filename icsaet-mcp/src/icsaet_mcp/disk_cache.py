@@ -0,0 +1,212 @@
+"""Persistent SQLite answer cache shared across server processes."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from .structured_logging import get_logger
+from .utils import env_bool, env_float, env_int
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_accessed_at ON answers (accessed_at);
+CREATE INDEX IF NOT EXISTS answers_expires_at ON answers (expires_at);
+"""
+
+
+def default_cache_path() -> Path:
+    """Return the answer cache location, next to the log directory."""
+    override = os.getenv("ICAET_DISK_CACHE_PATH")
+    if override:
+        return Path(override)
+    return Path.home() / ".icsaet-mcp" / "cache" / "answers.db"
+
+
+class DiskCache:
+    """SQLite-backed cache with TTL expiry and LRU eviction by total size.
+    
+    The database runs in WAL mode with a busy timeout so several server
+    processes (one per Cursor window) can read and write it concurrently.
+    Writes use BEGIN IMMEDIATE so eviction never races another writer.
+    Any SQLite error is logged and treated as a cache miss.
+    """
+    
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 50 * 1024 * 1024,
+        ttl: float = 86400.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path),
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+    
+    def get(self, key: str, include_expired: bool = False) -> dict | None:
+        """Return a cached value, or None if missing, expired or unreadable.
+        
+        Args:
+            key: Cache key
+            include_expired: Also return entries past their TTL that have not been evicted yet
+        """
+        now = self._clock()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM answers WHERE key = ? AND expires_at > ?",
+                    (key, float("-inf") if include_expired else now)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE answers SET accessed_at = ? WHERE key = ?",
+                    (now, key)
+                )
+                self.hits += 1
+                return json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                self.errors += 1
+                logger.warning("Disk cache read failed", error=type(e).__name__, message=str(e))
+                return None
+    
+    def set(self, key: str, value: dict, ttl: float | None = None) -> bool:
+        """Store a value and evict expired and least-recently-used entries over the size cap."""
+        try:
+            payload = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return False
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return False
+        now = self._clock()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO answers "
+                        "(key, value, size, created_at, expires_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, payload, size, now, expires_at, now)
+                    )
+                    self._evict(now)
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                return True
+            except sqlite3.Error as e:
+                self.errors += 1
+                logger.warning("Disk cache write failed", error=type(e).__name__, message=str(e))
+                return False
+    
+    def _evict(self, now: float) -> None:
+        # Expired rows are kept for one extra TTL so they can be served as a
+        # stale fallback, but they are the first to go when over the size cap.
+        self._conn.execute("DELETE FROM answers WHERE expires_at <= ?", (now - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM answers WHERE key IN ("
+            " SELECT key FROM ("
+            "  SELECT key, SUM(size) OVER ("
+            "   ORDER BY expires_at > ? DESC, accessed_at DESC, key"
+            "  ) AS running"
+            "  FROM answers"
+            " ) WHERE running > ?"
+            ")",
+            (now, self.max_bytes)
+        )
+    
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+            except sqlite3.Error as e:
+                self.errors += 1
+                logger.warning("Disk cache delete failed", error=type(e).__name__, message=str(e))
+    
+    def stats(self) -> dict:
+        """Return hit, miss and size counters."""
+        with self._lock:
+            try:
+                entries, total = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM answers"
+                ).fetchone()
+            except sqlite3.Error:
+                entries, total = 0, 0
+        return {
+            "entries": entries,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors
+        }
+    
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_disk_cache: DiskCache | None = None
+_disk_cache_loaded = False
+
+
+def get_disk_cache() -> DiskCache | None:
+    """Return the process-wide disk cache, or None if disabled or unavailable."""
+    global _disk_cache, _disk_cache_loaded
+    if not _disk_cache_loaded:
+        _disk_cache_loaded = True
+        if env_bool("ICAET_DISK_CACHE_ENABLED", True):
+            path = default_cache_path()
+            try:
+                _disk_cache = DiskCache(
+                    path,
+                    max_bytes=env_int("ICAET_DISK_CACHE_MAX_BYTES", 50 * 1024 * 1024),
+                    ttl=env_float("ICAET_DISK_CACHE_TTL", 86400.0)
+                )
+                logger.info("Disk cache enabled", path=path, max_bytes=_disk_cache.max_bytes, ttl=_disk_cache.ttl)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Disk cache unavailable", error=type(e).__name__, message=str(e))
+                _disk_cache = None
+    return _disk_cache
+
+
+def close_disk_cache() -> None:
+    """Close the process-wide disk cache so it is reopened from the environment on next use."""
+    global _disk_cache, _disk_cache_loaded
+    if _disk_cache is not None:
+        _disk_cache.close()
+    _disk_cache = None
+    _disk_cache_loaded = False
@@ -0,0 +1,152 @@
+"""Hedged upstream requests to trim tail latency."""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from .structured_logging import get_logger
+from .utils import env_bool, env_float, env_int
+
+logger = get_logger(__name__)
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies with percentile lookups."""
+    
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+    
+    def record(self, seconds: float) -> None:
+        """Add one latency sample."""
+        self._samples.append(seconds)
+    
+    def percentile(self, percent: float) -> float | None:
+        """Return the nearest-rank percentile, or None if there are no samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(percent / 100.0 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+
+class Hedger:
+    """Send a second identical request when the first is slower than usual.
+    
+    The hedge delay follows the observed latency percentile once enough
+    samples exist and is bounded below by min_delay. Hedges are only sent
+    while hedges stay under max_ratio of all requests, so a slow upstream
+    never sees its load doubled. The first attempt to succeed wins and the
+    other is cancelled.
+    """
+    
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.05,
+        max_ratio: float = 0.1,
+        min_samples: int = 20,
+        tracker: LatencyTracker | None = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.tracker = tracker or LatencyTracker()
+        self._clock = clock
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.skipped = 0
+    
+    def delay(self) -> float:
+        """Return how long to wait for the primary request before hedging."""
+        if len(self.tracker) < self.min_samples:
+            return self.initial_delay
+        return max(self.tracker.percentile(self.percentile), self.min_delay)
+    
+    def _hedge_allowed(self) -> bool:
+        return self.hedges + 1 <= self.max_ratio * self.requests
+    
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn, hedging it with a second call if it is slow to answer."""
+        self.requests += 1
+        delay = self.delay()
+        primary = asyncio.ensure_future(self._timed(fn))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+            if not self._hedge_allowed():
+                self.skipped += 1
+                return await primary
+            
+            self.hedges += 1
+            logger.info("Hedging slow request", delay=round(delay, 3), hedges=self.hedges, requests=self.requests)
+            hedge = asyncio.ensure_future(self._timed(fn))
+            tasks.append(hedge)
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if not succeeded and pending:
+                    continue
+                winner = succeeded[0] if succeeded else done.pop()
+                if winner is hedge and succeeded:
+                    self.hedge_wins += 1
+                return winner.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _timed(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        start = self._clock()
+        result = await fn()
+        self.tracker.record(self._clock() - start)
+        return result
+    
+    def stats(self) -> dict:
+        """Return hedge counters and the current hedge delay."""
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "skipped": self.skipped,
+            "delay_seconds": round(self.delay(), 6)
+        }
+
+
+_hedger: Hedger | None = None
+_hedger_loaded = False
+
+
+def get_hedger() -> Hedger | None:
+    """Return the process-wide hedger, or None if hedging is disabled."""
+    global _hedger, _hedger_loaded
+    if not _hedger_loaded:
+        _hedger_loaded = True
+        if env_bool("ICAET_HEDGE_ENABLED", False):
+            _hedger = Hedger(
+                percentile=env_float("ICAET_HEDGE_PERCENTILE", 95.0),
+                initial_delay=env_float("ICAET_HEDGE_INITIAL_DELAY", 2.0),
+                min_delay=env_float("ICAET_HEDGE_MIN_DELAY", 0.05),
+                max_ratio=env_float("ICAET_HEDGE_MAX_RATIO", 0.1),
+                min_samples=env_int("ICAET_HEDGE_MIN_SAMPLES", 20)
+            )
+    return _hedger
+
+
+def reset_hedger() -> None:
+    """Drop the process-wide hedger so it is rebuilt from the environment on next use."""
+    global _hedger, _hedger_loaded
+    _hedger = None
+    _hedger_loaded = False
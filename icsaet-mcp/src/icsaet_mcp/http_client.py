@@ -0,0 +1,141 @@
+"""Shared, long-lived HTTP client for upstream ICAET requests."""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from .structured_logging import get_logger
+from .tracing import record_http_event
+from .utils import env_bool, env_float, env_int
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+REQUEST_TIMEOUT = 30.0
+
+_client: "httpx.AsyncClient | None" = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_stats = {"requests": 0, "connections_opened": 0}
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 dependency is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> "httpx.AsyncClient":
+    """Create a pooled AsyncClient configured from the environment.
+    
+    httpx is imported here rather than at module level so that it is only
+    loaded on the first tool call, after the MCP handshake.
+    """
+    import httpx
+    
+    max_connections = env_int("ICAET_HTTP_MAX_CONNECTIONS", 20)
+    max_keepalive = env_int("ICAET_HTTP_MAX_KEEPALIVE", 10)
+    keepalive_expiry = env_float("ICAET_HTTP_KEEPALIVE_EXPIRY", 30.0)
+    http2 = env_bool("ICAET_HTTP2", False)
+    
+    if http2 and not _http2_available():
+        logger.warning("HTTP/2 requested but h2 is not installed, falling back to HTTP/1.1")
+        http2 = False
+    
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry
+    )
+    logger.info(
+        "HTTP client opened",
+        max_connections=max_connections,
+        max_keepalive=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+        http2=http2
+    )
+    return httpx.AsyncClient(timeout=REQUEST_TIMEOUT, limits=limits, http2=http2)
+
+
+async def _trace(event_name: str, info: dict) -> None:
+    """httpcore trace hook used to count requests and new connections and to record tracing spans."""
+    record_http_event(event_name)
+    if event_name == "connection.connect_tcp.complete":
+        _stats["connections_opened"] += 1
+    elif event_name in ("http11.send_request_headers.started", "http2.send_request_headers.started"):
+        _stats["requests"] += 1
+
+
+def request_extensions() -> dict:
+    """Request extensions to attach to every upstream call for connection accounting and tracing."""
+    return {"trace": _trace}
+
+
+def get_client() -> "httpx.AsyncClient":
+    """Return the shared client, opening it lazily on first use.
+    
+    The client is bound to the event loop that created it, so a new one is
+    opened if the running loop changes (for example between test cases)
+    and the old one is released with _discard_client.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            _discard_client(_client, _client_loop)
+        _client = _build_client()
+        _client_loop = loop
+    return _client
+
+
+def _discard_client(client: "httpx.AsyncClient", loop: asyncio.AbstractEventLoop | None) -> None:
+    """Release a client left behind by another event loop.
+    
+    Its connections can only be closed on the loop that opened them: if
+    that loop is still running, for example in another thread, the client
+    is closed there. Otherwise the loop can no longer run the close, so the
+    client is dropped and its sockets are freed with it.
+    """
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        logger.debug("HTTP client from previous event loop closed")
+    else:
+        logger.debug("HTTP client from previous event loop discarded")
+
+
+async def aclose_client() -> None:
+    """Close the shared client and log connection reuse counters."""
+    global _client, _client_loop
+    client = _client
+    _client = None
+    _client_loop = None
+    if client is None or client.is_closed:
+        return
+    await client.aclose()
+    stats = get_client_stats()
+    logger.info(
+        "HTTP client closed",
+        requests=stats["requests"],
+        connections_opened=stats["connections_opened"],
+        connections_reused=stats["connections_reused"]
+    )
+
+
+def get_client_stats() -> dict:
+    """Return connection reuse counters for the shared client."""
+    requests = _stats["requests"]
+    opened = _stats["connections_opened"]
+    return {
+        "requests": requests,
+        "connections_opened": opened,
+        "connections_reused": max(requests - opened, 0)
+    }
+
+
+def reset_client_stats() -> None:
+    """Reset connection reuse counters."""
+    _stats["requests"] = 0
+    _stats["connections_opened"] = 0
@@ -0,0 +1,221 @@
+"""Bounded log queue with overflow policies and drop accounting."""
+
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from .log_throttle import LogThrottleFilter
+
+DROP_OLDEST = "drop_oldest"
+DROP_DEBUG_FIRST = "drop_debug_first"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_DEBUG_FIRST, BLOCK)
+
+
+class BoundedLogQueue:
+    """Thread-safe FIFO of log records with a fixed capacity.
+    
+    When the queue is full a new record is handled by the overflow policy:
+    DROP_OLDEST discards the oldest queued record, DROP_DEBUG_FIRST discards
+    the oldest queued record of the lowest level below the new one (or the
+    new record itself if nothing queued is less important), and BLOCK waits
+    up to block_timeout for space before dropping the new record. The
+    listener's stop sentinel (None) is always accepted.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 10000,
+        policy: str = DROP_DEBUG_FIRST,
+        block_timeout: float = 0.05
+    ):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.capacity = max(capacity, 1)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._items: deque = deque()
+        self._levels: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self.enqueued = 0
+        self.dropped: dict[str, int] = {}
+        self.blocked = 0
+        self.high_water = 0
+    
+    def qsize(self) -> int:
+        with self._lock:
+            return len(self._items)
+    
+    def empty(self) -> bool:
+        return self.qsize() == 0
+    
+    def put_nowait(self, record: logging.LogRecord | None) -> None:
+        self.put(record)
+    
+    def put(self, record: logging.LogRecord | None, block: bool = True, timeout: float | None = None) -> None:
+        """Add a record, applying the overflow policy if the queue is full."""
+        with self._lock:
+            if record is not None and len(self._items) >= self.capacity:
+                if not self._make_room(record):
+                    self._count_drop(record.levelno)
+                    return
+            self._append(record)
+            self._not_empty.notify()
+    
+    def _make_room(self, record: logging.LogRecord) -> bool:
+        """Free one slot for record; return False if record itself should be dropped."""
+        if self.policy == DROP_OLDEST:
+            self._count_drop(self._popleft().levelno)
+            return True
+        if self.policy == BLOCK:
+            self.blocked += 1
+            deadline = time.monotonic() + self.block_timeout
+            while len(self._items) >= self.capacity:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._not_full.wait(remaining):
+                    return len(self._items) < self.capacity
+            return True
+        
+        lower = [level for level, count in self._levels.items() if count and level < record.levelno]
+        if not lower:
+            return False
+        victim_level = min(lower)
+        for index, queued in enumerate(self._items):
+            if queued is not None and queued.levelno == victim_level:
+                del self._items[index]
+                self._levels[victim_level] -= 1
+                self._count_drop(victim_level)
+                return True
+        return False
+    
+    def _append(self, record: logging.LogRecord | None) -> None:
+        self._items.append(record)
+        if record is not None:
+            self.enqueued += 1
+            self._levels[record.levelno] = self._levels.get(record.levelno, 0) + 1
+        self.high_water = max(self.high_water, len(self._items))
+    
+    def _popleft(self) -> logging.LogRecord | None:
+        record = self._items.popleft()
+        if record is not None:
+            self._levels[record.levelno] -= 1
+        return record
+    
+    def _count_drop(self, levelno: int) -> None:
+        name = logging.getLevelName(levelno)
+        self.dropped[name] = self.dropped.get(name, 0) + 1
+    
+    def get(self, block: bool = True, timeout: float | None = None) -> logging.LogRecord | None:
+        """Remove and return the oldest record, raising queue.Empty like queue.Queue."""
+        with self._lock:
+            if not block:
+                if not self._items:
+                    raise queue.Empty
+            elif timeout is None:
+                while not self._items:
+                    self._not_empty.wait()
+            else:
+                deadline = time.monotonic() + timeout
+                while not self._items:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                    self._not_empty.wait(remaining)
+            record = self._popleft()
+            self._not_full.notify()
+            return record
+    
+    def get_nowait(self) -> logging.LogRecord | None:
+        return self.get(block=False)
+    
+    def dropped_total(self) -> int:
+        with self._lock:
+            return sum(self.dropped.values())
+    
+    def stats(self) -> dict:
+        """Return queue depth and drop counters."""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "policy": self.policy,
+                "depth": len(self._items),
+                "high_water": self.high_water,
+                "enqueued": self.enqueued,
+                "dropped": sum(self.dropped.values()),
+                "dropped_by_level": dict(self.dropped),
+                "blocked": self.blocked
+            }
+
+
+class ReportingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that periodically logs how many records were dropped.
+    
+    The summary is handed straight to the listener's handlers rather than
+    queued, so it cannot itself be dropped by a full queue. If a throttle
+    filter is attached, its ended windows are flushed the same way, so a
+    storm's summary appears even if nothing else is logged afterwards.
+    """
+    
+    def __init__(
+        self,
+        log_queue: BoundedLogQueue,
+        *handlers: logging.Handler,
+        report_interval: float = 60.0,
+        respect_handler_level: bool = False,
+        throttle: "LogThrottleFilter | None" = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.report_interval = report_interval
+        self.throttle = throttle
+        self._clock = clock
+        self._last_report = clock()
+        self._reported = 0
+    
+    def dequeue(self, block: bool) -> logging.LogRecord | None:
+        while True:
+            self.report_drops()
+            if self.throttle is not None:
+                self.throttle.flush(emit=self.handle)
+            try:
+                if not block or self.report_interval <= 0:
+                    record = self.queue.get(block)
+                else:
+                    record = self.queue.get(True, timeout=min(self.report_interval, 1.0))
+            except queue.Empty:
+                if not block:
+                    raise
+                continue
+            if record is None:
+                if self.throttle is not None:
+                    self.throttle.flush(force=True, emit=self.handle)
+                self.report_drops(force=True)
+            return record
+    
+    def report_drops(self, force: bool = False) -> None:
+        """Log a summary if records were dropped since the last report and the interval passed."""
+        now = self._clock()
+        if not force and now - self._last_report < self.report_interval:
+            return
+        self._last_report = now
+        total = self.queue.dropped_total()
+        dropped = total - self._reported
+        if dropped <= 0:
+            return
+        self._reported = total
+        stats = self.queue.stats()
+        by_level = ", ".join(f"{level.lower()}={count}" for level, count in sorted(stats["dropped_by_level"].items()))
+        record = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"Log records dropped [dropped={dropped}, total={total}, {by_level}, "
+            f"capacity={stats['capacity']}, policy={stats['policy']}]",
+            None, None
+        )
+        self.handle(record)
@@ -0,0 +1,160 @@
+"""Deduplicate and sample log records during failure storms."""
+
+import logging
+import random
+import re
+import threading
+import time
+from typing import Callable
+
+from .structured_logging import StructuredMessage
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def throttle_key(record: logging.LogRecord) -> tuple:
+    """Key under which repeats of a record are collapsed.
+    
+    Numbers are ignored so that lines differing only in counters, delays or
+    sizes (attempt=2, retry_in=0.347) count as the same message.
+    """
+    msg = record.msg
+    if isinstance(msg, StructuredMessage):
+        fields = tuple(
+            (key, None if isinstance(value, (int, float)) or callable(value) else str(value))
+            for key, value in msg.fields.items()
+        )
+        return (record.name, record.levelno, msg.message, fields)
+    return (record.name, record.levelno, _NUMBER.sub("#", record.getMessage()))
+
+
+class LogThrottleFilter(logging.Filter):
+    """Collapse repeated records into one summary per window and sample by level.
+    
+    Records at min_level and above are throttled: the first burst records
+    with a given key in each window pass through; later repeats are
+    suppressed and counted. Lower levels, such as the per-request INFO
+    lines, are never throttled. When the window ends, a
+    summary record with the count is passed to emit. sample_rates maps a
+    level number to the fraction of records at that level to keep; records
+    at levels not listed are always kept. At most max_keys distinct keys are
+    tracked, beyond which records pass through unthrottled.
+    """
+    
+    def __init__(
+        self,
+        window: float = 10.0,
+        burst: int = 1,
+        min_level: int = logging.WARNING,
+        sample_rates: dict[int, float] | None = None,
+        max_keys: int = 1000,
+        emit: Callable[[logging.LogRecord], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None
+    ):
+        super().__init__()
+        self.window = window
+        self.burst = max(burst, 1)
+        self.min_level = min_level
+        self.sample_rates = sample_rates or {}
+        self.max_keys = max_keys
+        self.emit = emit
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._windows: dict[tuple, list] = {}
+        self._next_sweep = 0.0
+        self.suppressed = 0
+        self.sampled_out: dict[str, int] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "throttle_summary", False):
+            return True
+        rate = self.sample_rates.get(record.levelno, 1.0)
+        if rate < 1.0 and self._rng.random() >= rate:
+            with self._lock:
+                name = record.levelname
+                self.sampled_out[name] = self.sampled_out.get(name, 0) + 1
+            return False
+        if record.levelno < self.min_level:
+            return True
+        
+        key = throttle_key(record)
+        now = self._clock()
+        with self._lock:
+            summaries = self._sweep(now) if now >= self._next_sweep else []
+            entry = self._windows.get(key)
+            if entry is None:
+                if len(self._windows) < self.max_keys:
+                    self._windows[key] = [now, 1, 0, record]
+                allowed = True
+            else:
+                entry[1] += 1
+                allowed = entry[1] <= self.burst
+                if not allowed:
+                    entry[2] += 1
+                    self.suppressed += 1
+        self._emit(summaries)
+        return allowed
+    
+    def flush(self, force: bool = False, emit: Callable[[logging.LogRecord], None] | None = None) -> None:
+        """Emit summaries for windows that have ended, or for all windows if force is set.
+        
+        emit overrides the configured target, letting the queue listener
+        hand summaries straight to its handlers.
+        """
+        now = self._clock()
+        with self._lock:
+            if not force and now < self._next_sweep:
+                return
+            summaries = self._sweep(float("inf") if force else now)
+        self._emit(summaries, emit)
+    
+    def reset(self) -> None:
+        """Forget every window and counter without emitting summaries."""
+        with self._lock:
+            self._windows.clear()
+            self._next_sweep = 0.0
+            self.suppressed = 0
+            self.sampled_out.clear()
+    
+    def _sweep(self, now: float) -> list[logging.LogRecord]:
+        self._next_sweep = self._clock() + min(self.window, 1.0)
+        summaries = []
+        for key, (started, _, suppressed, first) in list(self._windows.items()):
+            if now - started < self.window:
+                continue
+            del self._windows[key]
+            if suppressed:
+                summaries.append(self._summary(first, suppressed))
+        return summaries
+    
+    def _summary(self, first: logging.LogRecord, suppressed: int) -> logging.LogRecord:
+        original = first.msg.message if isinstance(first.msg, StructuredMessage) else first.getMessage()
+        record = logging.LogRecord(
+            first.name, first.levelno, first.pathname, first.lineno,
+            StructuredMessage("Repeated log message suppressed", {
+                "count": suppressed,
+                "window": self.window,
+                "message": original
+            }),
+            None, None
+        )
+        record.throttle_summary = True
+        return record
+    
+    def _emit(self, summaries: list[logging.LogRecord], emit: Callable | None = None) -> None:
+        emit = emit or self.emit
+        if emit is None:
+            return
+        for summary in summaries:
+            emit(summary)
+    
+    def stats(self) -> dict:
+        """Return suppression and sampling counters."""
+        with self._lock:
+            return {
+                "tracked_keys": len(self._windows),
+                "suppressed": self.suppressed,
+                "sampled_out": dict(self.sampled_out)
+            }
@@ -1,54 +1,168 @@
 """Logging configuration for the MCP server."""
 
 import atexit
+import copy
 import logging
 import logging.handlers
 import os
-import queue
 import sys
 from pathlib import Path
 
+from .log_throttle import LogThrottleFilter
+from .log_queue import DROP_DEBUG_FIRST, OVERFLOW_POLICIES, BoundedLogQueue, ReportingQueueListener
+from .structured_logging import CorrelationFilter, JsonFormatter, StructuredMessage, TextFormatter
+from .utils import env_bool, env_float, env_int
+
+LOG_FORMATS = ("text", "json")
+
+_log_queue: BoundedLogQueue | None = None
+_log_throttle: LogThrottleFilter | None = None
+
+
+class DeferredFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that creates its directory and file on the first record.
+    
+    Records are written by the queue listener thread, so this keeps all
+    filesystem work off the startup path. If the directory or file cannot
+    be created, file logging is silently disabled.
+    """
+    
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+        self.unavailable = False
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.unavailable:
+            return
+        if self.stream is None:
+            try:
+                Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+                self.stream = self._open()
+            except Exception:
+                self.unavailable = True
+                return
+        super().emit(record)
+
+
+class StderrHandler(logging.StreamHandler):
+    """StreamHandler that writes to whatever sys.stderr is when a record is emitted.
+    
+    Summaries flushed by the listener at shutdown must not hit a stream that
+    was swapped out and closed after setup_logging ran.
+    """
+    
+    def __init__(self):
+        super().__init__(sys.stderr)
+    
+    @property
+    def stream(self):
+        return sys.stderr
+    
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+    
+    The stock handler renders every record to a string before queueing it,
+    which both costs the caller and throws away structured fields. Here the
+    caller only evaluates lazy fields and the correlation ID is stamped by
+    CorrelationFilter; formatting happens on the listener thread.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if isinstance(record.msg, StructuredMessage):
+            record.msg.resolve()
+        elif record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
 
 def setup_logging():
-    """Configure async logging with stderr output and optional file logging."""
+    """Configure async logging with stderr output and optional file logging.
+    
+    The file log is plain text by default; set ICAET_LOG_FILE_FORMAT=json to
+    write one JSON object per line instead. Records pass through a bounded
+    queue (ICAET_LOG_QUEUE_CAPACITY, ICAET_LOG_QUEUE_POLICY) so a logging
+    burst cannot grow memory without limit; drops are reported every
+    ICAET_LOG_DROP_REPORT_INTERVAL seconds. Repeated messages at
+    ICAET_LOG_THROTTLE_LEVEL (WARNING) and above are collapsed into one
+    summary per ICAET_LOG_THROTTLE_WINDOW and each level can be sampled
+    with ICAET_LOG_SAMPLE_<LEVEL>.
+    """
+    global _log_queue, _log_throttle
     log_level_str = os.getenv("ICAET_LOG_LEVEL", "INFO").upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
     
     log_format = "%(asctime)s %(levelname)s %(message)s"
-    formatter = logging.Formatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")
+    formatter = TextFormatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")
+    
+    file_format = os.getenv("ICAET_LOG_FILE_FORMAT", "text").lower()
+    if file_format not in LOG_FORMATS:
+        file_format = "text"
     
-    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler = StderrHandler()
     stderr_handler.setFormatter(formatter)
     stderr_handler.setLevel(log_level)
     
     handlers = [stderr_handler]
     
     try:
-        log_dir = Path.home() / ".icsaet-mcp" / "logs"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / "server.log"
+        log_file = Path.home() / ".icsaet-mcp" / "logs" / "server.log"
         
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = DeferredFileHandler(
             log_file, 
             maxBytes=10*1024*1024, 
             backupCount=5
         )
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(JsonFormatter() if file_format == "json" else formatter)
         file_handler.setLevel(log_level)
         handlers.append(file_handler)
     except Exception:
         pass
     
-    log_queue = queue.Queue(-1)
-    queue_handler = logging.handlers.QueueHandler(log_queue)
+    policy = os.getenv("ICAET_LOG_QUEUE_POLICY", DROP_DEBUG_FIRST).lower().replace("-", "_")
+    if policy not in OVERFLOW_POLICIES:
+        policy = DROP_DEBUG_FIRST
+    log_queue = BoundedLogQueue(
+        capacity=env_int("ICAET_LOG_QUEUE_CAPACITY", 10000),
+        policy=policy,
+        block_timeout=env_float("ICAET_LOG_QUEUE_BLOCK_TIMEOUT", 0.05)
+    )
+    _log_queue = log_queue
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationFilter())
     
-    listener = logging.handlers.QueueListener(
+    throttle = None
+    if env_bool("ICAET_LOG_THROTTLE_ENABLED", True):
+        throttle = LogThrottleFilter(
+            window=env_float("ICAET_LOG_THROTTLE_WINDOW", 10.0),
+            burst=env_int("ICAET_LOG_THROTTLE_BURST", 1),
+            min_level=getattr(logging, os.getenv("ICAET_LOG_THROTTLE_LEVEL", "WARNING").upper(), logging.WARNING),
+            sample_rates={
+                level: env_float(f"ICAET_LOG_SAMPLE_{logging.getLevelName(level)}", 1.0)
+                for level in (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR)
+            },
+            max_keys=env_int("ICAET_LOG_THROTTLE_MAX_KEYS", 1000),
+            emit=queue_handler.handle
+        )
+        queue_handler.addFilter(throttle)
+    _log_throttle = throttle
+    
+    listener = ReportingQueueListener(
         log_queue, 
         *handlers, 
-        respect_handler_level=True
+        report_interval=env_float("ICAET_LOG_DROP_REPORT_INTERVAL", 60.0),
+        respect_handler_level=True,
+        throttle=throttle
     )
     listener.start()
     atexit.register(listener.stop)
+    queue_handler.listener = listener
     
     logger = logging.getLogger()
     logger.setLevel(log_level)
@@ -56,3 +170,28 @@ def setup_logging():
     
     return logger
 
+
+def get_log_queue_stats() -> dict | None:
+    """Return depth and drop counters of the active log queue, or None before setup."""
+    if _log_queue is None:
+        return None
+    return _log_queue.stats()
+
+
+def get_log_throttle_stats() -> dict | None:
+    """Return suppression and sampling counters of the log throttle, or None if disabled."""
+    if _log_throttle is None:
+        return None
+    return _log_throttle.stats()
+
+
+def reset_log_throttle() -> None:
+    """Drop the pending windows of every log throttle installed on the root logger.
+    
+    Suppressed repeats are forgotten rather than summarized, so nothing is
+    left for the listeners to flush at exit.
+    """
+    for handler in logging.getLogger().handlers:
+        for log_filter in handler.filters:
+            if isinstance(log_filter, LogThrottleFilter):
+                log_filter.reset()
@@ -0,0 +1,211 @@
+"""In-process metrics: counters, gauges and log-linear latency histograms."""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from .structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _metric_name(name: str, labels: dict) -> str:
+    """Render a metric name with its labels, e.g. upstream_responses{status=200}."""
+    if not labels:
+        return name
+    rendered = ",".join(f"{key}={value}" for key, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class Counter:
+    """Monotonically increasing count."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+    
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down, such as the number of queries in flight."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+    
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+    
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+    
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+
+class Histogram:
+    """HDR-style histogram of durations with bounded relative error.
+    
+    Values are recorded in microseconds and bucketed log-linearly: below
+    2**sub_bucket_bits each microsecond has its own bucket, above that every
+    power of two is split into 2**(sub_bucket_bits - 1) equal buckets. With
+    the default of 7 bits a reported percentile is within about 1% of the
+    true value, and memory grows with the number of powers of two spanned
+    rather than with the number of samples.
+    """
+    
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._lock = threading.Lock()
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: int | None = None
+        self.max: int | None = None
+    
+    def _bucket(self, value: int) -> int:
+        """Return the lower bound of the bucket that value falls in."""
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value
+        return (value >> shift) << shift
+    
+    def _midpoint(self, lower: int) -> float:
+        shift = lower.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return float(lower)
+        return lower + ((1 << shift) - 1) / 2
+    
+    def record(self, seconds: float) -> None:
+        """Record one duration."""
+        value = max(int(seconds * 1_000_000), 0)
+        bucket = self._bucket(value)
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+    
+    def percentile(self, percentile: float) -> float | None:
+        """Return the given percentile in seconds, or None if nothing was recorded."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(percentile / 100.0 * self.count, 1)
+            seen = 0
+            for lower in sorted(self._buckets):
+                seen += self._buckets[lower]
+                if seen >= rank:
+                    value = min(max(self._midpoint(lower), self.min), self.max)
+                    return value / 1_000_000
+            return self.max / 1_000_000
+    
+    def summary(self) -> dict:
+        """Return count, mean, min, max and the standard percentiles in milliseconds."""
+        with self._lock:
+            count, total, low, high = self.count, self.total, self.min, self.max
+        if not count:
+            return {"count": 0}
+        summary = {
+            "count": count,
+            "mean_ms": round(total / count / 1000, 3),
+            "min_ms": round(low / 1000, 3),
+            "max_ms": round(high / 1000, 3)
+        }
+        for percentile in PERCENTILES:
+            summary[f"p{percentile:g}_ms"] = round(self.percentile(percentile) * 1000, 3)
+        return summary
+
+
+class MetricsRegistry:
+    """Named, labelled metrics created on first use."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, Counter] = {}
+        self._gauges: dict[str, Gauge] = {}
+        self._histograms: dict[str, Histogram] = {}
+    
+    def _get(self, metrics: dict, factory: type, name: str, labels: dict):
+        key = _metric_name(name, labels)
+        metric = metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = metrics.setdefault(key, factory())
+        return metric
+    
+    def counter(self, name: str, **labels) -> Counter:
+        return self._get(self._counters, Counter, name, labels)
+    
+    def gauge(self, name: str, **labels) -> Gauge:
+        return self._get(self._gauges, Gauge, name, labels)
+    
+    def histogram(self, name: str, **labels) -> Histogram:
+        return self._get(self._histograms, Histogram, name, labels)
+    
+    def snapshot(self) -> dict:
+        """Return the current value of every metric, keyed by rendered name."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = dict(self._histograms)
+        return {
+            "counters": {key: counters[key].value for key in sorted(counters)},
+            "gauges": {key: gauges[key].value for key in sorted(gauges)},
+            "histograms": {key: histograms[key].summary() for key in sorted(histograms)}
+        }
+    
+    def summary_fields(self) -> dict:
+        """Flatten the snapshot into one level of fields for a log line."""
+        snapshot = self.snapshot()
+        fields = {**snapshot["counters"], **snapshot["gauges"]}
+        for key, summary in snapshot["histograms"].items():
+            fields[f"{key}.count"] = summary["count"]
+            for stat in ("p50_ms", "p99_ms"):
+                if stat in summary:
+                    fields[f"{key}.{stat}"] = summary[stat]
+        return fields
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _metrics
+
+
+def reset_metrics() -> None:
+    """Replace the process-wide registry with an empty one."""
+    global _metrics
+    _metrics = MetricsRegistry()
+
+
+async def log_metrics_periodically(interval: float) -> None:
+    """Log a one-line metrics snapshot every interval seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        logger.info("Metrics snapshot", **get_metrics().summary_fields())
+
+
+@asynccontextmanager
+async def metrics_reporter(interval: float) -> AsyncIterator[None]:
+    """Run log_metrics_periodically while the block is active; a non-positive interval disables it."""
+    task = asyncio.create_task(log_metrics_periodically(interval)) if interval > 0 else None
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
@@ -0,0 +1,118 @@
+"""Short-lived cache of deterministic upstream errors and rejected credentials."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from .structured_logging import get_logger
+from .utils import env_bool, env_float, env_int
+
+logger = get_logger(__name__)
+
+# Client errors that the same request will get again: a malformed or
+# invalid question, a forbidden resource, an unknown endpoint. 401 is
+# handled per credential instead, and 408/429 are transient.
+NEGATIVE_STATUS_CODES = frozenset({400, 403, 404, 405, 410, 413, 414, 422})
+
+
+def credentials_fingerprint(api_key: str, url: str) -> str:
+    """Identify an API key and endpoint pair without keeping the key itself."""
+    return hashlib.sha256(f"{url}\x00{api_key}".encode("utf-8")).hexdigest()
+
+
+class NegativeCache:
+    """Bounded TTL cache of error dicts, kept apart from the answer caches.
+    
+    Errors are keyed on the credentials fingerprint and the question's
+    cache key, expire after ttl seconds and are evicted oldest-first beyond
+    max_entries. Credentials rejected with 401 are remembered without a
+    TTL: the key cannot start working again until the configuration
+    changes, and a new key or URL has a different fingerprint.
+    """
+    
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, dict]] = OrderedDict()
+        self._rejected: dict[str, dict] = {}
+        self.hits = 0
+        self.auth_short_circuits = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, fingerprint: str, key: str) -> dict | None:
+        """Return the cached error for a question, or None if there is none or it expired."""
+        entry = self._entries.get((fingerprint, key))
+        if entry is None:
+            return None
+        expires_at, error = entry
+        if self._clock() >= expires_at:
+            del self._entries[(fingerprint, key)]
+            return None
+        self.hits += 1
+        return error
+    
+    def set(self, fingerprint: str, key: str, error: dict) -> None:
+        """Remember an error for ttl seconds."""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        self._entries.pop((fingerprint, key), None)
+        self._entries[(fingerprint, key)] = (self._clock() + self.ttl, error)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def reject_credentials(self, fingerprint: str, error: dict) -> None:
+        """Remember that the upstream answered 401 for these credentials."""
+        self._rejected[fingerprint] = error
+    
+    def rejected_credentials(self, fingerprint: str) -> dict | None:
+        """Return the 401 error recorded for these credentials, or None."""
+        error = self._rejected.get(fingerprint)
+        if error is not None:
+            self.auth_short_circuits += 1
+        return error
+    
+    def stats(self) -> dict:
+        """Return entry and short-circuit counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "evictions": self.evictions,
+            "rejected_credentials": len(self._rejected),
+            "auth_short_circuits": self.auth_short_circuits
+        }
+
+
+_negative_cache: NegativeCache | None = None
+_negative_cache_loaded = False
+
+
+def get_negative_cache() -> NegativeCache | None:
+    """Return the process-wide negative cache, or None if it is disabled."""
+    global _negative_cache, _negative_cache_loaded
+    if not _negative_cache_loaded:
+        _negative_cache_loaded = True
+        if env_bool("ICAET_NEGATIVE_CACHE_ENABLED", True):
+            _negative_cache = NegativeCache(
+                ttl=env_float("ICAET_NEGATIVE_CACHE_TTL", 60.0),
+                max_entries=env_int("ICAET_NEGATIVE_CACHE_MAX_ENTRIES", 256)
+            )
+            logger.info("Negative cache enabled", ttl=_negative_cache.ttl, max_entries=_negative_cache.max_entries)
+    return _negative_cache
+
+
+def reset_negative_cache() -> None:
+    """Drop the process-wide negative cache so it is rebuilt from the environment on next use."""
+    global _negative_cache, _negative_cache_loaded
+    _negative_cache = None
+    _negative_cache_loaded = False
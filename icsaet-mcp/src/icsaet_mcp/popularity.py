@@ -0,0 +1,294 @@
+"""Question popularity tracking and background refresh of the hottest answers."""
+
+import asyncio
+import hashlib
+import heapq
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Awaitable, Callable
+
+from .metrics import get_metrics
+from .structured_logging import correlation_scope, get_logger
+from .utils import env_bool, env_float, env_int, sanitize_question
+
+logger = get_logger(__name__)
+
+
+class CountMinSketch:
+    """Approximate frequency counts in fixed memory.
+    
+    depth rows of width counters; a key increments one counter per row,
+    chosen by double hashing, and its estimate is the smallest of them.
+    Estimates never undercount and overcount by about total / width.
+    Conservative update raises only the counters that are at the minimum,
+    which keeps the overcount for rare keys low.
+    """
+    
+    def __init__(self, width: int = 2048, depth: int = 4):
+        if width <= 0 or depth <= 0:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+        self.total = 0
+    
+    def _indexes(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+    
+    def add(self, key: str, count: int = 1) -> int:
+        """Count key count more times and return its new estimate."""
+        indexes = self._indexes(key)
+        estimate = min(row[i] for row, i in zip(self._rows, indexes)) + count
+        for row, i in zip(self._rows, indexes):
+            if row[i] < estimate:
+                row[i] = estimate
+        self.total += count
+        return estimate
+    
+    def estimate(self, key: str) -> int:
+        """Return the estimated count of key."""
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key)))
+    
+    def halve(self) -> None:
+        """Halve every counter so that old traffic fades out."""
+        for row in self._rows:
+            for i, value in enumerate(row):
+                if value:
+                    row[i] = value >> 1
+        self.total >>= 1
+
+
+class TopK:
+    """The k keys with the highest counts, each with a payload.
+    
+    A min-heap finds the entry to replace; updated counts push a new heap
+    item and outdated items are skipped lazily, with the heap rebuilt once
+    it holds too many of them.
+    """
+    
+    def __init__(self, k: int = 20):
+        self.k = k
+        self._counts: dict[str, int] = {}
+        self._payloads: dict[str, object] = {}
+        self._heap: list[tuple[int, str]] = []
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._counts
+    
+    def offer(self, key: str, count: int, payload: object) -> bool:
+        """Record key's current count; returns whether key is now in the top k."""
+        if self.k <= 0:
+            return False
+        if key not in self._counts and len(self._counts) >= self.k:
+            floor_count, floor_key = self._floor()
+            if count <= floor_count:
+                return False
+            del self._counts[floor_key]
+            del self._payloads[floor_key]
+            heapq.heappop(self._heap)
+        self._counts[key] = count
+        self._payloads[key] = payload
+        heapq.heappush(self._heap, (count, key))
+        if len(self._heap) > 4 * self.k + 16:
+            self._rebuild()
+        return True
+    
+    def _floor(self) -> tuple[int, str]:
+        while self._heap[0][1] not in self._counts or self._counts[self._heap[0][1]] != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+    
+    def _rebuild(self) -> None:
+        self._heap = [(count, key) for key, count in self._counts.items()]
+        heapq.heapify(self._heap)
+    
+    def halve(self) -> None:
+        """Halve every count, matching CountMinSketch.halve."""
+        for key in self._counts:
+            self._counts[key] >>= 1
+        self._rebuild()
+    
+    def items(self) -> list[tuple[str, int, object]]:
+        """Return (key, count, payload) for the top keys, highest count first."""
+        ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        return [(key, count, self._payloads[key]) for key, count in ranked]
+
+
+class PopularityTracker:
+    """Counts questions by cache key and keeps the hottest ones with their text.
+    
+    Only the top k questions are stored; everything else is a handful of
+    counters in the sketch. Counts are halved every half_life seconds so
+    that questions which stop being asked drop out.
+    """
+    
+    def __init__(
+        self,
+        k: int = 20,
+        width: int = 2048,
+        depth: int = 4,
+        half_life: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.sketch = CountMinSketch(width, depth)
+        self.top = TopK(k)
+        self.half_life = half_life
+        self._clock = clock
+        self._last_decay = clock()
+        self.recorded = 0
+        self.refreshed = 0
+    
+    def _decay(self) -> None:
+        if self.half_life <= 0:
+            return
+        now = self._clock()
+        halvings = 0
+        while now - self._last_decay >= self.half_life and halvings < 32:
+            self.sketch.halve()
+            self.top.halve()
+            self._last_decay += self.half_life
+            halvings += 1
+        if halvings == 32:
+            self._last_decay = now
+    
+    def record(self, key: str, question: str, user_email: str) -> int:
+        """Count one ask of a question and return its estimated count."""
+        self._decay()
+        self.recorded += 1
+        count = self.sketch.add(key)
+        self.top.offer(key, count, (question, user_email))
+        return count
+    
+    def hottest(self, min_count: int = 1) -> list[tuple[str, str, str, int]]:
+        """Return (key, question, user_email, count) of the top questions asked at least min_count times."""
+        self._decay()
+        return [
+            (key, question, user_email, count)
+            for key, count, (question, user_email) in self.top.items()
+            if count >= min_count
+        ]
+    
+    def stats(self) -> dict:
+        """Return counters and the ten hottest questions."""
+        return {
+            "recorded": self.recorded,
+            "tracked": len(self.top),
+            "refreshed": self.refreshed,
+            "top": [
+                {"question": sanitize_question(question, max_len=80), "count": count}
+                for _, question, _, count in self.hottest()[:10]
+            ]
+        }
+
+
+async def refresh_hot(
+    hot: list[tuple[str, str, str, int]],
+    needs_refresh: Callable[[str], bool],
+    refresh: Callable[[str, str, str], Awaitable[str]],
+    concurrency: int = 1,
+    busy: Callable[[], bool] | None = None,
+    poll_interval: float = 0.1
+) -> dict:
+    """Refresh the hot questions whose cached answers are about to expire.
+    
+    At most concurrency refreshes run at once, and none starts while busy
+    returns True, so interactive queries always go first.
+    
+    Returns:
+        Count of refreshes by the outcome returned from refresh
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    outcomes: dict[str, int] = {}
+    
+    async def run(key: str, question: str, user_email: str) -> None:
+        async with semaphore:
+            while busy is not None and busy():
+                await asyncio.sleep(poll_interval)
+            if not needs_refresh(key):
+                return
+            with correlation_scope(f"hot.{key[:8]}"):
+                try:
+                    outcome = await refresh(key, question, user_email)
+                except Exception as e:
+                    logger.warning("Hot question refresh failed", error=type(e).__name__, message=str(e))
+                    outcome = "error"
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            get_metrics().counter("hot_refreshes", result=outcome).inc()
+    
+    await asyncio.gather(*(
+        run(key, question, user_email)
+        for key, question, user_email, _ in hot
+        if needs_refresh(key)
+    ))
+    return outcomes
+
+
+async def run_hot_refresh(interval: float) -> None:
+    """Every interval seconds, refresh hot answers that expire within ICAET_HOT_REFRESH_LEAD seconds."""
+    from .tools import _needs_refresh, _refresh_entry
+    
+    tracker = get_popularity_tracker()
+    if tracker is None:
+        return
+    lead = env_float("ICAET_HOT_REFRESH_LEAD", 300.0)
+    min_hits = env_int("ICAET_HOT_REFRESH_MIN_HITS", 3)
+    concurrency = env_int("ICAET_HOT_REFRESH_CONCURRENCY", 1)
+    in_flight = get_metrics().gauge("queries_in_flight")
+    while True:
+        await asyncio.sleep(interval)
+        outcomes = await refresh_hot(
+            tracker.hottest(min_hits),
+            lambda key: _needs_refresh(key, lead),
+            _refresh_entry,
+            concurrency=concurrency,
+            busy=lambda: in_flight.value > 0
+        )
+        if outcomes:
+            tracker.refreshed += sum(outcomes.values())
+            logger.info("Hot questions refreshed", **outcomes)
+
+
+@asynccontextmanager
+async def hot_refresh_task() -> AsyncIterator[None]:
+    """Refresh hot questions in the background while the block is active, if enabled."""
+    task = None
+    if get_popularity_tracker() is not None:
+        task = asyncio.create_task(run_hot_refresh(max(env_float("ICAET_HOT_REFRESH_INTERVAL", 60.0), 1.0)))
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+_popularity_tracker: PopularityTracker | None = None
+_popularity_tracker_loaded = False
+
+
+def get_popularity_tracker() -> PopularityTracker | None:
+    """Return the process-wide popularity tracker, or None unless hot refresh is enabled."""
+    global _popularity_tracker, _popularity_tracker_loaded
+    if not _popularity_tracker_loaded:
+        _popularity_tracker_loaded = True
+        if env_bool("ICAET_HOT_REFRESH_ENABLED", False):
+            _popularity_tracker = PopularityTracker(
+                k=env_int("ICAET_HOT_REFRESH_TOP_K", 20),
+                half_life=env_float("ICAET_HOT_REFRESH_HALF_LIFE", 3600.0)
+            )
+            logger.info("Hot question refresh enabled", top_k=_popularity_tracker.top.k)
+    return _popularity_tracker
+
+
+def reset_popularity_tracker() -> None:
+    """Drop the process-wide tracker so it is rebuilt from the environment on next use."""
+    global _popularity_tracker, _popularity_tracker_loaded
+    _popularity_tracker = None
+    _popularity_tracker_loaded = False
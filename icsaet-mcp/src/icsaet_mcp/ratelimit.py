@@ -0,0 +1,268 @@
+"""Client-side rate limiting and adaptive concurrency for upstream calls."""
+
+import asyncio
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Callable
+
+from .structured_logging import get_logger
+from .utils import env_bool, env_float, env_int
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+THROTTLE_STATUS_CODES = (429, 503)
+MAX_RETRY_AFTER = 60.0
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date.
+    
+    Returns:
+        Delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(retry_at - (time.time() if now is None else now), 0.0)
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of rejecting callers.
+    
+    Tokens may go negative; the returned delay tells the caller how long to
+    wait for its reservation, which keeps callers in FIFO order.
+    """
+    
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+    
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class UpstreamSlot:
+    """A held concurrency slot; report the upstream response before it is released."""
+    
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.status_code: int | None = None
+        self.retry_after: float | None = None
+    
+    def observe(self, response: "httpx.Response") -> None:
+        """Record the status code and Retry-After header of the response."""
+        self.status_code = response.status_code
+        self.retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    
+    async def __aenter__(self) -> "UpstreamSlot":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+class UpstreamLimiter:
+    """Token-bucket rate limit combined with an AIMD concurrency limit.
+    
+    The concurrency limit grows by roughly one slot per round trip of
+    successful responses and is multiplied by decrease_factor on 429/503,
+    at most once per round trip. A Retry-After header pauses all new
+    requests until it has elapsed. Callers over either limit are queued
+    in arrival order rather than failed.
+    """
+    
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self._clock = clock
+        self._bucket = TokenBucket(rate, burst, clock)
+        self._waiters: deque[asyncio.Future] = deque()
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self.in_flight = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+    
+    def slot(self) -> "_SlotAcquirer":
+        """Return an async context manager that holds a slot for one upstream call."""
+        return _SlotAcquirer(self)
+    
+    async def acquire(self) -> UpstreamSlot:
+        """Wait for any Retry-After pause, a concurrency slot and a rate token.
+        
+        A caller that was woken but finds no free slot, or has to sit out a
+        Retry-After pause, keeps its place at the front of the queue. The
+        pause is waited out before the slot is taken, so it holds none.
+        """
+        start = self._clock()
+        woken = False
+        while True:
+            while self.in_flight >= int(self.limit) or (self._waiters and not woken):
+                waiter = asyncio.get_running_loop().create_future()
+                if woken:
+                    self._waiters.appendleft(waiter)
+                else:
+                    self._waiters.append(waiter)
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    elif not waiter.cancelled():
+                        self._wake()
+                    raise
+                woken = True
+            pause = self._blocked_until - self._clock()
+            if pause <= 0:
+                break
+            woken = True
+            try:
+                await asyncio.sleep(pause)
+            except BaseException:
+                self._wake()
+                raise
+        self.in_flight += 1
+        try:
+            delay = self._bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self.in_flight -= 1
+            self._wake()
+            raise
+        waited = self._clock() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 0.1:
+            logger.debug("Upstream slot acquired after wait", wait_seconds=round(waited, 3), limit=int(self.limit))
+        return UpstreamSlot(self._clock())
+    
+    def release(self, slot: UpstreamSlot) -> None:
+        """Release a slot and adapt the limit to the observed response."""
+        self.in_flight -= 1
+        status_code = slot.status_code
+        if status_code in THROTTLE_STATUS_CODES:
+            self.throttled += 1
+            if slot.started_at >= self._last_decrease:
+                self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                self._last_decrease = self._clock()
+            if slot.retry_after:
+                pause = min(slot.retry_after, MAX_RETRY_AFTER)
+                self._blocked_until = max(self._blocked_until, self._clock() + pause)
+            logger.warning(
+                "Upstream throttled", status_code=status_code, limit=int(self.limit), retry_after=slot.retry_after
+            )
+        elif status_code is not None and status_code < 500:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+    
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+    
+    def stats(self) -> dict:
+        """Return the current limit, queue depth and wait-time counters."""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "total_wait_seconds": round(self.total_wait, 6),
+            "max_wait_seconds": round(self.max_wait, 6),
+            "avg_wait_seconds": round(self.total_wait / self.acquired, 6) if self.acquired else 0.0
+        }
+
+
+class _SlotAcquirer:
+    def __init__(self, limiter: UpstreamLimiter):
+        self._limiter = limiter
+        self._slot: UpstreamSlot | None = None
+    
+    async def __aenter__(self) -> UpstreamSlot:
+        self._slot = await self._limiter.acquire()
+        return self._slot
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self._limiter.release(self._slot)
+
+
+_upstream_limiter: UpstreamLimiter | None = None
+_upstream_limiter_loaded = False
+
+
+def get_upstream_limiter() -> UpstreamLimiter | None:
+    """Return the process-wide upstream limiter, or None if disabled."""
+    global _upstream_limiter, _upstream_limiter_loaded
+    if not _upstream_limiter_loaded:
+        _upstream_limiter_loaded = True
+        if env_bool("ICAET_RATE_LIMIT_ENABLED", True):
+            _upstream_limiter = UpstreamLimiter(
+                rate=env_float("ICAET_RATE_LIMIT_RPS", 10.0),
+                burst=env_int("ICAET_RATE_LIMIT_BURST", 20),
+                initial_limit=env_int("ICAET_CONCURRENCY_INITIAL", 8),
+                min_limit=env_int("ICAET_CONCURRENCY_MIN", 1),
+                max_limit=env_int("ICAET_CONCURRENCY_MAX", 32)
+            )
+    return _upstream_limiter
+
+
+def upstream_slot():
+    """Return a context manager guarding one upstream call with the process-wide limiter."""
+    limiter = get_upstream_limiter()
+    if limiter is None:
+        return UpstreamSlot(time.monotonic())
+    return limiter.slot()
+
+
+def reset_upstream_limiter() -> None:
+    """Drop the process-wide limiter so it is rebuilt from the environment on next use."""
+    global _upstream_limiter, _upstream_limiter_loaded
+    _upstream_limiter = None
+    _upstream_limiter_loaded = False
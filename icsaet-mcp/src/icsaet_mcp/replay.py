@@ -0,0 +1,193 @@
+"""Record upstream responses to a local archive and replay them offline."""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .cache import cache_key
+from .structured_logging import get_logger
+from .utils import env_bool
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+EXACT = "exact"
+NORMALIZED = "normalized"
+MATCHES = (EXACT, NORMALIZED)
+
+
+def default_archive_path() -> Path:
+    """Return the replay archive location, next to the log directory."""
+    override = os.getenv("ICAET_REPLAY_PATH")
+    if override:
+        return Path(override)
+    return Path.home() / ".icsaet-mcp" / "replay" / "archive.jsonl.gz"
+
+
+def exact_key(question: str, user_email: str) -> str:
+    """Key that only matches the identical question text for the same user."""
+    return hashlib.sha256(f"{user_email}\x00{question}".encode("utf-8")).hexdigest()
+
+
+class ReplayArchive:
+    """Gzip-compressed JSON-lines archive of upstream query responses.
+    
+    In RECORD mode every upstream response (status, body and end-to-end
+    latency including retries) is appended as one gzip member, so a crash
+    loses at most the record being written. In REPLAY mode the archive is
+    loaded once and looked up by exact question text or by the normalized
+    cache key; the latest recording of a question wins. Only the question
+    text and hashed keys are stored, never the API key or email.
+    """
+    
+    def __init__(
+        self,
+        path: Path,
+        mode: str,
+        match: str = NORMALIZED,
+        replay_latency: bool = False
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if match not in MATCHES:
+            raise ValueError(f"Unknown replay match: {match}")
+        self.path = Path(path)
+        self.mode = mode
+        self.match = match
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        if mode == REPLAY:
+            self._load()
+    
+    def _load(self) -> None:
+        key_field = "exact_key" if self.match == EXACT else "key"
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry[key_field]] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            logger.warning("Replay archive not found", path=str(self.path))
+        except (OSError, EOFError) as e:
+            # A truncated final member still leaves the earlier records usable
+            logger.warning("Replay archive partly unreadable", path=str(self.path), error=type(e).__name__)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def record(self, question: str, user_email: str, status_code: int, body: str, latency: float) -> None:
+        """Append one response to the archive; failures are logged and ignored."""
+        entry = {
+            "key": cache_key(question, user_email),
+            "exact_key": exact_key(question, user_email),
+            "question": question,
+            "status_code": status_code,
+            "body": body,
+            "latency_ms": round(latency * 1000, 3),
+            "recorded_at": round(time.time(), 3)
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(self.path, "at", encoding="utf-8") as f:
+                    f.write(line)
+                self.recorded += 1
+            except OSError as e:
+                logger.warning("Replay record failed", path=str(self.path), error=type(e).__name__, message=str(e))
+    
+    def lookup(self, question: str, user_email: str) -> dict | None:
+        """Return the recording for a question, or None if there is none."""
+        key = exact_key(question, user_email) if self.match == EXACT else cache_key(question, user_email)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.replayed += 1
+        return entry
+    
+    async def replay(self, question: str, user_email: str, url: str) -> "httpx.Response | None":
+        """Rebuild the recorded response, after the recorded latency if replay_latency is set."""
+        import httpx
+        
+        entry = self.lookup(question, user_email)
+        if entry is None:
+            return None
+        if self.replay_latency and entry.get("latency_ms"):
+            await asyncio.sleep(entry["latency_ms"] / 1000)
+        return httpx.Response(
+            entry["status_code"],
+            content=entry["body"].encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            request=httpx.Request("POST", url)
+        )
+    
+    def stats(self) -> dict:
+        """Return the mode and record/replay counters."""
+        return {
+            "mode": self.mode,
+            "match": self.match,
+            "entries": len(self._entries),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses
+        }
+
+
+_replay_archive: ReplayArchive | None = None
+_replay_archive_loaded = False
+
+
+def get_replay_archive() -> ReplayArchive | None:
+    """Return the process-wide replay archive, or None unless ICAET_REPLAY_MODE is record or replay."""
+    global _replay_archive, _replay_archive_loaded
+    if not _replay_archive_loaded:
+        _replay_archive_loaded = True
+        mode = os.getenv("ICAET_REPLAY_MODE", "off").strip().lower()
+        if mode in MODES:
+            match = os.getenv("ICAET_REPLAY_MATCH", NORMALIZED).strip().lower()
+            if match not in MATCHES:
+                match = NORMALIZED
+            path = default_archive_path()
+            _replay_archive = ReplayArchive(
+                path,
+                mode,
+                match=match,
+                replay_latency=env_bool("ICAET_REPLAY_LATENCY", False)
+            )
+            logger.info(
+                "Replay archive opened",
+                mode=mode,
+                match=match,
+                path=str(path),
+                entries=len(_replay_archive)
+            )
+        elif mode not in ("", "off"):
+            logger.warning("Unknown replay mode, replay disabled", mode=mode)
+    return _replay_archive
+
+
+def reset_replay_archive() -> None:
+    """Drop the process-wide archive so it is reopened from the environment on next use."""
+    global _replay_archive, _replay_archive_loaded
+    _replay_archive = None
+    _replay_archive_loaded = False
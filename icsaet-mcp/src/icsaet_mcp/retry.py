@@ -0,0 +1,116 @@
+"""Retry policy with capped exponential backoff and full jitter."""
+
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from .structured_logging import get_logger
+from .utils import env_float, env_int
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+
+
+def retryable_exceptions() -> tuple[type[Exception], ...]:
+    """Transport errors that are safe to retry; httpx is imported on first use."""
+    import httpx
+    
+    return (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout, httpx.PoolTimeout)
+
+
+class RetryPolicy:
+    """How often and how long to retry a failed upstream call.
+    
+    Only failures that are safe to repeat are retried: connection errors,
+    read timeouts and 502/503/504 responses. Delays use full jitter, a
+    uniform draw between zero and the capped exponential backoff, and no
+    retry is started once the overall deadline would be exceeded.
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 5.0,
+        deadline: float = 45.0,
+        rng: Callable[[], float] = random.random
+    ):
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._rng = rng
+    
+    def backoff(self, attempt: int) -> float:
+        """Return the jittered delay before retrying after the given attempt number."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self._rng() * cap
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Build the retry policy from the environment."""
+    return RetryPolicy(
+        max_attempts=env_int("ICAET_RETRY_MAX_ATTEMPTS", 3),
+        base_delay=env_float("ICAET_RETRY_BASE_DELAY", 0.5),
+        max_delay=env_float("ICAET_RETRY_MAX_DELAY", 5.0),
+        deadline=env_float("ICAET_RETRY_DEADLINE", 45.0)
+    )
+
+
+async def call_with_retry(
+    attempt_fn: Callable[[float], Awaitable["httpx.Response"]],
+    policy: RetryPolicy,
+    clock: Callable[[], float] = time.monotonic
+) -> "httpx.Response":
+    """Call attempt_fn until it succeeds, fails permanently or runs out of attempts or time.
+    
+    Args:
+        attempt_fn: Performs one attempt; receives the seconds left before the deadline
+        policy: Retry policy to apply
+        clock: Monotonic clock used for the deadline
+        
+    Returns:
+        The last response received. Retryable exceptions from the final attempt are re-raised.
+    """
+    retryable = retryable_exceptions()
+    start = clock()
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = policy.deadline - (clock() - start)
+        error = None
+        try:
+            response = await attempt_fn(remaining)
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            reason = {"status_code": response.status_code}
+        except retryable as e:
+            error = e
+            reason = {"error": type(e).__name__}
+        
+        if attempt >= policy.max_attempts:
+            logger.warning("API request attempts exhausted", attempt=attempt, **reason)
+            if error is not None:
+                raise error
+            return response
+        
+        delay = policy.backoff(attempt)
+        if clock() - start + delay >= policy.deadline:
+            logger.warning("API request deadline reached", attempt=attempt, **reason)
+            if error is not None:
+                raise error
+            return response
+        
+        logger.warning(
+            "API request attempt failed",
+            attempt=attempt,
+            max_attempts=policy.max_attempts,
+            **reason,
+            retry_in=round(delay, 3)
+        )
+        await asyncio.sleep(delay)
@@ -0,0 +1,312 @@
+"""Local BM25 full-text index over answers already fetched from the ICAET API."""
+
+import asyncio
+import gzip
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import suppress
+from pathlib import Path
+
+from .semantic_cache import STOPWORDS
+from .structured_logging import get_logger
+from .utils import env_bool, env_int
+
+logger = get_logger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+INDEX_VERSION = 1
+
+
+def default_index_path() -> Path:
+    """Return the search index location, next to the log directory."""
+    override = os.getenv("ICAET_SEARCH_INDEX_PATH")
+    if override:
+        return Path(override)
+    return Path.home() / ".icsaet-mcp" / "index" / "answers.json.gz"
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, dropping stopwords and single characters."""
+    return [token for token in _TOKEN.findall(text.casefold()) if len(token) > 1 and token not in STOPWORDS]
+
+
+def answer_text(result: dict) -> str:
+    """Return the readable answer text of an API result."""
+    answer = result.get("answer")
+    if isinstance(answer, str):
+        return answer
+    rest = {key: value for key, value in result.items() if key != "sources"}
+    return json.dumps(rest, ensure_ascii=False, default=str)
+
+
+def source_names(result: dict) -> list[str]:
+    """Return the sources of an API result as strings."""
+    sources = result.get("sources")
+    if not isinstance(sources, list):
+        return []
+    return [source if isinstance(source, str) else json.dumps(source, default=str) for source in sources]
+
+
+def read_documents(path: Path) -> list[list]:
+    """Return the [doc_id, question, answer, sources, added_at] rows saved at path."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != INDEX_VERSION:
+        return []
+    return data.get("documents", [])
+
+
+def _snippet(text: str, terms: set[str], width: int = 240) -> str:
+    """Return about width characters of text around the first query term."""
+    if len(text) <= width:
+        return text
+    start = 0
+    for match in _TOKEN.finditer(text.casefold()):
+        if match.group() in terms:
+            start = max(match.start() - width // 4, 0)
+            break
+    snippet = text[start:start + width]
+    return ("..." if start else "") + snippet + ("..." if start + width < len(text) else "")
+
+
+class SearchIndex:
+    """In-memory inverted index with BM25 ranking and incremental updates.
+    
+    Each document is one answered question: its question, answer text and
+    sources are indexed together. Adding a document with an existing ID
+    replaces it. Beyond max_documents the oldest document is removed.
+    The index is persisted as a gzip JSON list of documents; postings are
+    rebuilt on load, which keeps the file small.
+    """
+    
+    def __init__(self, max_documents: int = 2000, k1: float = 1.2, b: float = 0.75):
+        self.max_documents = max_documents
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._documents: dict[str, dict] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+        self.searches = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._documents)
+    
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+    
+    def add(self, doc_id: str, question: str, answer: str, sources: list[str], added_at: float | None = None) -> None:
+        """Index a document, replacing any previous document with the same ID."""
+        with self._lock:
+            if doc_id in self._documents:
+                self._remove(doc_id)
+            terms = Counter(tokenize(" ".join([question, answer, *sources])))
+            self._documents[doc_id] = {
+                "question": question,
+                "answer": answer,
+                "sources": sources,
+                "added_at": time.time() if added_at is None else added_at
+            }
+            for term, count in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+            length = sum(terms.values())
+            self._lengths[doc_id] = length
+            self._total_length += length
+            while len(self._documents) > self.max_documents:
+                self._remove(next(iter(self._documents)))
+                self.evictions += 1
+    
+    def remove(self, doc_id: str) -> None:
+        """Remove a document if present."""
+        with self._lock:
+            if doc_id in self._documents:
+                self._remove(doc_id)
+    
+    def _remove(self, doc_id: str) -> None:
+        document = self._documents.pop(doc_id)
+        for term in set(tokenize(" ".join([document["question"], document["answer"], *document["sources"]]))):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+    
+    def search(self, query: str, limit: int = 5) -> list[dict]:
+        """Return up to limit documents ranked by BM25 score for the query."""
+        terms = set(tokenize(query))
+        with self._lock:
+            self.searches += 1
+            count = len(self._documents)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count
+            scores: dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:max(limit, 0)]
+            return [
+                {
+                    "question": self._documents[doc_id]["question"],
+                    "score": round(score, 4),
+                    "snippet": _snippet(self._documents[doc_id]["answer"], terms),
+                    "sources": self._documents[doc_id]["sources"]
+                }
+                for doc_id, score in ranked
+            ]
+    
+    def save(self, path: Path) -> None:
+        """Write the documents to path atomically."""
+        with self._lock:
+            documents = [
+                [doc_id, doc["question"], doc["answer"], doc["sources"], doc["added_at"]]
+                for doc_id, doc in self._documents.items()
+            ]
+        payload = json.dumps({"version": INDEX_VERSION, "documents": documents}, separators=(",", ":"))
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(payload.encode("utf-8")))
+            os.replace(temp_name, path)
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(temp_name)
+            raise
+    
+    def load(self, path: Path) -> int:
+        """Add the documents saved at path; returns how many were loaded."""
+        documents = read_documents(path)
+        for doc_id, question, answer, sources, added_at in documents:
+            self.add(doc_id, question, answer, sources, added_at)
+        return len(documents)
+    
+    def stats(self) -> dict:
+        """Return document, term and search counters."""
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "terms": len(self._postings),
+                "searches": self.searches,
+                "evictions": self.evictions
+            }
+
+
+class PersistentSearchIndex(SearchIndex):
+    """SearchIndex that loads from a file on creation and saves after every save_every additions.
+    
+    Several server processes may share the file. Before saving, documents
+    that other processes added to the file are merged in, and the file is
+    replaced with an atomic rename, so it is never left half-written. Two
+    saves that overlap between the read and the rename can still drop the
+    other's newest documents until its next save. Read or write failures
+    are logged and the index keeps working in memory.
+    """
+    
+    def __init__(self, path: Path, save_every: int = 10, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.save_every = max(save_every, 1)
+        self._unsaved = 0
+        if self.path.exists():
+            try:
+                self.load(self.path)
+            except (OSError, EOFError, ValueError, TypeError) as e:
+                logger.warning("Search index unreadable, starting empty", path=str(self.path), error=type(e).__name__)
+    
+    def add_result(self, doc_id: str, question: str, result: dict) -> None:
+        """Index an API result and save once enough additions have accumulated."""
+        self.add(doc_id, question, answer_text(result), source_names(result))
+        with self._lock:
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+        if due:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Save the index if anything was added since the last save."""
+        with self._lock:
+            if not self._unsaved:
+                return
+            self._unsaved = 0
+        try:
+            self._merge_saved()
+            self.save(self.path)
+        except OSError as e:
+            logger.warning("Search index save failed", path=str(self.path), error=type(e).__name__, message=str(e))
+    
+    def _merge_saved(self) -> None:
+        """Add documents saved by other processes that are newer than ours."""
+        if not self.path.exists():
+            return
+        try:
+            documents = read_documents(self.path)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        with self._lock:
+            full = len(self._documents) >= self.max_documents
+            oldest = min((doc["added_at"] for doc in self._documents.values()), default=0.0)
+            known = {doc_id: doc["added_at"] for doc_id, doc in self._documents.items()}
+        for doc_id, question, answer, sources, added_at in sorted(documents, key=lambda row: row[4]):
+            if (full and added_at <= oldest) or known.get(doc_id, float("-inf")) >= added_at:
+                continue
+            self.add(doc_id, question, answer, sources, added_at)
+
+
+_search_index: PersistentSearchIndex | None = None
+_search_index_loaded = False
+_search_index_lock = threading.Lock()
+
+
+def get_search_index() -> PersistentSearchIndex | None:
+    """Return the process-wide search index, or None if it is disabled.
+    
+    The first call reads the index file; from async code use
+    open_search_index so that happens on a worker thread.
+    """
+    global _search_index, _search_index_loaded
+    if not _search_index_loaded:
+        with _search_index_lock:
+            if not _search_index_loaded:
+                if env_bool("ICAET_SEARCH_INDEX_ENABLED", True):
+                    path = default_index_path()
+                    _search_index = PersistentSearchIndex(
+                        path,
+                        save_every=env_int("ICAET_SEARCH_INDEX_SAVE_EVERY", 10),
+                        max_documents=env_int("ICAET_SEARCH_INDEX_MAX_DOCUMENTS", 2000)
+                    )
+                    logger.info("Search index opened", path=str(path), documents=len(_search_index))
+                _search_index_loaded = True
+    return _search_index
+
+
+async def open_search_index() -> PersistentSearchIndex | None:
+    """Return the process-wide search index, loading it on a worker thread the first time."""
+    if _search_index_loaded:
+        return _search_index
+    return await asyncio.to_thread(get_search_index)
+
+
+def close_search_index() -> None:
+    """Save and drop the process-wide index so it is reopened from the environment on next use."""
+    global _search_index, _search_index_loaded
+    with _search_index_lock:
+        if _search_index is not None:
+            _search_index.flush()
+        _search_index = None
+        _search_index_loaded = False
@@ -0,0 +1,261 @@
+"""Near-duplicate question cache using MinHash signatures and LSH banding."""
+
+import random
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Callable
+
+from .structured_logging import get_logger
+from .utils import env_bool, env_float, env_int, normalize_question
+
+logger = get_logger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+_POSSESSIVE = re.compile(r"['’]s\b")
+
+# Question and instruction words that change the phrasing but not the topic,
+# so "What did X talk about?" and "Summarize X's talk" reduce to the same words.
+# The interrogatives among them do change what is asked; question_type keeps
+# that apart.
+STOPWORDS = frozenset("""
+    a about an and any are as at be by can could describe did do does explain for from give had has have
+    how i in is it its me of on or please say said share shared should summarize summarise tell than that
+    the their them there these they this those to was were what when where which who whom why will with
+    would you your
+""".split())
+
+
+def content_words(question: str) -> list[str]:
+    """Return the words of a question that carry its topic.
+    
+    Case, punctuation, possessive 's and STOPWORDS are dropped.
+    """
+    words = []
+    for word in _WORD.findall(_POSSESSIVE.sub("", normalize_question(question))):
+        if word not in STOPWORDS:
+            words.append(word)
+    return words
+
+
+# Interrogatives that ask for a different kind of answer than "what"; a
+# question with none of them (including "Summarize ...") is a "what" question.
+_QUESTION_TYPES = {
+    "when": "when",
+    "where": "where",
+    "why": "why",
+    "who": "who",
+    "whom": "who",
+    "whose": "who",
+    "how": "how",
+    "which": "which"
+}
+
+
+def question_type(question: str) -> str:
+    """Return the kind of answer a question asks for: when, where, why, who, how, which or what."""
+    for word in _WORD.findall(normalize_question(question)):
+        if word == "what":
+            return "what"
+        if word in _QUESTION_TYPES:
+            return _QUESTION_TYPES[word]
+    return "what"
+
+
+def question_numbers(question: str) -> str:
+    """Return the distinct numbers in a question, sorted and space-separated.
+    
+    "2023" and "2024" or "top 3" and "top 5" differ by a single n-gram,
+    so near-duplicates must agree on their numbers exactly.
+    """
+    words = _WORD.findall(normalize_question(question))
+    return " ".join(sorted({word for word in words if any(char.isdigit() for char in word)}))
+
+
+def _scope(question: str, user_email: str) -> tuple[str, str, str]:
+    return user_email, question_type(question), question_numbers(question)
+
+
+def shingles(question: str, size: int = 3) -> frozenset[str]:
+    """Return the character n-grams of a question's content words.
+    
+    The text is padded with spaces so word boundaries count; a question
+    shorter than one n-gram becomes a single n-gram.
+    """
+    text = " ".join(content_words(question))
+    if not text:
+        return frozenset()
+    padded = f" {text} "
+    if len(padded) <= size:
+        return frozenset([padded])
+    return frozenset(padded[i:i + size] for i in range(len(padded) - size + 1))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two sets; two empty sets are not similar."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class SemanticCache:
+    """Bounded cache that answers a question with the entry for a close paraphrase.
+    
+    Each question is reduced to the character n-grams of its content words
+    and summarized by a MinHash signature of num_perm values. Signatures are
+    split into bands; entries sharing any band with the lookup are the
+    candidates, and the one with the highest exact Jaccard similarity is
+    returned if it reaches threshold. Entries are scoped to the user email,
+    the question_type and the question_numbers, so "When did X talk?" never
+    answers "Where did X talk?" and "Talks in 2023" never answers "Talks in
+    2024", however similar the rest is. Entries expire after ttl seconds and
+    are evicted least-recently-used beyond max_entries.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        max_entries: int = 512,
+        ttl: float = 3600.0,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if bands <= 0 or num_perm % bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._clock = clock
+        rng = random.Random(0x1CAE7)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._entries: OrderedDict[tuple[str, str, str, str], tuple[float, frozenset, tuple, dict]] = OrderedDict()
+        self._buckets: dict[tuple, set[tuple[str, str, str, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.candidates_checked = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def signature(self, grams: frozenset[str]) -> tuple[int, ...]:
+        """Return the MinHash signature of a set of n-grams."""
+        hashes = [zlib.crc32(gram.encode("utf-8")) for gram in grams]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        )
+    
+    def _band_keys(self, scope: tuple[str, str, str], signature: tuple[int, ...]) -> list[tuple]:
+        return [
+            (*scope, band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+    
+    def get(self, question: str, user_email: str) -> tuple[dict, float] | None:
+        """Return the value cached for the closest paraphrase and its similarity, or None."""
+        grams = shingles(question, self.shingle_size)
+        if not grams:
+            self.misses += 1
+            return None
+        signature = self.signature(grams)
+        candidates = set()
+        for band_key in self._band_keys(_scope(question, user_email), signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        
+        now = self._clock()
+        best_key, best_similarity = None, 0.0
+        for key in candidates:
+            expires_at, entry_grams, _, _ = self._entries[key]
+            if now >= expires_at:
+                self._remove(key)
+                continue
+            self.candidates_checked += 1
+            similarity = jaccard(grams, entry_grams)
+            if similarity > best_similarity:
+                best_key, best_similarity = key, similarity
+        
+        if best_key is None or best_similarity < self.threshold:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(best_key)
+        self.hits += 1
+        return self._entries[best_key][3], best_similarity
+    
+    def set(self, question: str, user_email: str, value: dict) -> bool:
+        """Index a question's answer; returns False if the question has no content words."""
+        grams = shingles(question, self.shingle_size)
+        if not grams or self.max_entries <= 0:
+            return False
+        key = (*_scope(question, user_email), " ".join(sorted(grams)))
+        if key in self._entries:
+            self._remove(key)
+        signature = self.signature(grams)
+        self._entries[key] = (self._clock() + self.ttl, grams, signature, value)
+        for band_key in self._band_keys(key[:3], signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+    
+    def _remove(self, key: tuple[str, str, str, str]) -> None:
+        _, _, signature, _ = self._entries.pop(key)
+        for band_key in self._band_keys(key[:3], signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+    
+    def stats(self) -> dict:
+        """Return hit, miss and index size counters."""
+        return {
+            "entries": len(self._entries),
+            "buckets": len(self._buckets),
+            "hits": self.hits,
+            "misses": self.misses,
+            "candidates_checked": self.candidates_checked,
+            "evictions": self.evictions
+        }
+
+
+_semantic_cache: SemanticCache | None = None
+_semantic_cache_loaded = False
+
+
+def get_semantic_cache() -> SemanticCache | None:
+    """Return the process-wide semantic cache, or None if it is disabled."""
+    global _semantic_cache, _semantic_cache_loaded
+    if not _semantic_cache_loaded:
+        _semantic_cache_loaded = True
+        if env_bool("ICAET_SEMANTIC_CACHE_ENABLED", False):
+            _semantic_cache = SemanticCache(
+                threshold=env_float("ICAET_SEMANTIC_CACHE_THRESHOLD", 0.8),
+                max_entries=env_int("ICAET_SEMANTIC_CACHE_MAX_ENTRIES", 512),
+                ttl=env_float("ICAET_SEMANTIC_CACHE_TTL", 3600.0)
+            )
+            logger.info(
+                "Semantic cache enabled",
+                threshold=_semantic_cache.threshold,
+                max_entries=_semantic_cache.max_entries,
+                ttl=_semantic_cache.ttl
+            )
+    return _semantic_cache
+
+
+def reset_semantic_cache() -> None:
+    """Drop the process-wide semantic cache so it is rebuilt from the environment on next use."""
+    global _semantic_cache, _semantic_cache_loaded
+    _semantic_cache = None
+    _semantic_cache_loaded = False
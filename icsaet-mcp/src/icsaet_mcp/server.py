@@ -2,11 +2,19 @@
 
 import os
 import sys
+from contextlib import asynccontextmanager
 
 from fastmcp import FastMCP
 
+from .disk_cache import close_disk_cache
+from .http_client import aclose_client
 from .logging_config import setup_logging
-from .utils import sanitize_api_key, sanitize_email
+from .metrics import metrics_reporter
+from .popularity import hot_refresh_task
+from .search_index import close_search_index
+from .structured_logging import get_logger
+from .utils import env_float, sanitize_api_key, sanitize_email
+from .warmup import warmup_task
 
 logger = setup_logging()
 
@@ -25,9 +33,22 @@ if not USER_EMAIL:
     sys.stderr.write("Error: USER_EMAIL environment variable is required\n")
     sys.exit(1)
 
-logger.info(f"Configuration loaded [api_key={sanitize_api_key(ICAET_API_KEY)}, email={sanitize_email(USER_EMAIL)}]")
+get_logger(__name__).info("Configuration loaded", api_key=sanitize_api_key(ICAET_API_KEY), email=sanitize_email(USER_EMAIL))
 
-mcp = FastMCP("ICAET Query Server")
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Run background metrics, cache warm-up and hot refresh tasks and release shared resources on shutdown."""
+    try:
+        async with metrics_reporter(env_float("ICAET_METRICS_LOG_INTERVAL", 0.0)), warmup_task(), hot_refresh_task():
+            yield
+    finally:
+        await aclose_client()
+        close_disk_cache()
+        close_search_index()
+
+
+mcp = FastMCP("ICAET Query Server", lifespan=lifespan)
 
 logger.info("Server ready")
 
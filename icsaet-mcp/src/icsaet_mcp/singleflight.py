@@ -0,0 +1,76 @@
+"""Single-flight coalescing of identical concurrent calls."""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from .structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+    
+    The first caller for a key starts the call as a task; later callers await
+    the same task. Each waiter is shielded, so cancelling one waiter never
+    cancels the shared call for the others. The shared call is only cancelled
+    once every waiter has gone away. Exceptions raised by the call are
+    re-raised in every waiter.
+    """
+    
+    def __init__(self):
+        self._flights: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.cancelled_waiters = 0
+        self.abandoned = 0
+    
+    def __len__(self) -> int:
+        return len(self._flights)
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn for key, or join the call already in flight for key."""
+        loop = asyncio.get_running_loop()
+        task = self._flights.get(key)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(fn())
+            task.add_done_callback(lambda t: self._finish(key, t))
+            self._flights[key] = task
+            self._waiters[key] = 0
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+            logger.debug("Coalesced in-flight query", waiters=self._waiters[key] + 1)
+        
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                self.cancelled_waiters += 1
+                if self._flights.get(key) is task and self._waiters[key] == 1:
+                    self.abandoned += 1
+                    task.cancel()
+            raise
+        finally:
+            if self._flights.get(key) is task:
+                self._waiters[key] -= 1
+    
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every waiter was cancelled
+            task.exception()
+    
+    def stats(self) -> dict:
+        """Return coalescing counters."""
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "cancelled_waiters": self.cancelled_waiters,
+            "abandoned": self.abandoned
+        }
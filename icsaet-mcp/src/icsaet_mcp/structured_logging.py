@@ -0,0 +1,146 @@
+"""Structured logging with lazily evaluated fields and correlation IDs."""
+
+import contextvars
+import json
+import logging
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+correlation_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("icaet_correlation_id", default=None)
+
+
+def new_correlation_id() -> str:
+    """Return a short random ID for tying together the log lines of one request."""
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def correlation_scope(value: str | None = None) -> Iterator[str]:
+    """Tag every record logged inside the block, including from child tasks, with one ID."""
+    value = value or new_correlation_id()
+    token = correlation_id.set(value)
+    try:
+        yield value
+    finally:
+        correlation_id.reset(token)
+
+
+class StructuredMessage:
+    """Log message with named fields, rendered as "message [key=value, ...]".
+    
+    Field values may be zero-argument callables; they are evaluated by
+    resolve() once the record is known to be emitted, so expensive values
+    cost nothing at suppressed levels.
+    """
+    
+    __slots__ = ("message", "fields")
+    
+    def __init__(self, message: str, fields: dict):
+        self.message = message
+        self.fields = fields
+    
+    def resolve(self) -> "StructuredMessage":
+        """Evaluate callable field values in place."""
+        for key, value in self.fields.items():
+            if callable(value):
+                self.fields[key] = value()
+        return self
+    
+    def __str__(self) -> str:
+        self.resolve()
+        if not self.fields:
+            return self.message
+        rendered = ", ".join(f"{key}={value}" for key, value in self.fields.items())
+        return f"{self.message} [{rendered}]"
+
+
+class StructuredLogger:
+    """Thin wrapper over logging.Logger that takes fields as keyword arguments.
+    
+    The level check happens before anything is built, so a suppressed call
+    costs one method call and no string formatting.
+    """
+    
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+    
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+    
+    def _log(self, level: int, msg: str, fields: dict) -> None:
+        self.logger.log(level, StructuredMessage(msg, fields), stacklevel=3)
+    
+    def log(self, level: int, msg: str, /, **fields: Any) -> None:
+        if self.logger.isEnabledFor(level):
+            self._log(level, msg, fields)
+    
+    def debug(self, msg: str, /, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, fields)
+    
+    def info(self, msg: str, /, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, fields)
+    
+    def warning(self, msg: str, /, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, fields)
+    
+    def error(self, msg: str, /, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """Return a structured logger for the given module name."""
+    return StructuredLogger(logging.getLogger(name))
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamp records with the correlation ID of the context that logged them."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "correlation_id"):
+            record.correlation_id = correlation_id.get()
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text formatter that appends the correlation ID as a request_id field."""
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        request_id = getattr(record, "correlation_id", None)
+        if request_id:
+            msg = record.msg
+            if isinstance(msg, StructuredMessage):
+                record.message = str(StructuredMessage(msg.message, {**msg.fields, "request_id": request_id}))
+            else:
+                record.message = f"{record.message} [request_id={request_id}]"
+        return super().formatMessage(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message, its fields and the correlation ID."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        msg = record.msg
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name
+        }
+        if isinstance(msg, StructuredMessage):
+            entry["message"] = msg.message
+            entry.update({key: value for key, value in msg.resolve().fields.items() if key not in entry})
+        else:
+            entry["message"] = record.getMessage()
+        request_id = getattr(record, "correlation_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
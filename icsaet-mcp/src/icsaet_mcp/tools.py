@@ -1,65 +1,657 @@
 """MCP tools for ICAET query operations."""
 
-import httpx
-import logging
+import asyncio
+import contextvars
+import json
+import os
+import time
+from typing import Awaitable, Callable
 
+from fastmcp import Context
+
+from .cache import CacheEntry, Revalidation, cache_key, content_hash, get_response_cache
+from .circuit_breaker import CircuitOpenError, breaker_guard, get_circuit_breaker
+from .decompose import merge_answers, split_question
+from .disk_cache import get_disk_cache
+from .hedging import get_hedger
+from .http_client import REQUEST_TIMEOUT, get_client, get_client_stats, request_extensions
+from .logging_config import get_log_queue_stats, get_log_throttle_stats
+from .metrics import get_metrics
+from .negative_cache import NEGATIVE_STATUS_CODES, credentials_fingerprint, get_negative_cache
+from .popularity import get_popularity_tracker
+from .ratelimit import get_upstream_limiter, upstream_slot
+from .replay import RECORD, REPLAY, ReplayArchive, get_replay_archive
+from .retry import call_with_retry, get_retry_policy
+from .search_index import get_search_index, open_search_index
+from .semantic_cache import get_semantic_cache
 from .server import ICAET_API_KEY, USER_EMAIL, mcp
-from .utils import sanitize_question
+from .singleflight import SingleFlight
+from .structured_logging import correlation_id, correlation_scope, get_logger
+from .tracing import get_tracer, span, trace
+from .utils import env_bool, env_int, sanitize_question
+
+logger = get_logger(__name__)
+
+DEFAULT_API_URL = "https://icaet-dev.wesleyreisz.com/query"
 
-logger = logging.getLogger(__name__)
+query_flights = SingleFlight()
 
 
-async def _query_impl(question: str, api_key: str, user_email: str) -> dict:
+async def _query_impl(
+    question: str,
+    api_key: str,
+    user_email: str,
+    revalidation: Revalidation | None = None
+) -> dict:
     """Implementation of query logic for testability.
     
     Args:
         question: The question to ask the ICAET knowledge base
         api_key: API key for authentication
         user_email: User email for the request
-        
+        revalidation: Optional conditional-request state; receives the
+            response ETag. When it carries a cached answer the disk cache is
+            bypassed and a 304 Not Modified returns that answer.
+            
     Returns:
         API response as a dictionary, or error dict if request fails
     """
-    logger.info(f"Query received [question_length={len(question)}]")
-    logger.debug(f"Query question [question={sanitize_question(question, max_len=100)}]")
+    logger.info("Query received", question_length=len(question))
+    logger.debug("Query question", question=lambda: sanitize_question(question, max_len=100))
+    metrics = get_metrics()
+    url = os.getenv("ICAET_API_URL", DEFAULT_API_URL)
+    
+    # Replay answers only from the archive, never from the disk or negative
+    # caches, so a replayed run does not depend on what ~/.icsaet-mcp holds.
+    archive = get_replay_archive()
+    if archive is not None and archive.mode == REPLAY:
+        return await _replay_query(archive, question, user_email, url)
+    
+    disk_cache = get_disk_cache()
+    key = cache_key(question, user_email)
+    refreshing = revalidation is not None and revalidation.refresh
+    if disk_cache is not None and not refreshing:
+        with span("disk_cache.get") as current:
+            cached = await asyncio.to_thread(disk_cache.get, key)
+            if current is not None:
+                current.set(hit=cached is not None)
+        if cached is not None:
+            logger.info("Disk cache hit")
+            metrics.counter("cache_hits", tier="disk").inc()
+            return cached
+    
+    import httpx  # Deferred so that startup does not pay for it before the handshake
     
-    url = "https://icaet-dev.wesleyreisz.com/query"
     headers = {
         "Content-Type": "application/json",
         "x-api-key": api_key
     }
+    if revalidation is not None and revalidation.if_none_match:
+        headers["If-None-Match"] = revalidation.if_none_match
     body = {
         "email": user_email,
         "question": question
     }
     
+    negative_cache = get_negative_cache()
+    fingerprint = credentials_fingerprint(api_key, url)
+    if negative_cache is not None:
+        rejected = negative_cache.rejected_credentials(fingerprint)
+        if rejected is not None:
+            logger.warning("API request skipped", error="InvalidApiKey")
+            metrics.counter("query_errors", type="InvalidApiKey").inc()
+            return rejected
+        cached_error = negative_cache.get(fingerprint, key)
+        if cached_error is not None:
+            logger.info("Negative cache hit", question_length=len(question))
+            metrics.counter("query_errors", type="NegativeCached").inc()
+            return cached_error
+    
+    client = get_client()
+    hedger = get_hedger()
+    
+    async def send(remaining: float) -> httpx.Response:
+        with span("upstream.attempt") as current:
+            response = await send_guarded(remaining)
+            if current is not None:
+                current.set(status_code=response.status_code)
+            return response
+    
+    async def send_guarded(remaining: float) -> httpx.Response:
+        async with breaker_guard() as guard, upstream_slot() as slot:
+            # Time from here so that queueing for the slot and Retry-After
+            # pauses do not count as slow upstream calls.
+            guard.start()
+            metrics.counter("upstream_requests").inc()
+            started = time.perf_counter()
+            response = await client.post(
+                url,
+                json=body,
+                headers=headers,
+                timeout=max(min(REQUEST_TIMEOUT, remaining), 0.001),
+                extensions=request_extensions()
+            )
+            metrics.histogram("upstream_latency").record(time.perf_counter() - started)
+            metrics.counter("upstream_responses", status=response.status_code).inc()
+            metrics.counter("bytes_out").inc(len(response.request.content))
+            metrics.counter("bytes_in").inc(len(response.content))
+            slot.observe(response)
+            guard.observe(response)
+        return response
+    
+    async def attempt(remaining: float) -> httpx.Response:
+        if hedger is None:
+            return await send(remaining)
+        return await hedger.run(lambda: send(remaining))
+    
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=body, headers=headers)
+        started = time.perf_counter()
+        response = await call_with_retry(attempt, get_retry_policy())
+        if refreshing and revalidation.cached is not None and response.status_code == 304:
+            logger.info("API answer not modified")
+            revalidation.not_modified = True
+            revalidation.etag = response.headers.get("ETag") or revalidation.if_none_match
+            result = revalidation.cached
+        else:
+            if archive is not None and archive.mode == RECORD:
+                await asyncio.to_thread(
+                    archive.record, question, user_email, response.status_code, response.text,
+                    time.perf_counter() - started
+                )
             response.raise_for_status()
-            logger.info(f"API request successful [status_code={response.status_code}]")
-            logger.debug(f"API response [response_size={len(response.text)} bytes]")
-            return response.json()
+            logger.info("API request successful", status_code=response.status_code)
+            logger.debug("API response", response_bytes=lambda: len(response.content))
+            with span("json.decode", response_bytes=len(response.content)):
+                result = response.json()
+            if revalidation is not None:
+                revalidation.etag = response.headers.get("ETag")
+    except CircuitOpenError as e:
+        logger.warning("API request skipped", error="CircuitOpen", retry_in=round(e.retry_in))
+        metrics.counter("query_errors", type="CircuitOpen").inc()
+        # A refresh must fail here: handing it the old disk answer would
+        # look like an unchanged upstream answer and renew the stale entry.
+        if disk_cache is not None and not refreshing:
+            stale = await asyncio.to_thread(disk_cache.get, key, True)
+            if stale is not None:
+                logger.info("Serving stale disk cache entry while circuit is open")
+                return stale
+        return {"error": str(e)}
     except httpx.HTTPStatusError as e:
-        logger.error(f"API request failed [status_code={e.response.status_code}, error=HTTPStatusError]")
-        return {"error": f"API error {e.response.status_code}: {e.response.text}"}
+        status_code = e.response.status_code
+        logger.error("API request failed", status_code=status_code, error="HTTPStatusError")
+        metrics.counter("query_errors", type="HTTPStatusError").inc()
+        error = {"error": f"API error {status_code}: {e.response.text}"}
+        if negative_cache is not None and status_code == 401:
+            logger.error("API key rejected, skipping further queries until ICAET_API_KEY changes")
+            negative_cache.reject_credentials(
+                fingerprint,
+                {"error": f"{error['error']} (ICAET_API_KEY was rejected; fix it and restart the server)"}
+            )
+        elif negative_cache is not None and status_code in NEGATIVE_STATUS_CODES:
+            negative_cache.set(fingerprint, key, error)
+        return error
     except httpx.RequestError as e:
-        logger.error(f"API request failed [error=RequestError, message={str(e)}]")
+        logger.error("API request failed", error="RequestError", message=str(e))
+        metrics.counter("query_errors", type="RequestError").inc()
         return {"error": f"Request failed: {str(e)}"}
     except Exception as e:
-        logger.error(f"API request failed [error=UnexpectedException, message={str(e)}]")
+        logger.error("API request failed", error="UnexpectedException", message=str(e))
+        metrics.counter("query_errors", type="UnexpectedException").inc()
+        return {"error": f"Unexpected error: {str(e)}"}
+    
+    if disk_cache is not None and isinstance(result, dict) and "error" not in result:
+        with span("disk_cache.set"):
+            await asyncio.to_thread(disk_cache.set, key, result)
+    return result
+
+
+async def _replay_query(archive: ReplayArchive, question: str, user_email: str, url: str) -> dict:
+    """Answer a query from the replay archive instead of the upstream API.
+    
+    Recorded error responses are returned as the same error dicts the live
+    path produces; a question that was never recorded is an error too.
+    """
+    import httpx
+    
+    response = await archive.replay(question, user_email, url)
+    if response is None:
+        logger.warning("Replay miss", question_length=len(question))
+        get_metrics().counter("query_errors", type="ReplayMiss").inc()
+        return {"error": "No recorded response for this question (ICAET_REPLAY_MODE=replay)"}
+    logger.info("Replayed recorded response", status_code=response.status_code)
+    get_metrics().counter("cache_hits", tier="replay").inc()
+    try:
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        return {"error": f"API error {e.response.status_code}: {e.response.text}"}
+    except ValueError as e:
         return {"error": f"Unexpected error: {str(e)}"}
 
 
+async def _cached_query(question: str, api_key: str, user_email: str, background: bool = False) -> dict:
+    """Serve a query from the response cache, falling back to _query_impl.
+    
+    Concurrent misses for the same normalized question share a single
+    upstream call. Only successful responses are cached; error dicts are
+    always returned uncached so the next call retries upstream.
+    
+    background marks traffic the server generates itself, such as the
+    cache warm-up: it is left out of the query metrics and the popularity
+    tracker, so it neither inflates query counts nor makes its own
+    questions look popular.
+    """
+    if background:
+        with trace("query", question_length=len(question), background=True):
+            return await _lookup_or_fetch(question, api_key, user_email)
+    
+    metrics = get_metrics()
+    metrics.counter("queries").inc()
+    in_flight = metrics.gauge("queries_in_flight")
+    in_flight.inc()
+    started = time.perf_counter()
+    tracker = get_popularity_tracker()
+    if tracker is not None:
+        tracker.record(cache_key(question, user_email), question, user_email)
+    try:
+        with trace("query", question_length=len(question)):
+            return await _lookup_or_fetch(question, api_key, user_email)
+    finally:
+        in_flight.dec()
+        metrics.histogram("query_latency").record(time.perf_counter() - started)
+
+
+async def _lookup_or_fetch(question: str, api_key: str, user_email: str) -> dict:
+    """Return the cached answer for a question or a close paraphrase, or fetch it.
+    
+    Concurrent misses for the same normalized question are coalesced.
+    """
+    cache = get_response_cache()
+    key = cache_key(question, user_email)
+    if cache is not None:
+        entry = cache.get_entry(key)
+        if entry is not None:
+            if cache.is_stale(entry):
+                logger.info("Stale cache hit", question_length=len(question))
+                get_metrics().counter("cache_hits", tier="stale").inc()
+                _schedule_revalidation(key, entry, question, api_key, user_email)
+            else:
+                logger.info("Cache hit", question_length=len(question))
+                get_metrics().counter("cache_hits", tier="memory").inc()
+            with span("memory_cache.hit"):
+                return entry.value
+    
+    semantic_cache = get_semantic_cache()
+    if semantic_cache is not None:
+        with span("semantic_cache.get") as current:
+            match = semantic_cache.get(question, user_email)
+            if current is not None:
+                current.set(hit=match is not None)
+        if match is not None:
+            value, similarity = match
+            logger.info("Semantic cache hit", question_length=len(question), similarity=round(similarity, 3))
+            get_metrics().counter("cache_hits", tier="semantic").inc()
+            return value
+    
+    async def fetch() -> dict:
+        revalidation = Revalidation()
+        result = await _query_impl(question, api_key, user_email, revalidation)
+        if isinstance(result, dict) and "error" not in result:
+            await _store_answer(key, question, user_email, result, revalidation.etag)
+        return result
+    
+    if not env_bool("ICAET_SINGLEFLIGHT_ENABLED", True):
+        return await fetch()
+    return await query_flights.do(key, fetch)
+
+
+async def _store_answer(key: str, question: str, user_email: str, result: dict, etag: str | None) -> None:
+    """Put a fresh upstream answer into the response cache, semantic cache and search index."""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.set(key, result, etag=etag)
+    semantic_cache = get_semantic_cache()
+    if semantic_cache is not None:
+        semantic_cache.set(question, user_email, result)
+    search_index = await open_search_index()
+    if search_index is not None:
+        await asyncio.to_thread(search_index.add_result, key, question, result)
+
+
+_revalidations: dict[str, asyncio.Task] = {}
+
+
+def _schedule_revalidation(key: str, entry: CacheEntry, question: str, api_key: str, user_email: str) -> None:
+    """Start a background refresh of a stale entry unless one is already running or backing off.
+    
+    The task runs in a fresh context so its spans form their own trace
+    instead of attaching to the query that found the entry stale.
+    """
+    cache = get_response_cache()
+    if key in _revalidations or (cache is not None and not cache.refresh_due(entry)):
+        return
+    parent = correlation_id.get()
+    
+    async def run() -> str:
+        with correlation_scope(f"{parent}.revalidate" if parent else None):
+            return await _revalidate(key, entry, question, api_key, user_email)
+    
+    task = asyncio.create_task(run(), context=contextvars.Context())
+    _revalidations[key] = task
+    task.add_done_callback(lambda _: _revalidations.pop(key, None))
+
+
+def _needs_refresh(key: str, lead: float) -> bool:
+    """Whether a hot question's cached answer is missing, stale or expires within lead seconds."""
+    cache = get_response_cache()
+    if cache is None or key in _revalidations:
+        return False
+    entry = cache.peek(key)
+    if entry is None:
+        return True
+    return cache.refresh_due(entry) and (cache.is_stale(entry) or cache.expires_in(entry) <= lead)
+
+
+async def _refresh_entry(key: str, question: str, user_email: str) -> str:
+    """Refresh a hot question ahead of expiry, or fetch it again if it already left the cache.
+    
+    The refresh is registered in _revalidations like a stale-while-revalidate
+    refresh, so the two never refresh the same key at once.
+    
+    Returns:
+        The revalidation outcome, "fetched" or "error" for a missing entry,
+        or "in_flight" if the key was already being refreshed
+    """
+    if key in _revalidations:
+        return "in_flight"
+    task = asyncio.create_task(_refresh_hot_entry(key, question, user_email))
+    _revalidations[key] = task
+    task.add_done_callback(lambda _: _revalidations.pop(key, None))
+    return await task
+
+
+async def _refresh_hot_entry(key: str, question: str, user_email: str) -> str:
+    cache = get_response_cache()
+    entry = cache.peek(key) if cache is not None else None
+    if entry is not None:
+        return await _revalidate(key, entry, question, ICAET_API_KEY, user_email)
+    # The disk copy is as old as the answer being replaced; go upstream.
+    revalidation = Revalidation(refresh=True)
+    result = await _query_impl(question, ICAET_API_KEY, user_email, revalidation)
+    if not isinstance(result, dict) or "error" in result:
+        return "error"
+    await _store_answer(key, question, user_email, result, revalidation.etag)
+    return "fetched"
+
+
+async def _revalidate(key: str, entry: CacheEntry, question: str, api_key: str, user_email: str) -> str:
+    """Refresh a stale cache entry through _query_impl.
+    
+    The stored ETag is sent as If-None-Match. A 304, or a new answer with
+    the same content hash, only renews the entry's TTLs; a changed answer
+    replaces it everywhere. On error the stale entry is kept until its
+    hard TTL and is not refreshed again until its backoff has passed.
+    
+    Returns:
+        The outcome: "not_modified", "unchanged", "changed" or "error"
+    """
+    metrics = get_metrics()
+    revalidation = Revalidation(cached=entry.value, if_none_match=entry.etag)
+    started = time.perf_counter()
+    try:
+        with trace("revalidate", question_length=len(question)):
+            result = await _query_impl(question, api_key, user_email, revalidation)
+    except Exception as e:
+        result = {"error": f"Unexpected error: {str(e)}"}
+    
+    if not isinstance(result, dict) or "error" in result:
+        outcome = "error"
+        cache = get_response_cache()
+        retry_in = cache.refresh_failed(key) if cache is not None else None
+        logger.warning("Revalidation failed, keeping stale entry", question_length=len(question), retry_in=retry_in)
+    elif revalidation.not_modified or content_hash(result) == entry.digest:
+        outcome = "not_modified" if revalidation.not_modified else "unchanged"
+        cache = get_response_cache()
+        if cache is not None:
+            cache.set(key, entry.value, etag=revalidation.etag)
+    else:
+        outcome = "changed"
+        await _store_answer(key, question, user_email, result, revalidation.etag)
+    
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info("Cache entry revalidated", outcome=outcome, elapsed_ms=round(elapsed_ms, 3))
+    metrics.counter("revalidations", result=outcome).inc()
+    return outcome
+
+
+async def _decomposed_query(question: str, api_key: str, user_email: str) -> dict:
+    """Answer a multi-part or comparison question by asking its parts concurrently.
+    
+    The question is split with split_question; each sub-question goes
+    through the cached query path under its own correlation ID and the
+    results are combined by merge_answers. A question that does not split
+    is asked as is.
+    
+    Args:
+        question: The question to ask the ICAET knowledge base
+        api_key: API key for authentication
+        user_email: User email for the request
+        
+    Returns:
+        Merged response with per-part answers and sources, the plain API
+        response for a single-part question, or error dict if every part failed
+    """
+    parts = split_question(question, max_parts=env_int("ICAET_DECOMPOSE_MAX_PARTS", 4))
+    if len(parts) < 2:
+        return await _cached_query(question, api_key, user_email)
+    
+    logger.info("Question decomposed", question_length=len(question), parts=len(parts))
+    metrics = get_metrics()
+    metrics.counter("decomposed_queries").inc()
+    metrics.counter("sub_questions").inc(len(parts))
+    parent = correlation_id.get()
+    
+    async def ask(index: int, part: str) -> dict:
+        with correlation_scope(f"{parent}.{index}" if parent else None):
+            try:
+                return await _cached_query(part, api_key, user_email)
+            except Exception as e:
+                logger.error("Sub-question failed", index=index, error="UnexpectedException", message=str(e))
+                return {"error": f"Unexpected error: {str(e)}"}
+    
+    results = await asyncio.gather(*(ask(i, part) for i, part in enumerate(parts)))
+    return merge_answers(question, list(zip(parts, results)))
+
+
 @mcp.tool()
-async def query(question: str) -> dict:
+async def query(question: str, decompose: bool | None = None) -> dict:
     """Query the ICAET knowledge base with a question.
     
     Args:
         question: The question to ask the ICAET knowledge base
-        
+        decompose: Split multi-part and comparison questions into
+            sub-questions, ask them in parallel and merge the answers, with
+            a "parts" entry showing which answer and sources belong to which
+            sub-question. Defaults to ICAET_DECOMPOSE_ENABLED.
+            
     Returns:
         API response as a dictionary, or error dict if request fails
     """
-    return await _query_impl(question, ICAET_API_KEY, USER_EMAIL)
+    if decompose is None:
+        decompose = env_bool("ICAET_DECOMPOSE_ENABLED", False)
+    with correlation_scope():
+        if decompose:
+            return await _decomposed_query(question, ICAET_API_KEY, USER_EMAIL)
+        return await _cached_query(question, ICAET_API_KEY, USER_EMAIL)
+
+
+async def _query_many_impl(
+    questions: list[str],
+    api_key: str,
+    user_email: str,
+    on_result: Callable[[int, dict, int], Awaitable[None]] | None = None
+) -> dict:
+    """Run several questions concurrently through the cached query path.
+    
+    Args:
+        questions: The questions to ask the ICAET knowledge base
+        api_key: API key for authentication
+        user_email: User email for the request
+        on_result: Optional callback invoked as each question completes with
+            its index, result and the number completed so far
+            
+    Returns:
+        Dictionary with one result per question in input order, or error dict
+        if the batch is rejected. Failed questions carry their own error dict.
+    """
+    max_questions = env_int("ICAET_QUERY_MANY_MAX_QUESTIONS", 50)
+    if len(questions) > max_questions:
+        logger.error("Batch rejected", questions=len(questions), max_questions=max_questions)
+        return {"error": f"Too many questions: {len(questions)} (maximum {max_questions})"}
+    
+    concurrency = max(env_int("ICAET_QUERY_MANY_CONCURRENCY", 5), 1)
+    logger.info("Batch query received", questions=len(questions), concurrency=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    results: list[dict | None] = [None] * len(questions)
+    completed = 0
+    batch_id = correlation_id.get()
+    
+    async def run(index: int, question: str) -> None:
+        nonlocal completed
+        async with semaphore:
+            try:
+                with correlation_scope(f"{batch_id}.{index}" if batch_id else None):
+                    result = await _cached_query(question, api_key, user_email)
+            except Exception as e:
+                logger.error("Batch item failed", index=index, error="UnexpectedException", message=str(e))
+                result = {"error": f"Unexpected error: {str(e)}"}
+        results[index] = result
+        completed += 1
+        if on_result is not None:
+            await on_result(index, result, completed)
+    
+    await asyncio.gather(*(run(i, q) for i, q in enumerate(questions)))
+    
+    errors = sum(1 for result in results if isinstance(result, dict) and "error" in result)
+    logger.info("Batch query completed", questions=len(questions), errors=errors)
+    return {
+        "results": [
+            {"question": question, "result": result}
+            for question, result in zip(questions, results)
+        ]
+    }
+
+
+@mcp.tool()
+async def query_many(questions: list[str], ctx: Context, return_as_completed: bool = False) -> dict:
+    """Query the ICAET knowledge base with several related questions at once.
+    
+    Args:
+        questions: The questions to ask the ICAET knowledge base
+        return_as_completed: Also stream each result as a progress notification
+            as soon as it is available
+            
+    Returns:
+        Dictionary with one result per question in input order
+    """
+    on_result = None
+    if return_as_completed:
+        async def on_result(index: int, result: dict, completed: int) -> None:
+            message = json.dumps({"index": index, "question": questions[index], "result": result})
+            await ctx.report_progress(progress=completed, total=len(questions), message=message)
+    
+    with correlation_scope():
+        return await _query_many_impl(questions, ICAET_API_KEY, USER_EMAIL, on_result=on_result)
+
+
+async def _search_cached_impl(query: str, limit: int = 5) -> dict:
+    """Implementation of search_cached for testability.
+    
+    Args:
+        query: Words to look for in previously fetched questions, answers and sources
+        limit: Maximum number of matches to return
+        
+    Returns:
+        Dictionary with matches ranked by BM25 score, or error dict if the
+        index is disabled
+    """
+    index = await open_search_index()
+    if index is None:
+        return {"error": "Search index is disabled (ICAET_SEARCH_INDEX_ENABLED=false)"}
+    started = time.perf_counter()
+    results = index.search(query, limit=min(max(limit, 1), 50))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info("Cached answers searched", query_length=len(query), results=len(results), elapsed_ms=round(elapsed_ms, 3))
+    get_metrics().histogram("search_latency").record(elapsed_ms / 1000)
+    return {"results": results, "documents": len(index)}
+
+
+@mcp.tool()
+async def search_cached(query: str, limit: int = 5) -> dict:
+    """Search answers this server has already fetched, without calling the ICAET API.
+    
+    Use this first for topics that have likely been asked about before; it
+    returns in milliseconds. Ask with the query tool if nothing relevant is found.
+    
+    Args:
+        query: Words to look for in previously fetched questions, answers and sources
+        limit: Maximum number of matches to return (1-50)
+        
+    Returns:
+        Dictionary with the matching questions, answer snippets, sources and scores
+    """
+    return await _search_cached_impl(query, limit)
+
+
+def _component_stats() -> dict:
+    """Collect the stats() of every query-path component that is enabled."""
+    components = {
+        "http_client": get_client_stats(),
+        "singleflight": query_flights.stats(),
+        "revalidations_in_flight": len(_revalidations),
+        "log_queue": get_log_queue_stats(),
+        "log_throttle": get_log_throttle_stats()
+    }
+    for name, component in (
+        ("response_cache", get_response_cache()),
+        ("semantic_cache", get_semantic_cache()),
+        ("popularity", get_popularity_tracker()),
+        ("negative_cache", get_negative_cache()),
+        ("search_index", get_search_index()),
+        ("disk_cache", get_disk_cache()),
+        ("upstream_limiter", get_upstream_limiter()),
+        ("hedger", get_hedger()),
+        ("circuit_breaker", get_circuit_breaker()),
+        ("tracer", get_tracer()),
+        ("replay", get_replay_archive())
+    ):
+        components[name] = component.stats() if component is not None else None
+    return components
+
+
+def _server_stats_impl() -> dict:
+    """Implementation of server_stats for testability.
+    
+    Returns:
+        Dictionary with the metrics registry snapshot and a "components"
+        entry holding each component's own counters, or None for components
+        that are disabled
+    """
+    return {**get_metrics().snapshot(), "components": _component_stats()}
+
+
+@mcp.tool()
+async def server_stats() -> dict:
+    """Report query, upstream, cache and error metrics for this server process.
+    
+    Returns:
+        Dictionary of counters, gauges, latency histograms and per-component stats
+    """
+    await open_search_index()
+    return _server_stats_impl()
+
 
+@mcp.resource("icaet://server-stats", mime_type="application/json")
+def server_stats_resource() -> str:
+    """Current server metrics as JSON, the same data as the server_stats tool."""
+    return json.dumps(_server_stats_impl(), default=str)
@@ -0,0 +1,305 @@
+"""Sampled per-query tracing spans written to a local NDJSON file."""
+
+import atexit
+import contextvars
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator
+
+from .structured_logging import correlation_id, get_logger
+from .utils import env_float, env_int
+
+logger = get_logger(__name__)
+
+# httpcore trace events, minus their .started/.complete/.failed suffix, and
+# the span name each phase is recorded under. DNS resolution happens inside
+# connect_tcp, so it is part of the connect span.
+HTTP_PHASES = {
+    "connection.connect_tcp": "http.connect",
+    "connection.start_tls": "http.tls",
+    "http11.send_request_headers": "http.send_headers",
+    "http11.send_request_body": "http.send_body",
+    "http11.receive_response_headers": "http.server_wait",
+    "http11.receive_response_body": "http.download",
+    "http2.send_request_headers": "http.send_headers",
+    "http2.send_request_body": "http.send_body",
+    "http2.receive_response_headers": "http.server_wait",
+    "http2.receive_response_body": "http.download"
+}
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("icaet_current_span", default=None)
+
+
+def default_trace_path() -> Path:
+    """Return the trace file location, next to the log directory."""
+    override = os.getenv("ICAET_TRACE_PATH")
+    if override:
+        return Path(override)
+    return Path.home() / ".icsaet-mcp" / "traces" / "traces.ndjson"
+
+
+class Span:
+    """One timed operation within a trace."""
+    
+    __slots__ = ("trace", "name", "span_id", "parent_id", "started_at", "start", "end", "attributes", "_phases")
+    
+    def __init__(self, trace: "Trace", name: str, parent_id: str | None, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.started_at = time.time()
+        self.start = trace.clock()
+        self.end: float | None = None
+        self.attributes = attributes
+        self._phases: dict[str, tuple[float, float]] = {}
+    
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes to the span."""
+        self.attributes.update(attributes)
+    
+    def to_dict(self) -> dict:
+        end = self.end if self.end is not None else self.trace.clock()
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "ts": round(self.started_at, 6),
+            "offset_ms": round((self.start - self.trace.root_start) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            **({"attributes": self.attributes} if self.attributes else {})
+        }
+
+
+class Trace:
+    """Spans of one sampled query, exported together when the root span ends."""
+    
+    def __init__(self, trace_id: str, clock: Callable[[], float]):
+        self.trace_id = trace_id
+        self.clock = clock
+        self.root_start = clock()
+        self.spans: list[Span] = []
+
+
+class NdjsonExporter:
+    """Append finished traces to a file, one span per line.
+    
+    export() only queues the spans; a background thread does the file I/O,
+    so ending a trace never blocks the event loop. The thread starts on the
+    first export and the directory is created on the first write. When the
+    file grows past max_bytes it is renamed to <name>.1, replacing any
+    previous backup. If the file cannot be written, tracing output is
+    disabled with a warning.
+    """
+    
+    def __init__(self, path: Path, max_bytes: int = 10 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.unavailable = False
+        self.exported = 0
+    
+    def export(self, spans: list[dict]) -> None:
+        if self.unavailable or not spans:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="icaet-trace-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self._queue.put(list(spans))
+    
+    def flush(self) -> None:
+        """Wait until every queued trace has been written."""
+        if self._thread is not None:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Write the queued traces and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        thread.join()
+    
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            try:
+                if spans is None:
+                    return
+                self._write(spans)
+            finally:
+                self._queue.task_done()
+    
+    def _write(self, spans: list[dict]) -> None:
+        if self.unavailable:
+            return
+        data = "".join(json.dumps(span, default=str) + "\n" for span in spans)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.max_bytes > 0 and self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+                os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+            self.exported += 1
+        except OSError as e:
+            self.unavailable = True
+            logger.warning("Trace export disabled", path=str(self.path), error=type(e).__name__, message=str(e))
+
+
+class Tracer:
+    """Start sampled traces and hand finished ones to an exporter.
+    
+    sample_rate is the fraction of root spans that are recorded; inside an
+    unsampled trace span() costs one context variable lookup.
+    """
+    
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        exporter: Callable[[list[dict]], None] | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        rng: random.Random | None = None
+    ):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self.started = 0
+        self.sampled = 0
+    
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Open a root span, or yield None if this trace is not sampled.
+        
+        Inside an active trace this opens a child span instead. The trace ID
+        is the current correlation ID when there is one, so a trace can be
+        matched with the log lines of the same request.
+        """
+        if _current_span.get() is not None:
+            with span(name, **attributes) as child:
+                yield child
+            return
+        self.started += 1
+        if self._rng.random() >= self.sample_rate:
+            yield None
+            return
+        self.sampled += 1
+        trace = Trace(correlation_id.get() or uuid.uuid4().hex[:12], self._clock)
+        try:
+            with _open_span(trace, name, None, attributes) as root:
+                yield root
+        finally:
+            if self.exporter is not None:
+                self.exporter([span.to_dict() for span in trace.spans])
+    
+    def stats(self) -> dict:
+        """Return how many traces were started and sampled."""
+        return {
+            "sample_rate": self.sample_rate,
+            "started": self.started,
+            "sampled": self.sampled
+        }
+
+
+@contextmanager
+def _open_span(trace: Trace, name: str, parent_id: str | None, attributes: dict) -> Iterator[Span]:
+    span = Span(trace, name, parent_id, attributes)
+    trace.spans.append(span)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        span.end = trace.clock()
+        _current_span.reset(token)
+
+
+def span(name: str, **attributes: Any) -> ContextManager[Span | None]:
+    """Open a child span of the current span, or do nothing outside a sampled trace."""
+    parent = _current_span.get()
+    if parent is None:
+        return nullcontext()
+    return _open_span(parent.trace, name, parent.span_id, attributes)
+
+
+def record_http_event(event_name: str) -> None:
+    """Turn httpcore trace events into spans under the current span.
+    
+    A phase's .started event remembers the time; the matching .complete or
+    .failed event records a span from then to now.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+    phase, _, stage = event_name.rpartition(".")
+    name = HTTP_PHASES.get(phase)
+    if name is None:
+        return
+    trace = parent.trace
+    now = trace.clock()
+    if stage == "started":
+        parent._phases[phase] = (now, time.time())
+        return
+    started = parent._phases.pop(phase, None)
+    if started is None:
+        return
+    child = Span(trace, name, parent.span_id, {"error": "failed"} if stage == "failed" else {})
+    child.start, child.started_at = started
+    child.end = now
+    trace.spans.append(child)
+
+
+_tracer: Tracer | None = None
+_tracer_loaded = False
+_exporter: NdjsonExporter | None = None
+
+
+def get_tracer() -> Tracer | None:
+    """Return the process-wide tracer, or None if the sample rate is zero."""
+    global _tracer, _tracer_loaded, _exporter
+    if not _tracer_loaded:
+        _tracer_loaded = True
+        sample_rate = env_float("ICAET_TRACE_SAMPLE_RATE", 0.0)
+        if sample_rate > 0:
+            path = default_trace_path()
+            _exporter = NdjsonExporter(path, max_bytes=env_int("ICAET_TRACE_MAX_BYTES", 10 * 1024 * 1024))
+            _tracer = Tracer(sample_rate=min(sample_rate, 1.0), exporter=_exporter.export)
+            logger.info("Tracing enabled", path=str(path), sample_rate=_tracer.sample_rate)
+    return _tracer
+
+
+def reset_tracer() -> None:
+    """Drop the process-wide tracer so it is rebuilt from the environment on next use.
+    
+    Traces still queued for the file are written first.
+    """
+    global _tracer, _tracer_loaded, _exporter
+    if _exporter is not None:
+        _exporter.close()
+    _exporter = None
+    _tracer = None
+    _tracer_loaded = False
+
+
+def trace(name: str, **attributes: Any) -> ContextManager[Span | None]:
+    """Open a root span with the process-wide tracer, or do nothing if tracing is off."""
+    tracer = get_tracer()
+    if tracer is None:
+        return nullcontext()
+    return tracer.trace(name, **attributes)
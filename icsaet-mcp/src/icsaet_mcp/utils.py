@@ -1,5 +1,7 @@
 """Utility functions for the ICAET MCP server."""
 
+import os
+
 
 def sanitize_api_key(key: str) -> str:
     """Sanitize API key by showing first 3 and last 6 characters."""
@@ -45,3 +47,44 @@ def sanitize_question(question: str, max_len: int = 50) -> str:
     except Exception:
         return "***"
 
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for cache lookups by folding case, whitespace and trailing punctuation."""
+    if not question:
+        return ""
+    return " ".join(question.casefold().split()).rstrip("?!. ")
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to default if unset or invalid."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to default if unset or invalid."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable, falling back to default if unset or invalid."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    value = value.strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    return default
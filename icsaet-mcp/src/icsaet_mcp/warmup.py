@@ -0,0 +1,144 @@
+"""Background cache warm-up from the example questions and a question file."""
+
+import asyncio
+import os
+import re
+import time
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+
+from .metrics import get_metrics
+from .structured_logging import correlation_scope, get_logger
+from .utils import env_bool, env_float, env_int, normalize_question
+
+logger = get_logger(__name__)
+
+_NUMBERED_QUESTION = re.compile(r'^\s*\d+\.\s*"(.+)"\s*$', re.MULTILINE)
+
+
+def example_questions() -> list[str]:
+    """Return the questions listed in the example_questions prompt."""
+    from .prompts import _get_example_questions
+    
+    return _NUMBERED_QUESTION.findall(_get_example_questions())
+
+
+def load_question_file(path: Path) -> list[str]:
+    """Read one question per line, skipping blank lines and # comments.
+    
+    A missing or unreadable file is logged and treated as empty.
+    """
+    try:
+        text = Path(path).expanduser().read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning("Warm-up question file unreadable", path=str(path), error=type(e).__name__)
+        return []
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+
+
+def warmup_questions() -> list[str]:
+    """Collect the configured warm-up questions without duplicates, file entries first."""
+    questions = []
+    path = os.getenv("ICAET_WARMUP_FILE", "").strip()
+    if path:
+        questions.extend(load_question_file(Path(path)))
+    if env_bool("ICAET_WARMUP_EXAMPLES", True):
+        questions.extend(example_questions())
+    
+    seen = set()
+    unique = []
+    for question in questions:
+        key = normalize_question(question)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(question)
+    return unique[:max(env_int("ICAET_WARMUP_MAX_QUESTIONS", 100), 0)]
+
+
+async def warm_cache(
+    questions: list[str],
+    fetch: Callable[[str], Awaitable[dict]],
+    concurrency: int = 2,
+    max_consecutive_errors: int = 3,
+    busy: Callable[[], bool] | None = None,
+    poll_interval: float = 0.1
+) -> dict:
+    """Fetch every question through the normal cached query path.
+    
+    At most concurrency questions are fetched at once. Before each fetch,
+    busy is called; while it returns True the warm-up waits, so real queries
+    go first. The warm-up
+    stops early once max_consecutive_errors questions in a row have failed,
+    so an unreachable API or bad credentials cost only a few requests.
+    
+    Returns:
+        Counts of questions fetched, failed and skipped after stopping early
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    counts = {"fetched": 0, "errors": 0, "skipped": 0}
+    consecutive_errors = 0
+    
+    async def warm(index: int, question: str) -> None:
+        nonlocal consecutive_errors
+        async with semaphore:
+            while busy is not None and busy():
+                await asyncio.sleep(poll_interval)
+            if consecutive_errors >= max_consecutive_errors:
+                counts["skipped"] += 1
+                return
+            with correlation_scope(f"warmup.{index}"):
+                try:
+                    result = await fetch(question)
+                except Exception as e:
+                    result = {"error": str(e)}
+            if isinstance(result, dict) and "error" in result:
+                counts["errors"] += 1
+                consecutive_errors += 1
+            else:
+                counts["fetched"] += 1
+                consecutive_errors = 0
+    
+    await asyncio.gather(*(warm(i, q) for i, q in enumerate(questions)))
+    return counts
+
+
+async def run_warmup(delay: float = 0.0) -> None:
+    """Wait delay seconds, then warm the caches with the configured questions."""
+    if delay > 0:
+        await asyncio.sleep(delay)
+    from . import tools
+    
+    questions = warmup_questions()
+    if not questions:
+        return
+    concurrency = env_int("ICAET_WARMUP_CONCURRENCY", 2)
+    logger.info("Cache warm-up started", questions=len(questions), concurrency=concurrency)
+    started = time.monotonic()
+    in_flight = get_metrics().gauge("queries_in_flight")
+    counts = await warm_cache(
+        questions,
+        lambda question: tools._cached_query(question, tools.ICAET_API_KEY, tools.USER_EMAIL, background=True),
+        concurrency=concurrency,
+        busy=lambda: in_flight.value > 0
+    )
+    logger.info("Cache warm-up finished", **counts, seconds=round(time.monotonic() - started, 3))
+
+
+@asynccontextmanager
+async def warmup_task() -> AsyncIterator[None]:
+    """Run the cache warm-up in the background while the block is active, if enabled.
+    
+    The task starts after ICAET_WARMUP_DELAY seconds so that it never
+    competes with the MCP handshake, and is cancelled on exit.
+    """
+    task = None
+    if env_bool("ICAET_WARMUP_ENABLED", False):
+        task = asyncio.create_task(run_warmup(env_float("ICAET_WARMUP_DELAY", 5.0)))
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
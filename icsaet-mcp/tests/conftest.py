@@ -1,11 +1,21 @@
 """Pytest configuration and fixtures."""
 
 import pytest
-import socket
-import threading
-import time
 
-from tests.mock_server import create_app
+from icsaet_mcp.cache import reset_response_cache
+from icsaet_mcp.circuit_breaker import reset_circuit_breaker
+from icsaet_mcp.disk_cache import close_disk_cache
+from icsaet_mcp.hedging import reset_hedger
+from icsaet_mcp.logging_config import reset_log_throttle
+from icsaet_mcp.metrics import reset_metrics
+from icsaet_mcp.negative_cache import reset_negative_cache
+from icsaet_mcp.popularity import reset_popularity_tracker
+from icsaet_mcp.ratelimit import reset_upstream_limiter
+from icsaet_mcp.replay import reset_replay_archive
+from icsaet_mcp.search_index import close_search_index
+from icsaet_mcp.semantic_cache import reset_semantic_cache
+from icsaet_mcp.tracing import reset_tracer
+from tests.mock_server import FaultProfile, MockICAETServer, ThreadedMockServer
 
 # Fixture Usage:
 # 
@@ -19,31 +29,26 @@ from tests.mock_server import create_app
 #       # Your test code here
 #
 # Fixtures:
-# - mock_icaet_server: Session-scoped, starts Flask server on random port
+# - mock_icaet_server: Session-scoped, starts the mock server on a random port
+#   and returns once it is accepting connections
 # - mock_icaet_url: Session-scoped, provides base URL string
+# - fault_server: Function-scoped async factory, starts a mock server with a
+#   FaultProfile (latency, errors, 429 bursts, resets) and stops it afterwards
 # - valid_credentials: Function-scoped, provides test API key and email
+# - clock: Function-scoped FakeClock starting at 0.0; pass it as the clock of
+#   a cache, limiter or breaker and advance time by setting clock.now
 # - httpx_mock: Provided by pytest-httpx plugin for mocking HTTP requests
-
-
-def _find_free_port() -> int:
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    s.bind(("", 0))
-    port = s.getsockname()[1]
-    s.close()
-    return port
+# - reset_query_state: Autouse, clears process-wide caches, limiters, metrics,
+#   tracer and replay archive between tests and points the disk cache and
+#   search index at a per-test temporary directory
+# - reset_log_throttles: Autouse, forgets suppressed log repeats after every
+#   test so no "Repeated log message suppressed" summaries print at exit
 
 
 @pytest.fixture(scope="session")
 def mock_icaet_server():
-    port = _find_free_port()
-    app = create_app()
-    server_thread = threading.Thread(
-        target=lambda: app.run(host="127.0.0.1", port=port, debug=False, use_reloader=False),
-        daemon=True
-    )
-    server_thread.start()
-    time.sleep(0.5)
-    yield {"host": "127.0.0.1", "port": port, "url": f"http://127.0.0.1:{port}"}
+    with ThreadedMockServer() as server:
+        yield {"host": server.server.host, "port": server.server.port, "url": server.url}
 
 
 @pytest.fixture(scope="session")
@@ -51,6 +56,36 @@ def mock_icaet_url(mock_icaet_server):
     return mock_icaet_server["url"]
 
 
+@pytest.fixture
+async def fault_server():
+    servers = []
+    
+    async def start(**profile) -> MockICAETServer:
+        server = MockICAETServer(profile=FaultProfile(**profile))
+        await server.start()
+        servers.append(server)
+        return server
+    
+    yield start
+    for server in servers:
+        await server.stop()
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def clock():
+    return FakeClock()
+
+
 @pytest.fixture(scope="function")
 def valid_credentials():
     return {"api_key": "test-api-key-12345", "email": "test@example.com"}
@@ -61,3 +96,42 @@ def mock_httpx_client():
     """Fixture for configuring httpx mocking in unit tests. Use pytest-httpx's httpx_mock fixture directly in tests."""
     yield None
 
+
+@pytest.fixture(autouse=True)
+def reset_query_state(tmp_path, monkeypatch):
+    """Start every test with empty process-wide query caches."""
+    monkeypatch.setenv("ICAET_DISK_CACHE_PATH", str(tmp_path / "answers.db"))
+    monkeypatch.setenv("ICAET_SEARCH_INDEX_PATH", str(tmp_path / "index.json.gz"))
+    reset_response_cache()
+    reset_semantic_cache()
+    reset_negative_cache()
+    reset_popularity_tracker()
+    close_disk_cache()
+    close_search_index()
+    reset_upstream_limiter()
+    reset_hedger()
+    reset_circuit_breaker()
+    reset_metrics()
+    reset_tracer()
+    reset_replay_archive()
+    yield
+    reset_response_cache()
+    reset_semantic_cache()
+    reset_negative_cache()
+    reset_popularity_tracker()
+    close_disk_cache()
+    close_search_index()
+    reset_upstream_limiter()
+    reset_hedger()
+    reset_circuit_breaker()
+    reset_metrics()
+    reset_tracer()
+    reset_replay_archive()
+
+
+@pytest.fixture(autouse=True)
+def reset_log_throttles():
+    """Keep log throttle windows from carrying over between tests."""
+    reset_log_throttle()
+    yield
+    reset_log_throttle()
@@ -1,41 +1,335 @@
-"""Mock ICAET server for testing."""
+"""Mock ICAET server for testing and benchmarking.
 
-from flask import Flask, jsonify, request
-from typing import Optional
+An asyncio HTTP/1.1 server with keep-alive that mimics the /query endpoint
+and can inject latency, errors, 429 bursts, connection resets and large
+responses. Run it in-process with ``MockICAETServer``, on a background
+thread with ``ThreadedMockServer``, or as a child process with
+``python -m tests.mock_server``, which prints ``READY <url>`` once listening.
+"""
 
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import struct
+import sys
+import threading
 
-def create_app() -> Flask:
-    app = Flask(__name__)
-    app.config["TESTING"] = True
+MOCK_RESPONSE = {
+    "answer": "This is a mock response to your question.",
+    "sources": ["mock_source.txt"],
+    "confidence": 0.95
+}
+
+LATENCY_DISTRIBUTIONS = ("fixed", "lognormal", "longtail")
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 429: "Too Many Requests",
+           500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class FaultProfile:
+    """Latency and failure behaviour of the mock server.
     
-    @app.route("/query", methods=["POST"])
-    def query_endpoint():
-        api_key = request.headers.get("x-api-key")
-        
-        if not api_key:
-            return jsonify({"error": "Invalid API key"}), 401
-        
+    latency picks the distribution: "fixed" always waits latency_seconds,
+    "lognormal" uses latency_seconds as the median with shape latency_sigma,
+    and "longtail" waits latency_seconds except for a tail_probability share
+    of requests that wait tail_seconds. error_rate answers with error_status,
+    throttle_rate starts a run of throttle_burst 429 responses carrying
+    Retry-After, and reset_rate drops the connection without answering.
+    """
+    
+    def __init__(
+        self,
+        latency: str = "fixed",
+        latency_seconds: float = 0.0,
+        latency_sigma: float = 0.5,
+        tail_probability: float = 0.01,
+        tail_seconds: float = 1.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        throttle_rate: float = 0.0,
+        throttle_burst: int = 5,
+        retry_after: float = 1.0,
+        reset_rate: float = 0.0,
+        response_bytes: int = 0,
+        seed: int | None = None
+    ):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency}")
+        self.latency = latency
+        self.latency_seconds = latency_seconds
+        self.latency_sigma = latency_sigma
+        self.tail_probability = tail_probability
+        self.tail_seconds = tail_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        self.throttle_burst = max(throttle_burst, 1)
+        self.retry_after = retry_after
+        self.reset_rate = reset_rate
+        self.response_bytes = response_bytes
+        self.rng = random.Random(seed)
+    
+    def sample_latency(self) -> float:
+        """Draw one response delay in seconds."""
+        if self.latency == "lognormal" and self.latency_seconds > 0:
+            return self.rng.lognormvariate(math.log(self.latency_seconds), self.latency_sigma)
+        if self.latency == "longtail" and self.rng.random() < self.tail_probability:
+            return self.tail_seconds
+        return self.latency_seconds
+
+
+class MockICAETServer:
+    """Asyncio stand-in for the ICAET /query endpoint."""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, profile: FaultProfile | None = None):
+        self.host = host
+        self.port = port
+        self.profile = profile or FaultProfile()
+        self.ready = asyncio.Event()
+        self.requests = 0
+        self.connections = 0
+        self.errors = 0
+        self.throttled = 0
+        self.resets = 0
+        self._throttle_remaining = 0
+        self._server: asyncio.AbstractServer | None = None
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    async def start(self) -> None:
+        """Start listening; the port is known and ready is set on return."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.ready.set()
+    
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.ready.clear()
+    
+    async def __aenter__(self) -> "MockICAETServer":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.stop()
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
         try:
-            data = request.get_json()
-        except Exception:
-            return jsonify({"error": "Invalid JSON"}), 400
-        
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0"))
+                body = await reader.readexactly(length) if length else b""
+                self.requests += 1
+                
+                if path == "/query" and self.profile.rng.random() < self.profile.reset_rate:
+                    self.resets += 1
+                    _reset(writer)
+                    return
+                
+                status, payload, extra_headers = await self._respond(method, path, headers, body)
+                data = json.dumps(payload).encode("utf-8")
+                head = f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+                head += "Content-Type: application/json\r\n"
+                head += f"Content-Length: {len(data)}\r\n"
+                for name, value in extra_headers.items():
+                    head += f"{name}: {value}\r\n"
+                writer.write(f"{head}\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            if not writer.is_closing():
+                writer.close()
+    
+    async def _respond(self, method: str, path: str, headers: dict, body: bytes) -> tuple[int, dict, dict]:
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}, {}
+        if method != "POST" or path != "/query":
+            return 404, {"error": "Not found"}, {}
+        if not headers.get("x-api-key"):
+            return 401, {"error": "Invalid API key"}, {}
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "Invalid JSON"}, {}
         if "question" not in data:
-            return jsonify({"error": "Missing required field: question"}), 400
-        
+            return 400, {"error": "Missing required field: question"}, {}
         if "email" not in data:
-            return jsonify({"error": "Missing required field: email"}), 400
+            return 400, {"error": "Missing required field: email"}, {}
         
-        question = data["question"]
+        profile = self.profile
+        if self._throttle_remaining or profile.rng.random() < profile.throttle_rate:
+            self._throttle_remaining = (self._throttle_remaining or profile.throttle_burst) - 1
+            self.throttled += 1
+            return 429, {"error": "Too many requests"}, {"Retry-After": str(math.ceil(profile.retry_after))}
         
-        if question == "trigger_server_error":
-            return jsonify({"error": "Internal server error"}), 500
-        
-        return jsonify({
-            "answer": "This is a mock response to your question.",
-            "sources": ["mock_source.txt"],
-            "confidence": 0.95
-        }), 200
+        delay = profile.sample_latency()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if data["question"] == "trigger_server_error":
+            return 500, {"error": "Internal server error"}, {}
+        if profile.rng.random() < profile.error_rate:
+            self.errors += 1
+            return profile.error_status, {"error": "Injected upstream error"}, {}
+        return 200, _padded_response(profile.response_bytes), {}
     
-    return app
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "resets": self.resets
+        }
+
+
+def _reset(writer: asyncio.StreamWriter) -> None:
+    """Abort the connection so the client sees a TCP reset."""
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    writer.transport.abort()
+
+
+def _padded_response(size: int) -> dict:
+    response = dict(MOCK_RESPONSE)
+    padding = size - len(json.dumps(response))
+    if padding > 0:
+        response["answer"] = response["answer"] + " " + "x" * (padding - 1)
+    return response
+
+
+class ThreadedMockServer:
+    """Run a MockICAETServer on its own event loop in a daemon thread.
+    
+    start() blocks until the server is accepting connections, so callers
+    never need to sleep and hope it is up.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, profile: FaultProfile | None = None):
+        self.server = MockICAETServer(host, port, profile)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._started = threading.Event()
+        self._error: BaseException | None = None
+    
+    @property
+    def url(self) -> str:
+        return self.server.url
+    
+    def start(self, timeout: float = 5.0) -> "ThreadedMockServer":
+        self._thread = threading.Thread(target=self._run, name="mock-icaet-server", daemon=True)
+        self._thread.start()
+        if not self._started.wait(timeout):
+            raise RuntimeError("Mock ICAET server did not become ready")
+        if self._error is not None:
+            raise RuntimeError("Mock ICAET server failed to start") from self._error
+        return self
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def __enter__(self) -> "ThreadedMockServer":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+    
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self.server.start())
+        except BaseException as e:
+            self._error = e
+            self._started.set()
+            self._loop.close()
+            return
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(self.server.stop())
+            self._loop.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the mock ICAET server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="fixed", help="Latency distribution")
+    parser.add_argument("--latency-seconds", type=float, default=0.0, help="Fixed delay, lognormal median or longtail base")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal shape parameter")
+    parser.add_argument("--tail-probability", type=float, default=0.01, help="Share of longtail requests that are slow")
+    parser.add_argument("--tail-seconds", type=float, default=1.0, help="Delay of slow longtail requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503, help="Status code for injected errors")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Chance a request starts a 429 burst")
+    parser.add_argument("--throttle-burst", type=int, default=5, help="Length of each 429 burst")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="Share of requests whose connection is reset")
+    parser.add_argument("--response-bytes", type=int, default=0, help="Pad successful responses to this size")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible fault injection")
+    return parser
+
+
+def profile_from_args(args: argparse.Namespace) -> FaultProfile:
+    return FaultProfile(
+        latency=args.latency,
+        latency_seconds=args.latency_seconds,
+        latency_sigma=args.latency_sigma,
+        tail_probability=args.tail_probability,
+        tail_seconds=args.tail_seconds,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        throttle_rate=args.throttle_rate,
+        throttle_burst=args.throttle_burst,
+        retry_after=args.retry_after,
+        reset_rate=args.reset_rate,
+        response_bytes=args.response_bytes,
+        seed=args.seed
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = MockICAETServer(args.host, args.port, profile_from_args(args))
+    await server.start()
+    sys.stdout.write(f"READY {server.url}\n")
+    sys.stdout.flush()
+    await asyncio.Event().wait()
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Smoke tests for the load-testing benchmark."""
+
+import os
+
+import pytest
+
+from benchmarks.run_benchmark import (
+    build_questions,
+    compare,
+    configure_environment,
+    parse_args,
+    percentile,
+    reset_state,
+    run_target,
+)
+from icsaet_mcp.metrics import get_metrics
+from tests.mock_server import MockICAETServer
+
+
+def _result(p95: float, rps: float) -> dict:
+    return {"target": "impl", "concurrency": 8, "latency_ms": {"p95": p95}, "rps": rps}
+
+
+def test_percentile_nearest_rank():
+    # Arrange
+    values = [float(i) for i in range(1, 101)]
+    
+    # Act / Assert
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_build_questions_mix():
+    # Act
+    questions = build_questions(10, 3)
+    
+    # Assert
+    assert len(questions) == 10
+    assert len(set(questions)) == 3
+
+
+def test_parse_args_lists():
+    # Act
+    args = parse_args(["--targets", "impl", "--concurrency", "1,4"])
+    
+    # Assert
+    assert args.targets == ["impl"]
+    assert args.concurrency == [1, 4]
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    # Arrange
+    baseline = [_result(p95=10.0, rps=100.0)]
+    
+    # Act
+    within = compare([_result(p95=10.5, rps=95.0)], baseline, 0.10)
+    beyond = compare([_result(p95=12.0, rps=80.0)], baseline, 0.10)
+    
+    # Assert
+    assert within == []
+    assert len(beyond) == 2
+
+
+def test_configure_environment_disables_background_tasks(tmp_path, monkeypatch):
+    # Arrange
+    for name in ("ICAET_LOG_LEVEL", "ICAET_RATE_LIMIT_RPS", "ICAET_API_URL", "ICAET_DISK_CACHE_PATH", "ICAET_SEARCH_INDEX_PATH"):
+        monkeypatch.setenv(name, os.environ.get(name, ""))
+    monkeypatch.setenv("ICAET_WARMUP_ENABLED", "true")
+    monkeypatch.setenv("ICAET_HOT_REFRESH_ENABLED", "true")
+    
+    # Act
+    configure_environment("http://127.0.0.1:9", str(tmp_path))
+    
+    # Assert
+    assert os.environ["ICAET_WARMUP_ENABLED"] == "false"
+    assert os.environ["ICAET_HOT_REFRESH_ENABLED"] == "false"
+
+
+def test_reset_state_clears_metrics():
+    # Arrange
+    get_metrics().counter("queries").inc()
+    
+    # Act
+    reset_state()
+    
+    # Assert
+    assert get_metrics().counter("queries").value == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("target", ["cached", "mcp"])
+async def test_run_target_against_standin(monkeypatch, target):
+    # Arrange
+    server = MockICAETServer()
+    await server.start()
+    monkeypatch.setenv("ICAET_API_URL", f"{server.url}/query")
+    
+    try:
+        # Act
+        result = await run_target(target, build_questions(20, 5), concurrency=4, warmup=0)
+    finally:
+        await server.stop()
+    
+    # Assert
+    assert result["errors"] == 0
+    assert result["requests"] == 20
+    assert server.requests == 5
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+    assert result["rps"] > 0
+
+
+@pytest.mark.asyncio
+async def test_impl_target_bypasses_in_memory_caches(monkeypatch):
+    # Arrange
+    server = MockICAETServer()
+    await server.start()
+    monkeypatch.setenv("ICAET_API_URL", f"{server.url}/query")
+    monkeypatch.setenv("ICAET_DISK_CACHE_ENABLED", "false")
+    
+    try:
+        # Act
+        result = await run_target("impl", build_questions(20, 5), concurrency=4, warmup=0)
+    finally:
+        await server.stop()
+    
+    # Assert
+    assert result["errors"] == 0
+    assert server.requests == 20
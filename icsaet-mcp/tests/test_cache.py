@@ -0,0 +1,238 @@
+"""Tests for the in-memory response cache."""
+
+from icsaet_mcp.cache import ResponseCache, cache_key, content_hash, get_response_cache
+
+
+def test_cache_key_normalizes_question():
+    # Arrange
+    first = "What did Leslie Miley talk about?"
+    second = "  what did leslie   MILEY talk about  "
+    
+    # Act
+    result = cache_key(first, "test@example.com") == cache_key(second, "test@example.com")
+    
+    # Assert
+    assert result
+
+
+def test_cache_key_differs_by_email():
+    # Arrange
+    question = "What is ICAET?"
+    
+    # Act
+    first = cache_key(question, "a@example.com")
+    second = cache_key(question, "b@example.com")
+    
+    # Assert
+    assert first != second
+
+
+def test_cache_get_returns_stored_value():
+    # Arrange
+    cache = ResponseCache()
+    cache.set("key", {"answer": "Test answer"})
+    
+    # Act
+    result = cache.get("key")
+    
+    # Assert
+    assert result == {"answer": "Test answer"}
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_get_missing_counts_miss():
+    # Arrange
+    cache = ResponseCache()
+    
+    # Act
+    result = cache.get("missing")
+    
+    # Assert
+    assert result is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_entry_expires_after_ttl(clock):
+    # Arrange
+    cache = ResponseCache(ttl=10.0, clock=clock)
+    cache.set("key", {"answer": "Test answer"})
+    
+    # Act
+    clock.now = 10.0
+    result = cache.get("key")
+    
+    # Assert
+    assert result is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_entry_is_stale_after_soft_ttl(clock):
+    # Arrange
+    cache = ResponseCache(ttl=10.0, soft_ttl=2.0, clock=clock)
+    cache.set("key", {"answer": "Test answer"}, etag='"v1"')
+    
+    # Act
+    fresh = cache.get_entry("key")
+    clock.now = 2.0
+    stale = cache.get_entry("key")
+    
+    # Assert
+    assert cache.is_stale(fresh) is True
+    assert stale.value == {"answer": "Test answer"}
+    assert stale.etag == '"v1"'
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_cache_set_renews_stale_entry(clock):
+    # Arrange
+    cache = ResponseCache(ttl=10.0, soft_ttl=2.0, clock=clock)
+    cache.set("key", {"answer": "Test answer"})
+    clock.now = 5.0
+    
+    # Act
+    cache.set("key", {"answer": "Test answer"})
+    entry = cache.get_entry("key")
+    
+    # Assert
+    assert cache.is_stale(entry) is False
+    assert entry.expires_at == 15.0
+
+
+def test_failed_refresh_backs_off_exponentially(clock):
+    # Arrange
+    cache = ResponseCache(ttl=3600.0, soft_ttl=2.0, refresh_backoff=10.0, max_refresh_backoff=25.0, clock=clock)
+    cache.set("key", {"answer": "Test"})
+    
+    # Act
+    delays = [cache.refresh_failed("key") for _ in range(3)]
+    due_during_backoff = cache.refresh_due(cache.peek("key"))
+    clock.now += 25.0
+    due_after_backoff = cache.refresh_due(cache.peek("key"))
+    
+    # Assert
+    assert delays == [10.0, 20.0, 25.0]
+    assert due_during_backoff is False
+    assert due_after_backoff is True
+    assert cache.refresh_failed("missing") is None
+
+
+def test_cache_set_clears_refresh_backoff(clock):
+    # Arrange
+    cache = ResponseCache(ttl=3600.0, soft_ttl=2.0, clock=clock)
+    cache.set("key", {"answer": "Test"})
+    cache.refresh_failed("key")
+    
+    # Act
+    cache.set("key", {"answer": "Test"})
+    
+    # Assert
+    assert cache.refresh_due(cache.peek("key")) is True
+    assert cache.peek("key").refresh_failures == 0
+
+
+def test_soft_ttl_disabled_entries_never_stale(clock):
+    # Arrange
+    cache = ResponseCache(ttl=10.0, clock=clock)
+    cache.set("key", {"answer": "Test answer"})
+    
+    # Act
+    clock.now = 9.9
+    entry = cache.get_entry("key")
+    
+    # Assert
+    assert cache.is_stale(entry) is False
+
+
+def test_content_hash_ignores_key_order():
+    # Act
+    first = content_hash({"answer": "a", "sources": ["x"]})
+    second = content_hash({"sources": ["x"], "answer": "a"})
+    changed = content_hash({"answer": "b", "sources": ["x"]})
+    
+    # Assert
+    assert first == second
+    assert first != changed
+
+
+def test_cache_evicts_least_recently_used_by_count():
+    # Arrange
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", {"answer": "a"})
+    cache.set("b", {"answer": "b"})
+    cache.get("a")
+    
+    # Act
+    cache.set("c", {"answer": "c"})
+    
+    # Assert
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_evicts_by_total_bytes():
+    # Arrange
+    cache = ResponseCache(max_entries=100, max_bytes=60)
+    cache.set("a", {"answer": "x" * 20})
+    cache.set("b", {"answer": "y" * 20})
+    
+    # Act
+    stats = cache.stats()
+    
+    # Assert
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= 60
+    assert cache.get("b") is not None
+
+
+def test_cache_rejects_value_larger_than_cache():
+    # Arrange
+    cache = ResponseCache(max_bytes=10)
+    
+    # Act
+    stored = cache.set("key", {"answer": "x" * 100})
+    
+    # Assert
+    assert stored is False
+    assert len(cache) == 0
+
+
+def test_cache_overwrite_updates_size():
+    # Arrange
+    cache = ResponseCache()
+    cache.set("key", {"answer": "x" * 100})
+    
+    # Act
+    cache.set("key", {"answer": "y"})
+    
+    # Assert
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] < 100
+
+
+def test_get_response_cache_reads_environment(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_MAX_ENTRIES", "3")
+    monkeypatch.setenv("ICAET_CACHE_TTL", "5")
+    monkeypatch.setenv("ICAET_CACHE_SOFT_TTL", "2")
+    
+    # Act
+    cache = get_response_cache()
+    
+    # Assert
+    assert cache.max_entries == 3
+    assert cache.ttl == 5.0
+    assert cache.soft_ttl == 2.0
+
+
+def test_get_response_cache_disabled(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_ENABLED", "false")
+    
+    # Act
+    cache = get_response_cache()
+    
+    # Assert
+    assert cache is None
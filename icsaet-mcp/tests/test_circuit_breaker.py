@@ -0,0 +1,185 @@
+"""Tests for the circuit breaker."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from icsaet_mcp.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerGuard,
+    CircuitBreaker,
+    CircuitOpenError,
+    get_circuit_breaker,
+)
+
+
+def _tripped_breaker(clock):
+    breaker = CircuitBreaker(min_calls=2, error_rate=0.5, open_seconds=10.0, clock=clock)
+    for _ in range(2):
+        breaker.allow()
+        breaker.record(False, 0.1)
+    return breaker
+
+
+def test_breaker_starts_closed_and_allows_calls():
+    # Arrange
+    breaker = CircuitBreaker()
+    
+    # Act
+    allowed = breaker.allow()
+    
+    # Assert
+    assert allowed
+    assert breaker.state == CLOSED
+
+
+def test_breaker_opens_on_error_rate(clock):
+    # Act
+    breaker = _tripped_breaker(clock)
+    
+    # Assert
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+    assert breaker.stats()["opened"] == 1
+
+
+def test_breaker_needs_min_calls_before_opening():
+    # Arrange
+    breaker = CircuitBreaker(min_calls=5)
+    
+    # Act
+    for _ in range(4):
+        breaker.record(False, 0.1)
+    
+    # Assert
+    assert breaker.state == CLOSED
+
+
+def test_breaker_opens_on_slow_call_rate():
+    # Arrange
+    breaker = CircuitBreaker(min_calls=2, slow_call_seconds=1.0, slow_call_rate=0.5)
+    
+    # Act
+    breaker.record(True, 2.0)
+    breaker.record(True, 2.0)
+    
+    # Assert
+    assert breaker.state == OPEN
+
+
+def test_breaker_window_forgets_old_outcomes(clock):
+    # Arrange
+    breaker = CircuitBreaker(window=10.0, min_calls=2, clock=clock)
+    breaker.record(False, 0.1)
+    
+    # Act
+    clock.now = 11.0
+    breaker.record(False, 0.1)
+    
+    # Assert
+    assert breaker.state == CLOSED
+    assert breaker.stats()["calls"] == 1
+
+
+def test_breaker_half_open_probe_success_closes(clock):
+    # Arrange
+    breaker = _tripped_breaker(clock)
+    clock.now = 10.0
+    
+    # Act
+    allowed = breaker.allow()
+    second_allowed = breaker.allow()
+    state_during_probe = breaker.state
+    breaker.record(True, 0.1)
+    
+    # Assert
+    assert allowed
+    assert not second_allowed
+    assert state_during_probe == HALF_OPEN
+    assert breaker.state == CLOSED
+
+
+def test_breaker_half_open_probe_failure_reopens(clock):
+    # Arrange
+    breaker = _tripped_breaker(clock)
+    clock.now = 10.0
+    breaker.allow()
+    
+    # Act
+    breaker.record(False, 0.1)
+    
+    # Assert
+    assert breaker.state == OPEN
+    assert breaker.retry_in() == 10.0
+
+
+def test_breaker_release_returns_probe_permit(clock):
+    # Arrange
+    breaker = _tripped_breaker(clock)
+    clock.now = 10.0
+    breaker.allow()
+    
+    # Act
+    breaker.release()
+    
+    # Assert
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_guard_raises_when_open(clock):
+    # Arrange
+    breaker = _tripped_breaker(clock)
+    
+    # Act & Assert
+    with pytest.raises(CircuitOpenError):
+        async with BreakerGuard(breaker):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_guard_records_server_errors_and_exceptions():
+    # Arrange
+    breaker = CircuitBreaker(min_calls=10)
+    
+    # Act
+    async with BreakerGuard(breaker) as guard:
+        guard.observe(httpx.Response(502))
+    with pytest.raises(httpx.ConnectError):
+        async with BreakerGuard(breaker):
+            raise httpx.ConnectError("refused")
+    async with BreakerGuard(breaker) as guard:
+        guard.observe(httpx.Response(404))
+    
+    # Assert
+    assert breaker.stats()["calls"] == 3
+    assert breaker.stats()["error_rate"] == round(2 / 3, 4)
+
+
+@pytest.mark.asyncio
+async def test_guard_cancellation_is_not_recorded():
+    # Arrange
+    breaker = CircuitBreaker()
+    
+    # Act
+    with pytest.raises(asyncio.CancelledError):
+        async with BreakerGuard(breaker):
+            raise asyncio.CancelledError()
+    
+    # Assert
+    assert breaker.stats()["calls"] == 0
+
+
+def test_get_circuit_breaker_disabled(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_BREAKER_ENABLED", "false")
+    
+    # Act
+    breaker = get_circuit_breaker()
+    
+    # Assert
+    assert breaker is None
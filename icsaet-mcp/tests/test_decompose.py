@@ -0,0 +1,204 @@
+"""Tests for multi-part question decomposition."""
+
+import pytest
+
+from icsaet_mcp.decompose import merge_answers, split_question
+from icsaet_mcp.metrics import get_metrics
+from icsaet_mcp.tools import _decomposed_query
+
+API_URL = "https://icaet-dev.wesleyreisz.com/query"
+
+
+@pytest.mark.parametrize("question", [
+    "What is ICAET?",
+    "What did speakers say about code review practices and their impact on quality?",
+    "I am preparing a talk. What did Leslie Miley say?",
+    "Who spoke? And why?"
+])
+def test_simple_questions_are_not_split(question):
+    # Act
+    parts = split_question(question)
+    
+    # Assert
+    assert parts == [question]
+
+
+def test_separate_sentences_are_split():
+    # Act
+    parts = split_question("What is TDD? Who talked about pair programming?")
+    
+    # Assert
+    assert parts == ["What is TDD?", "Who talked about pair programming?"]
+
+
+def test_numbered_lines_are_split():
+    # Act
+    parts = split_question("1. What is TDD\n2. Who spoke about Kanban\n3. Where was the keynote held")
+    
+    # Assert
+    assert parts == ["What is TDD", "Who spoke about Kanban", "Where was the keynote held"]
+
+
+def test_joined_questions_are_split():
+    # Act
+    parts = split_question("Who spoke about DevOps and how did the audience react to the keynote?")
+    
+    # Assert
+    assert parts == ["Who spoke about DevOps?", "How did the audience react to the keynote?"]
+
+
+def test_separate_sentence_with_pronoun_keeps_context():
+    # Act
+    parts = split_question("What is DevOps? How does it relate to SRE?")
+    
+    # Assert
+    assert parts == ["What is DevOps?", "How does it relate to SRE? (context: What is DevOps)"]
+
+
+def test_joined_question_with_pronoun_keeps_context():
+    # Act
+    parts = split_question("How do different speakers approach technical debt and what strategies do they recommend?")
+    
+    # Assert
+    assert parts == [
+        "How do different speakers approach technical debt?",
+        "What strategies do they recommend? (context: How do different speakers approach technical debt)"
+    ]
+
+
+def test_comparison_is_split_per_subject():
+    # Act
+    parts = split_question("How do various speakers compare Scrum and Kanban methodologies?")
+    
+    # Assert
+    assert parts == ["What was said about Scrum?", "What was said about Kanban methodologies?"]
+
+
+def test_comparison_of_clauses_is_not_split():
+    # Arrange
+    question = "Compare what Alice and Bob said about observability"
+    
+    # Act
+    parts = split_question(question)
+    
+    # Assert
+    assert parts == [question]
+
+
+@pytest.mark.parametrize("question, expected", [
+    (
+        "Compare the talks by Alice and Bob",
+        ["What was said about the talks by Alice?", "What was said about the talks by Bob?"]
+    ),
+    (
+        "Compare Kubernetes and Nomad for small teams",
+        ["What was said about Kubernetes for small teams?", "What was said about Nomad for small teams?"]
+    ),
+    (
+        "What is the difference between microservices and monoliths according to the speakers?",
+        [
+            "What was said about microservices according to the speakers?",
+            "What was said about monoliths according to the speakers?"
+        ]
+    ),
+])
+def test_comparison_shares_qualifier_with_both_sides(question, expected):
+    # Act
+    parts = split_question(question)
+    
+    # Assert
+    assert parts == expected
+
+
+def test_follow_up_starting_with_which_keeps_context():
+    # Act
+    parts = split_question("Who spoke about DevOps and which talks did the audience like best?")
+    
+    # Assert
+    assert parts == [
+        "Who spoke about DevOps?",
+        "Which talks did the audience like best? (context: Who spoke about DevOps)"
+    ]
+
+
+def test_too_many_parts_are_not_split():
+    # Arrange
+    question = "What is TDD? What is BDD? What is DDD?"
+    
+    # Act
+    parts = split_question(question, max_parts=2)
+    
+    # Assert
+    assert parts == [question]
+
+
+def test_merge_answers_deduplicates_sources_and_attributes_parts():
+    # Arrange
+    results = [
+        ("What is TDD?", {"answer": "Tests first.", "sources": ["tdd.txt", "agile.txt"]}),
+        ("What is BDD?", {"answer": "Behaviour first.", "sources": ["agile.txt", {"title": "bdd"}]})
+    ]
+    
+    # Act
+    merged = merge_answers("What are TDD and BDD?", results)
+    
+    # Assert
+    assert merged["sources"] == ["tdd.txt", "agile.txt", {"title": "bdd"}]
+    assert merged["answer"] == "**What is TDD?**\nTests first.\n\n**What is BDD?**\nBehaviour first."
+    assert merged["parts"][1] == {"question": "What is BDD?", "answer": "Behaviour first.", "sources": ["agile.txt", {"title": "bdd"}]}
+
+
+def test_merge_answers_keeps_partial_failures():
+    # Arrange
+    results = [
+        ("What is TDD?", {"answer": "Tests first.", "sources": []}),
+        ("What is BDD?", {"error": "API error 500: boom"})
+    ]
+    
+    # Act
+    merged = merge_answers("What are TDD and BDD?", results)
+    
+    # Assert
+    assert merged["parts"][1] == {"question": "What is BDD?", "error": "API error 500: boom"}
+    assert "(No answer: API error 500: boom)" in merged["answer"]
+
+
+def test_merge_answers_all_failed_is_error():
+    # Act
+    merged = merge_answers("q", [("a?", {"error": "x"}), ("b?", {"error": "y"})])
+    
+    # Assert
+    assert merged == {"error": "All sub-questions failed: x; y"}
+
+
+@pytest.mark.asyncio
+async def test_decomposed_query_asks_parts_and_merges(httpx_mock):
+    # Arrange
+    for part, source in (("What is TDD?", "tdd.txt"), ("Who talked about pair programming?", "pairing.txt")):
+        httpx_mock.add_response(
+            method="POST",
+            url=API_URL,
+            match_json={"email": "test@example.com", "question": part},
+            json={"answer": f"Answer to {part}", "sources": [source, "shared.txt"]}
+        )
+    
+    # Act
+    result = await _decomposed_query("What is TDD? Who talked about pair programming?", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert [part["question"] for part in result["parts"]] == ["What is TDD?", "Who talked about pair programming?"]
+    assert result["sources"] == ["tdd.txt", "shared.txt", "pairing.txt"]
+    assert len(httpx_mock.get_requests()) == 2
+    assert get_metrics().counter("sub_questions").value == 2
+
+
+@pytest.mark.asyncio
+async def test_decomposed_query_passes_single_question_through(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(method="POST", url=API_URL, json={"answer": "A conference", "sources": []})
+    
+    # Act
+    result = await _decomposed_query("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert result == {"answer": "A conference", "sources": []}
@@ -0,0 +1,179 @@
+"""Tests for the persistent disk cache."""
+
+import multiprocessing
+import sqlite3
+
+from icsaet_mcp.disk_cache import DiskCache, default_cache_path, get_disk_cache
+
+
+def _write_entries(path, worker, count):
+    cache = DiskCache(path)
+    for i in range(count):
+        cache.set(f"{worker}-{i}", {"answer": f"answer {worker}-{i}"})
+    cache.close()
+
+
+def test_disk_cache_round_trip(tmp_path):
+    # Arrange
+    cache = DiskCache(tmp_path / "answers.db")
+    
+    # Act
+    cache.set("key", {"answer": "Test answer", "sources": ["a.txt"]})
+    result = cache.get("key")
+    
+    # Assert
+    assert result == {"answer": "Test answer", "sources": ["a.txt"]}
+    assert cache.stats()["hits"] == 1
+    cache.close()
+
+
+def test_disk_cache_persists_across_instances(tmp_path):
+    # Arrange
+    path = tmp_path / "answers.db"
+    first = DiskCache(path)
+    first.set("key", {"answer": "Persisted"})
+    first.close()
+    
+    # Act
+    second = DiskCache(path)
+    result = second.get("key")
+    
+    # Assert
+    assert result == {"answer": "Persisted"}
+    second.close()
+
+
+def test_disk_cache_uses_wal_mode(tmp_path):
+    # Arrange
+    path = tmp_path / "answers.db"
+    DiskCache(path).close()
+    
+    # Act
+    conn = sqlite3.connect(str(path))
+    mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    
+    # Assert
+    assert mode == "wal"
+
+
+def test_disk_cache_entry_expires(tmp_path, clock):
+    # Arrange
+    cache = DiskCache(tmp_path / "answers.db", ttl=10.0, clock=clock)
+    cache.set("key", {"answer": "Test"})
+    
+    # Act
+    clock.now += 10.0
+    result = cache.get("key")
+    
+    # Assert
+    assert result is None
+    assert cache.stats()["misses"] == 1
+    cache.close()
+
+
+def test_disk_cache_evicts_least_recently_used_over_size_cap(tmp_path, clock):
+    # Arrange
+    cache = DiskCache(tmp_path / "answers.db", max_bytes=80, clock=clock)
+    cache.set("a", {"answer": "a" * 20})
+    clock.now += 1
+    cache.set("b", {"answer": "b" * 20})
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    
+    # Act
+    cache.set("c", {"answer": "c" * 20})
+    
+    # Assert
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["bytes"] <= 80
+    cache.close()
+
+
+def test_disk_cache_rejects_oversized_value(tmp_path):
+    # Arrange
+    cache = DiskCache(tmp_path / "answers.db", max_bytes=10)
+    
+    # Act
+    stored = cache.set("key", {"answer": "x" * 100})
+    
+    # Assert
+    assert stored is False
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_disk_cache_read_error_is_a_miss(tmp_path):
+    # Arrange
+    cache = DiskCache(tmp_path / "answers.db")
+    cache.close()
+    
+    # Act
+    result = cache.get("key")
+    
+    # Assert
+    assert result is None
+    assert cache.errors == 1
+
+
+def test_disk_cache_concurrent_processes(tmp_path):
+    # Arrange
+    path = tmp_path / "answers.db"
+    DiskCache(path).close()
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_write_entries, args=(path, w, 25)) for w in range(4)]
+    
+    # Act
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    
+    # Assert
+    assert all(worker.exitcode == 0 for worker in workers)
+    cache = DiskCache(path)
+    assert cache.stats()["entries"] == 100
+    assert cache.get("3-24") == {"answer": "answer 3-24"}
+    cache.close()
+
+
+def test_default_cache_path_under_home(monkeypatch, tmp_path):
+    # Arrange
+    monkeypatch.delenv("ICAET_DISK_CACHE_PATH", raising=False)
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    
+    # Act
+    path = default_cache_path()
+    
+    # Assert
+    assert path == tmp_path / ".icsaet-mcp" / "cache" / "answers.db"
+
+
+def test_get_disk_cache_disabled(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_DISK_CACHE_ENABLED", "false")
+    
+    # Act
+    cache = get_disk_cache()
+    
+    # Assert
+    assert cache is None
+
+
+def test_disk_cache_expired_entry_available_as_stale(tmp_path, clock):
+    # Arrange
+    cache = DiskCache(tmp_path / "answers.db", ttl=10.0, clock=clock)
+    cache.set("key", {"answer": "Old"})
+    clock.now += 15.0
+    
+    # Act
+    fresh = cache.get("key")
+    stale = cache.get("key", include_expired=True)
+    
+    # Assert
+    assert fresh is None
+    assert stale == {"answer": "Old"}
+    cache.close()
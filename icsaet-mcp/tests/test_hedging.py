@@ -0,0 +1,201 @@
+"""Tests for hedged requests."""
+
+import asyncio
+
+import pytest
+
+from icsaet_mcp.hedging import Hedger, LatencyTracker, get_hedger
+
+
+def test_latency_tracker_percentile():
+    # Arrange
+    tracker = LatencyTracker()
+    for value in range(1, 101):
+        tracker.record(value / 100)
+    
+    # Act
+    p95 = tracker.percentile(95)
+    p50 = tracker.percentile(50)
+    
+    # Assert
+    assert p95 == 0.95
+    assert p50 == 0.5
+
+
+def test_latency_tracker_empty():
+    # Arrange
+    tracker = LatencyTracker()
+    
+    # Act
+    result = tracker.percentile(95)
+    
+    # Assert
+    assert result is None
+
+
+def test_latency_tracker_window_is_bounded():
+    # Arrange
+    tracker = LatencyTracker(window=3)
+    
+    # Act
+    for value in (10.0, 1.0, 1.0, 1.0):
+        tracker.record(value)
+    
+    # Assert
+    assert len(tracker) == 3
+    assert tracker.percentile(100) == 1.0
+
+
+def test_hedger_delay_uses_initial_until_enough_samples():
+    # Arrange
+    hedger = Hedger(initial_delay=2.0, min_samples=3)
+    hedger.tracker.record(0.1)
+    
+    # Act
+    delay = hedger.delay()
+    
+    # Assert
+    assert delay == 2.0
+
+
+def test_hedger_delay_follows_percentile():
+    # Arrange
+    hedger = Hedger(min_samples=2, min_delay=0.01)
+    for value in (0.1, 0.2, 0.3, 0.4):
+        hedger.tracker.record(value)
+    
+    # Act
+    delay = hedger.delay()
+    
+    # Assert
+    assert delay == 0.4
+
+
+@pytest.mark.asyncio
+async def test_hedger_fast_request_is_not_hedged():
+    # Arrange
+    hedger = Hedger(initial_delay=1.0, max_ratio=1.0)
+    calls = 0
+    
+    async def fn():
+        nonlocal calls
+        calls += 1
+        return "fast"
+    
+    # Act
+    result = await hedger.run(fn)
+    
+    # Assert
+    assert result == "fast"
+    assert calls == 1
+    assert hedger.stats()["hedges"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedger_slow_request_is_hedged_and_loser_cancelled():
+    # Arrange
+    hedger = Hedger(initial_delay=0.01, max_ratio=1.0)
+    calls = 0
+    cancelled = asyncio.Event()
+    
+    async def fn():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "slow"
+        return "hedge"
+    
+    # Act
+    result = await hedger.run(fn)
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    
+    # Assert
+    assert result == "hedge"
+    assert hedger.stats()["hedges"] == 1
+    assert hedger.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedger_respects_max_ratio():
+    # Arrange
+    hedger = Hedger(initial_delay=0.005, max_ratio=0.5)
+    calls = 0
+    
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "done"
+    
+    # Act
+    for _ in range(4):
+        await hedger.run(fn)
+    
+    # Assert
+    assert hedger.stats()["hedges"] == 2
+    assert hedger.stats()["skipped"] == 2
+    assert calls == 6
+
+
+@pytest.mark.asyncio
+async def test_hedger_falls_back_when_first_finisher_fails():
+    # Arrange
+    hedger = Hedger(initial_delay=0.01, max_ratio=1.0)
+    calls = 0
+    
+    async def fn():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            return "primary"
+        raise RuntimeError("hedge failed")
+    
+    # Act
+    result = await hedger.run(fn)
+    
+    # Assert
+    assert result == "primary"
+    assert hedger.stats()["hedge_wins"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedger_raises_when_all_attempts_fail():
+    # Arrange
+    hedger = Hedger(initial_delay=0.01, max_ratio=1.0)
+    
+    async def fn():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("boom")
+    
+    # Act & Assert
+    with pytest.raises(RuntimeError):
+        await hedger.run(fn)
+
+
+def test_get_hedger_disabled_by_default(monkeypatch):
+    # Arrange
+    monkeypatch.delenv("ICAET_HEDGE_ENABLED", raising=False)
+    
+    # Act
+    hedger = get_hedger()
+    
+    # Assert
+    assert hedger is None
+
+
+def test_get_hedger_reads_environment(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_HEDGE_ENABLED", "true")
+    monkeypatch.setenv("ICAET_HEDGE_MAX_RATIO", "0.2")
+    
+    # Act
+    hedger = get_hedger()
+    
+    # Assert
+    assert hedger.max_ratio == 0.2
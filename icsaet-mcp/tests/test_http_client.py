@@ -0,0 +1,177 @@
+"""Tests for the shared HTTP client."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from icsaet_mcp import http_client
+from icsaet_mcp.http_client import (
+    _trace,
+    aclose_client,
+    get_client,
+    get_client_stats,
+    reset_client_stats,
+)
+
+
+@pytest.mark.asyncio
+async def test_get_client_reuses_instance():
+    # Arrange
+    first = get_client()
+    
+    # Act
+    second = get_client()
+    
+    # Assert
+    assert first is second
+    await aclose_client()
+
+
+@pytest.mark.asyncio
+async def test_get_client_reopens_after_close():
+    # Arrange
+    first = get_client()
+    await aclose_client()
+    
+    # Act
+    second = get_client()
+    
+    # Assert
+    assert first.is_closed
+    assert second is not first
+    assert not second.is_closed
+    await aclose_client()
+
+
+@pytest.mark.asyncio
+async def test_get_client_closes_client_of_previous_running_loop():
+    # Arrange
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    
+    async def open_client():
+        return get_client()
+    
+    first = asyncio.run_coroutine_threadsafe(open_client(), other_loop).result(timeout=5)
+    
+    try:
+        # Act
+        second = get_client()
+        for _ in range(100):
+            if first.is_closed:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(timeout=5)
+        other_loop.close()
+    
+    # Assert
+    assert first.is_closed
+    assert second is not first
+    await aclose_client()
+
+
+@pytest.mark.asyncio
+async def test_get_client_pool_limits_from_env(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_HTTP_MAX_CONNECTIONS", "5")
+    monkeypatch.setenv("ICAET_HTTP_MAX_KEEPALIVE", "2")
+    monkeypatch.setenv("ICAET_HTTP_KEEPALIVE_EXPIRY", "12.5")
+    built = {}
+    original = httpx.AsyncClient
+    
+    def capture(**kwargs):
+        built.update(kwargs)
+        return original(**kwargs)
+    
+    monkeypatch.setattr(httpx, "AsyncClient", capture)
+    
+    # Act
+    get_client()
+    
+    # Assert
+    assert built["limits"].max_connections == 5
+    assert built["limits"].max_keepalive_connections == 2
+    assert built["limits"].keepalive_expiry == 12.5
+    await aclose_client()
+
+
+@pytest.mark.asyncio
+async def test_get_client_http2_falls_back_without_h2(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_HTTP2", "true")
+    monkeypatch.setattr(http_client, "_http2_available", lambda: False)
+    built = {}
+    original = httpx.AsyncClient
+    
+    def capture(**kwargs):
+        built.update(kwargs)
+        return original(**kwargs)
+    
+    monkeypatch.setattr(httpx, "AsyncClient", capture)
+    
+    # Act
+    get_client()
+    
+    # Assert
+    assert built["http2"] is False
+    await aclose_client()
+
+
+@pytest.mark.asyncio
+async def test_aclose_client_without_client_is_noop():
+    # Arrange
+    await aclose_client()
+    
+    # Act
+    await aclose_client()
+    
+    # Assert
+    assert http_client._client is None
+
+
+@pytest.mark.asyncio
+async def test_trace_counts_requests_and_connections():
+    # Arrange
+    reset_client_stats()
+    
+    # Act
+    await _trace("connection.connect_tcp.complete", {})
+    await _trace("http11.send_request_headers.started", {})
+    await _trace("http11.send_request_headers.started", {})
+    await _trace("http2.send_request_headers.started", {})
+    
+    # Assert
+    stats = get_client_stats()
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_keep_alive_connection(fault_server):
+    # Arrange
+    server = await fault_server()
+    reset_client_stats()
+    client = get_client()
+    
+    # Act
+    for _ in range(5):
+        await client.post(
+            f"{server.url}/query",
+            json={"question": "What is ICAET?", "email": "test@example.com"},
+            headers={"x-api-key": "test-api-key-12345"},
+            extensions=http_client.request_extensions()
+        )
+    stats = get_client_stats()
+    await aclose_client()
+    
+    # Assert
+    assert server.stats()["connections"] == 1
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
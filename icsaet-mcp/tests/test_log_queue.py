@@ -0,0 +1,232 @@
+"""Tests for the bounded log queue."""
+
+import logging
+import queue
+import threading
+import time
+
+import pytest
+
+from icsaet_mcp.log_queue import (
+    BLOCK,
+    DROP_DEBUG_FIRST,
+    DROP_OLDEST,
+    BoundedLogQueue,
+    ReportingQueueListener,
+)
+
+
+def _record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("icsaet_mcp.test", level, __file__, 1, msg, None, None)
+
+
+def _drain(log_queue: BoundedLogQueue) -> list[str]:
+    messages = []
+    while not log_queue.empty():
+        messages.append(log_queue.get_nowait().msg)
+    return messages
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_queue_is_fifo_below_capacity():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=3)
+    
+    # Act
+    for name in ("a", "b", "c"):
+        log_queue.put_nowait(_record(name))
+    
+    # Assert
+    assert _drain(log_queue) == ["a", "b", "c"]
+    assert log_queue.stats()["dropped"] == 0
+
+
+def test_unknown_policy_rejected():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        BoundedLogQueue(policy="drop_newest")
+
+
+def test_drop_oldest_discards_head():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=2, policy=DROP_OLDEST)
+    
+    # Act
+    for name in ("a", "b", "c"):
+        log_queue.put_nowait(_record(name, logging.ERROR))
+    
+    # Assert
+    assert _drain(log_queue) == ["b", "c"]
+    assert log_queue.stats()["dropped_by_level"] == {"ERROR": 1}
+
+
+def test_drop_debug_first_evicts_lowest_level():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=3, policy=DROP_DEBUG_FIRST)
+    log_queue.put_nowait(_record("info", logging.INFO))
+    log_queue.put_nowait(_record("debug", logging.DEBUG))
+    log_queue.put_nowait(_record("warning", logging.WARNING))
+    
+    # Act
+    log_queue.put_nowait(_record("error1", logging.ERROR))
+    log_queue.put_nowait(_record("error2", logging.ERROR))
+    
+    # Assert
+    assert _drain(log_queue) == ["warning", "error1", "error2"]
+    assert log_queue.stats()["dropped_by_level"] == {"DEBUG": 1, "INFO": 1}
+
+
+def test_drop_debug_first_drops_incoming_when_nothing_less_important():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=2, policy=DROP_DEBUG_FIRST)
+    log_queue.put_nowait(_record("error1", logging.ERROR))
+    log_queue.put_nowait(_record("info", logging.INFO))
+    
+    # Act
+    log_queue.put_nowait(_record("debug", logging.DEBUG))
+    log_queue.put_nowait(_record("info2", logging.INFO))
+    
+    # Assert
+    assert _drain(log_queue) == ["error1", "info"]
+    assert log_queue.stats()["dropped_by_level"] == {"DEBUG": 1, "INFO": 1}
+
+
+def test_block_policy_drops_after_timeout():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=1, policy=BLOCK, block_timeout=0.05)
+    log_queue.put_nowait(_record("a"))
+    
+    # Act
+    start = time.monotonic()
+    log_queue.put_nowait(_record("b"))
+    elapsed = time.monotonic() - start
+    
+    # Assert
+    assert elapsed >= 0.05
+    assert _drain(log_queue) == ["a"]
+    assert log_queue.stats()["blocked"] == 1
+    assert log_queue.stats()["dropped"] == 1
+
+
+def test_block_policy_waits_for_consumer():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=1, policy=BLOCK, block_timeout=2.0)
+    log_queue.put_nowait(_record("a"))
+    consumer = threading.Timer(0.05, log_queue.get_nowait)
+    
+    # Act
+    consumer.start()
+    log_queue.put_nowait(_record("b"))
+    consumer.join()
+    
+    # Assert
+    assert _drain(log_queue) == ["b"]
+    assert log_queue.stats()["dropped"] == 0
+
+
+def test_sentinel_always_accepted():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=1, policy=DROP_DEBUG_FIRST)
+    log_queue.put_nowait(_record("a", logging.ERROR))
+    
+    # Act
+    log_queue.put_nowait(None)
+    
+    # Assert
+    assert log_queue.qsize() == 2
+
+
+def test_get_timeout_raises_empty():
+    # Arrange
+    log_queue = BoundedLogQueue()
+    
+    # Act / Assert
+    with pytest.raises(queue.Empty):
+        log_queue.get(True, timeout=0.01)
+    with pytest.raises(queue.Empty):
+        log_queue.get_nowait()
+
+
+def test_stats_track_depth_and_high_water():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=5)
+    for name in ("a", "b", "c"):
+        log_queue.put_nowait(_record(name))
+    
+    # Act
+    log_queue.get_nowait()
+    stats = log_queue.stats()
+    
+    # Assert
+    assert stats["depth"] == 2
+    assert stats["high_water"] == 3
+    assert stats["enqueued"] == 3
+    assert stats["capacity"] == 5
+
+
+def test_listener_reports_drops_once_per_interval():
+    # Arrange
+    now = [0.0]
+    log_queue = BoundedLogQueue(capacity=1, policy=DROP_OLDEST)
+    handler = CollectingHandler()
+    listener = ReportingQueueListener(log_queue, handler, report_interval=60.0, clock=lambda: now[0])
+    for name in ("a", "b", "c"):
+        log_queue.put_nowait(_record(name, logging.DEBUG))
+    
+    # Act
+    listener.report_drops()
+    before = list(handler.messages)
+    now[0] = 61.0
+    listener.report_drops()
+    now[0] = 200.0
+    listener.report_drops()
+    
+    # Assert
+    assert before == []
+    assert len(handler.messages) == 1
+    assert "Log records dropped [dropped=2, total=2, debug=2" in handler.messages[0]
+
+
+def test_listener_delivers_records_and_reports_on_stop():
+    # Arrange
+    log_queue = BoundedLogQueue(capacity=1, policy=DROP_OLDEST)
+    handler = CollectingHandler()
+    listener = ReportingQueueListener(log_queue, handler, report_interval=60.0)
+    log_queue.put_nowait(_record("dropped"))
+    log_queue.put_nowait(_record("kept"))
+    
+    # Act
+    listener.start()
+    listener.stop()
+    
+    # Assert
+    assert handler.messages[0] == "kept"
+    assert handler.messages[1].startswith("Log records dropped [dropped=1")
+
+
+def test_listener_flushes_throttle_summaries_directly():
+    # Arrange
+    from icsaet_mcp.log_throttle import LogThrottleFilter
+    
+    now = [0.0]
+    throttle = LogThrottleFilter(window=10.0, clock=lambda: now[0])
+    log_queue = BoundedLogQueue()
+    handler = CollectingHandler()
+    listener = ReportingQueueListener(log_queue, handler, throttle=throttle)
+    for _ in range(3):
+        throttle.filter(_record("Upstream down", logging.ERROR))
+    
+    # Act
+    listener.start()
+    listener.stop()
+    
+    # Assert
+    assert handler.messages == ["Repeated log message suppressed [count=2, window=10.0, message=Upstream down]"]
@@ -0,0 +1,202 @@
+"""Tests for log throttling and sampling."""
+
+import logging
+import random
+
+from icsaet_mcp.log_throttle import LogThrottleFilter, throttle_key
+from icsaet_mcp.structured_logging import StructuredMessage
+
+
+def _record(msg, level=logging.ERROR, name="icsaet_mcp.tools") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def _failure(message="connection refused") -> logging.LogRecord:
+    return _record(StructuredMessage("API request failed", {"error": "RequestError", "message": message}))
+
+
+def test_throttle_key_ignores_numbers():
+    # Arrange
+    first = _record("API request attempt failed [attempt=1, retry_in=0.347]", logging.WARNING)
+    second = _record("API request attempt failed [attempt=2, retry_in=1.912]", logging.WARNING)
+    
+    # Act / Assert
+    assert throttle_key(first) == throttle_key(second)
+
+
+def test_throttle_key_structured_fields():
+    # Arrange
+    base = _record(StructuredMessage("API request failed", {"status_code": 500, "error": "HTTPStatusError"}))
+    other_status = _record(StructuredMessage("API request failed", {"status_code": 503, "error": "HTTPStatusError"}))
+    other_error = _record(StructuredMessage("API request failed", {"status_code": 500, "error": "RequestError"}))
+    
+    # Act / Assert
+    assert throttle_key(base) == throttle_key(other_status)
+    assert throttle_key(base) != throttle_key(other_error)
+    assert throttle_key(base) != throttle_key(_record(base.msg, logging.WARNING))
+
+
+def test_repeats_within_window_are_suppressed():
+    # Arrange
+    now = [0.0]
+    throttle = LogThrottleFilter(window=10.0, clock=lambda: now[0])
+    
+    # Act
+    results = [throttle.filter(_failure()) for _ in range(5)]
+    
+    # Assert
+    assert results == [True, False, False, False, False]
+    assert throttle.stats()["suppressed"] == 4
+
+
+def test_reset_forgets_windows_without_summaries():
+    # Arrange
+    summaries = []
+    throttle = LogThrottleFilter(window=10.0, emit=summaries.append, clock=lambda: 0.0)
+    for _ in range(3):
+        throttle.filter(_failure())
+    
+    # Act
+    throttle.reset()
+    throttle.flush(force=True)
+    
+    # Assert
+    assert summaries == []
+    assert throttle.stats() == {"tracked_keys": 0, "suppressed": 0, "sampled_out": {}}
+    assert throttle.filter(_failure()) is True
+
+
+def test_info_lines_are_not_throttled_by_default():
+    # Arrange
+    throttle = LogThrottleFilter(window=10.0, clock=lambda: 0.0)
+    received = _record(StructuredMessage("Query received", {"question_length": 14}), logging.INFO)
+    
+    # Act
+    results = [throttle.filter(received) for _ in range(5)]
+    
+    # Assert
+    assert results == [True] * 5
+    assert throttle.stats()["suppressed"] == 0
+
+
+def test_min_level_can_include_info():
+    # Arrange
+    throttle = LogThrottleFilter(window=10.0, min_level=logging.INFO, clock=lambda: 0.0)
+    
+    # Act
+    results = [throttle.filter(_record("Cache hit", logging.INFO)) for _ in range(3)]
+    
+    # Assert
+    assert results == [True, False, False]
+
+
+def test_burst_allows_several_repeats():
+    # Arrange
+    throttle = LogThrottleFilter(window=10.0, burst=3, clock=lambda: 0.0)
+    
+    # Act
+    results = [throttle.filter(_failure()) for _ in range(5)]
+    
+    # Assert
+    assert results == [True, True, True, False, False]
+
+
+def test_distinct_messages_pass():
+    # Arrange
+    throttle = LogThrottleFilter(window=10.0, clock=lambda: 0.0)
+    
+    # Act / Assert
+    assert throttle.filter(_failure("connection refused"))
+    assert throttle.filter(_failure("name resolution failed"))
+
+
+def test_summary_emitted_when_window_ends():
+    # Arrange
+    now = [0.0]
+    emitted = []
+    throttle = LogThrottleFilter(window=10.0, clock=lambda: now[0], emit=emitted.append)
+    for _ in range(4):
+        throttle.filter(_failure())
+    
+    # Act
+    now[0] = 11.0
+    passed = throttle.filter(_failure())
+    
+    # Assert
+    assert passed
+    assert len(emitted) == 1
+    summary = emitted[0]
+    assert summary.levelno == logging.ERROR
+    assert summary.name == "icsaet_mcp.tools"
+    assert str(summary.msg) == "Repeated log message suppressed [count=3, window=10.0, message=API request failed]"
+    assert throttle.filter(summary)
+
+
+def test_flush_emits_ended_windows_without_new_records():
+    # Arrange
+    now = [0.0]
+    emitted = []
+    throttle = LogThrottleFilter(window=10.0, clock=lambda: now[0])
+    throttle.filter(_failure())
+    throttle.filter(_failure())
+    
+    # Act
+    throttle.flush(emit=emitted.append)
+    early = len(emitted)
+    now[0] = 20.0
+    throttle.flush(emit=emitted.append)
+    
+    # Assert
+    assert early == 0
+    assert len(emitted) == 1
+    assert emitted[0].msg.fields["count"] == 1
+    assert throttle.stats()["tracked_keys"] == 0
+
+
+def test_flush_force_emits_open_windows():
+    # Arrange
+    emitted = []
+    throttle = LogThrottleFilter(window=10.0, clock=lambda: 0.0)
+    throttle.filter(_record("Upstream throttled"))
+    throttle.filter(_record("Upstream throttled"))
+    throttle.filter(_record("Only once"))
+    
+    # Act
+    throttle.flush(force=True, emit=emitted.append)
+    
+    # Assert
+    assert [record.msg.fields["message"] for record in emitted] == ["Upstream throttled"]
+
+
+def test_sampling_by_level():
+    # Arrange
+    throttle = LogThrottleFilter(
+        window=0.0,
+        sample_rates={logging.DEBUG: 0.0, logging.INFO: 0.5},
+        rng=random.Random(1)
+    )
+    
+    # Act
+    debug = [throttle.filter(_record(f"debug {c}", logging.DEBUG)) for c in "abcdefghij"]
+    info = [throttle.filter(_record(f"info {c}", logging.INFO)) for c in "abcdefghijklmnopqrstuvwxyz" * 4]
+    errors = [throttle.filter(_record(f"error {c}", logging.ERROR)) for c in "abcdefghij"]
+    
+    # Assert
+    assert not any(debug)
+    assert 30 <= sum(info) <= 70
+    assert all(errors)
+    assert throttle.stats()["sampled_out"]["DEBUG"] == 10
+
+
+def test_max_keys_bounds_tracking():
+    # Arrange
+    throttle = LogThrottleFilter(window=10.0, max_keys=2, clock=lambda: 0.0)
+    
+    # Act
+    for word in ("alpha", "beta", "gamma"):
+        throttle.filter(_record(f"message {word}"))
+    repeat = throttle.filter(_record("message gamma"))
+    
+    # Assert
+    assert throttle.stats()["tracked_keys"] == 2
+    assert repeat
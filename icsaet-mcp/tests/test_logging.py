@@ -7,7 +7,14 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from icsaet_mcp.logging_config import setup_logging
+from icsaet_mcp.log_throttle import LogThrottleFilter
+from icsaet_mcp.logging_config import (
+    DeferredFileHandler,
+    get_log_queue_stats,
+    get_log_throttle_stats,
+    setup_logging,
+)
+from icsaet_mcp.structured_logging import JsonFormatter, TextFormatter
 
 
 def test_setup_logging_default_level(monkeypatch):
@@ -77,7 +84,7 @@ def test_setup_logging_stderr_handler(monkeypatch):
     assert len(queue_handlers) > 0
 
 
-def test_setup_logging_creates_log_directory(tmp_path, monkeypatch):
+def test_setup_logging_defers_log_directory(tmp_path, monkeypatch):
     # Arrange
     monkeypatch.delenv("ICAET_LOG_LEVEL", raising=False)
     mock_home = tmp_path / "mock_home"
@@ -89,7 +96,37 @@ def test_setup_logging_creates_log_directory(tmp_path, monkeypatch):
         
         # Assert
         log_dir = mock_home / ".icsaet-mcp" / "logs"
-        assert log_dir.exists()
+        assert not log_dir.exists()
+
+
+def test_deferred_file_handler_creates_log_directory_on_first_record(tmp_path):
+    # Arrange
+    log_file = tmp_path / "logs" / "server.log"
+    handler = DeferredFileHandler(log_file, maxBytes=1024, backupCount=1)
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None)
+    
+    # Act
+    created_before = log_file.parent.exists()
+    handler.emit(record)
+    handler.close()
+    
+    # Assert
+    assert not created_before
+    assert "hello" in log_file.read_text()
+
+
+def test_deferred_file_handler_disables_itself_on_failure(tmp_path):
+    # Arrange
+    handler = DeferredFileHandler(tmp_path / "logs" / "server.log")
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None)
+    
+    with patch("pathlib.Path.mkdir", side_effect=PermissionError("Cannot create directory")):
+        # Act
+        handler.emit(record)
+    
+    # Assert
+    assert handler.unavailable
+    assert handler.stream is None
 
 
 def test_setup_logging_handles_file_creation_failure(monkeypatch):
@@ -117,3 +154,86 @@ def test_setup_logging_format(monkeypatch, caplog):
     queue_handlers = [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
     assert len(queue_handlers) > 0
 
+
+def test_setup_logging_json_file_format(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_LOG_FILE_FORMAT", "json")
+    
+    with patch("pathlib.Path.home", return_value=tmp_path):
+        # Act
+        logger = setup_logging()
+    
+    # Assert
+    listener = logger.handlers[-1].listener
+    file_handlers = [h for h in listener.handlers if isinstance(h, DeferredFileHandler)]
+    assert isinstance(file_handlers[0].formatter, JsonFormatter)
+
+
+def test_setup_logging_invalid_file_format_falls_back_to_text(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_LOG_FILE_FORMAT", "xml")
+    
+    with patch("pathlib.Path.home", return_value=tmp_path):
+        # Act
+        logger = setup_logging()
+    
+    # Assert
+    listener = logger.handlers[-1].listener
+    file_handlers = [h for h in listener.handlers if isinstance(h, DeferredFileHandler)]
+    assert isinstance(file_handlers[0].formatter, TextFormatter)
+
+
+def test_setup_logging_bounded_queue_from_env(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_LOG_QUEUE_CAPACITY", "123")
+    monkeypatch.setenv("ICAET_LOG_QUEUE_POLICY", "drop-oldest")
+    
+    with patch("pathlib.Path.home", return_value=tmp_path):
+        # Act
+        setup_logging()
+    
+    # Assert
+    stats = get_log_queue_stats()
+    assert stats["capacity"] == 123
+    assert stats["policy"] == "drop_oldest"
+
+
+def test_setup_logging_invalid_queue_policy_uses_default(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_LOG_QUEUE_POLICY", "drop_everything")
+    
+    with patch("pathlib.Path.home", return_value=tmp_path):
+        # Act
+        setup_logging()
+    
+    # Assert
+    assert get_log_queue_stats()["policy"] == "drop_debug_first"
+
+
+def test_setup_logging_throttle_from_env(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_LOG_THROTTLE_ENABLED", "true")
+    monkeypatch.setenv("ICAET_LOG_SAMPLE_DEBUG", "0.25")
+    
+    with patch("pathlib.Path.home", return_value=tmp_path):
+        # Act
+        logger = setup_logging()
+    
+    # Assert
+    queue_handler = logger.handlers[-1]
+    logger.removeHandler(queue_handler)
+    throttles = [f for f in queue_handler.filters if isinstance(f, LogThrottleFilter)]
+    assert throttles[0].sample_rates[logging.DEBUG] == 0.25
+    assert get_log_throttle_stats()["suppressed"] == 0
+
+
+def test_setup_logging_throttle_disabled(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_LOG_THROTTLE_ENABLED", "false")
+    
+    with patch("pathlib.Path.home", return_value=tmp_path):
+        # Act
+        setup_logging()
+    
+    # Assert
+    assert get_log_throttle_stats() is None
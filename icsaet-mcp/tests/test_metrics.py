@@ -0,0 +1,177 @@
+"""Tests for the metrics registry."""
+
+import asyncio
+import logging
+
+import pytest
+
+from icsaet_mcp.metrics import Histogram, MetricsRegistry, get_metrics, log_metrics_periodically, metrics_reporter, reset_metrics
+
+
+def test_counter_labels_are_tracked_separately():
+    # Arrange
+    registry = MetricsRegistry()
+    
+    # Act
+    registry.counter("upstream_responses", status=200).inc()
+    registry.counter("upstream_responses", status=200).inc()
+    registry.counter("upstream_responses", status=503).inc()
+    
+    # Assert
+    counters = registry.snapshot()["counters"]
+    assert counters["upstream_responses{status=200}"] == 2
+    assert counters["upstream_responses{status=503}"] == 1
+
+
+def test_gauge_goes_up_and_down():
+    # Arrange
+    registry = MetricsRegistry()
+    gauge = registry.gauge("queries_in_flight")
+    
+    # Act
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    
+    # Assert
+    assert registry.snapshot()["gauges"]["queries_in_flight"] == 1
+
+
+def test_histogram_percentiles_within_relative_error():
+    # Arrange
+    histogram = Histogram()
+    for value in range(1, 10001):
+        histogram.record(value / 1000)
+    
+    # Act
+    p50 = histogram.percentile(50)
+    p99 = histogram.percentile(99)
+    
+    # Assert
+    assert p50 == pytest.approx(5.0, rel=0.01)
+    assert p99 == pytest.approx(9.9, rel=0.01)
+
+
+def test_histogram_is_exact_for_small_values():
+    # Arrange
+    histogram = Histogram()
+    
+    # Act
+    for micros in (5, 10, 20):
+        histogram.record(micros / 1_000_000)
+    
+    # Assert
+    assert histogram.percentile(50) == pytest.approx(10 / 1_000_000)
+    assert histogram.percentile(100) == pytest.approx(20 / 1_000_000)
+
+
+def test_histogram_memory_does_not_grow_with_samples():
+    # Arrange
+    histogram = Histogram()
+    
+    # Act
+    for value in range(100000):
+        histogram.record(0.5 + value / 1_000_000)
+    
+    # Assert
+    assert histogram.count == 100000
+    assert len(histogram._buckets) <= 64
+
+
+def test_histogram_summary_reports_milliseconds():
+    # Arrange
+    histogram = Histogram()
+    histogram.record(0.1)
+    histogram.record(0.3)
+    
+    # Act
+    summary = histogram.summary()
+    
+    # Assert
+    assert summary["count"] == 2
+    assert summary["mean_ms"] == 200.0
+    assert summary["min_ms"] == 100.0
+    assert summary["max_ms"] == 300.0
+    assert summary["p99.9_ms"] == 300.0
+
+
+def test_histogram_summary_empty():
+    # Arrange
+    histogram = Histogram()
+    
+    # Act
+    summary = histogram.summary()
+    
+    # Assert
+    assert summary == {"count": 0}
+    assert histogram.percentile(50) is None
+
+
+def test_summary_fields_flatten_histograms():
+    # Arrange
+    registry = MetricsRegistry()
+    registry.counter("queries").inc(3)
+    registry.histogram("query_latency").record(0.25)
+    
+    # Act
+    fields = registry.summary_fields()
+    
+    # Assert
+    assert fields["queries"] == 3
+    assert fields["query_latency.count"] == 1
+    assert fields["query_latency.p50_ms"] == 250.0
+
+
+def test_reset_metrics_replaces_registry():
+    # Arrange
+    get_metrics().counter("queries").inc()
+    
+    # Act
+    reset_metrics()
+    
+    # Assert
+    assert get_metrics().snapshot()["counters"] == {}
+
+
+@pytest.mark.asyncio
+async def test_log_metrics_periodically_logs_snapshot(caplog):
+    # Arrange
+    get_metrics().counter("queries").inc(2)
+    caplog.set_level(logging.INFO, logger="icsaet_mcp.metrics")
+    
+    # Act
+    task = asyncio.create_task(log_metrics_periodically(0.01))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    
+    # Assert
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("Metrics snapshot [queries=2") for message in messages)
+
+
+@pytest.mark.asyncio
+async def test_metrics_reporter_cancels_task_on_exit():
+    # Arrange
+    tasks_before = len(asyncio.all_tasks())
+    
+    # Act
+    async with metrics_reporter(60.0):
+        running = len(asyncio.all_tasks())
+    await asyncio.sleep(0)
+    
+    # Assert
+    assert running == tasks_before + 1
+    assert len(asyncio.all_tasks()) == tasks_before
+
+
+@pytest.mark.asyncio
+async def test_metrics_reporter_disabled_with_zero_interval():
+    # Arrange
+    tasks_before = len(asyncio.all_tasks())
+    
+    # Act
+    async with metrics_reporter(0):
+        running = len(asyncio.all_tasks())
+    
+    # Assert
+    assert running == tasks_before
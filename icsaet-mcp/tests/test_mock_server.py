@@ -0,0 +1,141 @@
+"""Tests for the mock ICAET server's fault injection."""
+
+import statistics
+import time
+
+import httpx
+import pytest
+
+from tests.mock_server import FaultProfile, ThreadedMockServer
+
+QUERY = {"question": "What is ICAET?", "email": "test@example.com"}
+HEADERS = {"x-api-key": "test-api-key-12345"}
+
+
+def test_fault_profile_rejects_unknown_distribution():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        FaultProfile(latency="uniform")
+
+
+def test_fault_profile_lognormal_median():
+    # Arrange
+    profile = FaultProfile(latency="lognormal", latency_seconds=0.02, latency_sigma=0.5, seed=1)
+    
+    # Act
+    samples = [profile.sample_latency() for _ in range(2000)]
+    
+    # Assert
+    assert statistics.median(samples) == pytest.approx(0.02, rel=0.1)
+    assert max(samples) > 0.04
+
+
+def test_fault_profile_longtail_share():
+    # Arrange
+    profile = FaultProfile(latency="longtail", latency_seconds=0.01, tail_probability=0.1, tail_seconds=2.0, seed=1)
+    
+    # Act
+    samples = [profile.sample_latency() for _ in range(2000)]
+    
+    # Assert
+    assert set(samples) == {0.01, 2.0}
+    assert samples.count(2.0) / len(samples) == pytest.approx(0.1, abs=0.03)
+
+
+@pytest.mark.asyncio
+async def test_fixed_latency_delays_response(fault_server):
+    # Arrange
+    server = await fault_server(latency_seconds=0.1)
+    
+    # Act
+    async with httpx.AsyncClient() as client:
+        start = time.monotonic()
+        response = await client.post(f"{server.url}/query", json=QUERY, headers=HEADERS)
+        elapsed = time.monotonic() - start
+    
+    # Assert
+    assert response.status_code == 200
+    assert elapsed >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_error_rate_returns_error_status(fault_server):
+    # Arrange
+    server = await fault_server(error_rate=1.0, error_status=502)
+    
+    # Act
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{server.url}/query", json=QUERY, headers=HEADERS)
+    
+    # Assert
+    assert response.status_code == 502
+    assert server.stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_throttle_burst_sends_retry_after(fault_server):
+    # Arrange
+    server = await fault_server(throttle_rate=1.0, throttle_burst=3, retry_after=2.5)
+    
+    # Act
+    async with httpx.AsyncClient() as client:
+        responses = [await client.post(f"{server.url}/query", json=QUERY, headers=HEADERS) for _ in range(3)]
+    server.profile.throttle_rate = 0.0
+    async with httpx.AsyncClient() as client:
+        after = await client.post(f"{server.url}/query", json=QUERY, headers=HEADERS)
+    
+    # Assert
+    assert [r.status_code for r in responses] == [429, 429, 429]
+    assert responses[0].headers["Retry-After"] == "3"
+    assert after.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_reset_rate_drops_connection(fault_server):
+    # Arrange
+    server = await fault_server(reset_rate=1.0)
+    
+    # Act / Assert
+    async with httpx.AsyncClient() as client:
+        with pytest.raises((httpx.ReadError, httpx.RemoteProtocolError)):
+            await client.post(f"{server.url}/query", json=QUERY, headers=HEADERS)
+    assert server.stats()["resets"] == 1
+
+
+@pytest.mark.asyncio
+async def test_response_bytes_pads_answer(fault_server):
+    # Arrange
+    server = await fault_server(response_bytes=10_000)
+    
+    # Act
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{server.url}/query", json=QUERY, headers=HEADERS)
+    
+    # Assert
+    assert len(response.content) == 10_000
+    assert response.json()["sources"] == ["mock_source.txt"]
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_serves_many_requests_on_one_connection(fault_server):
+    # Arrange
+    server = await fault_server()
+    
+    # Act
+    async with httpx.AsyncClient() as client:
+        for _ in range(5):
+            await client.post(f"{server.url}/query", json=QUERY, headers=HEADERS)
+    
+    # Assert
+    assert server.stats()["requests"] == 5
+    assert server.stats()["connections"] == 1
+
+
+def test_threaded_server_is_ready_on_start():
+    # Act
+    with ThreadedMockServer() as server:
+        response = httpx.get(f"{server.url}/health")
+    
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
@@ -0,0 +1,139 @@
+"""Tests for the negative cache of deterministic upstream errors."""
+
+import pytest
+
+from icsaet_mcp.metrics import get_metrics
+from icsaet_mcp.negative_cache import NegativeCache, credentials_fingerprint, get_negative_cache
+from icsaet_mcp.tools import _cached_query, _query_impl
+
+API_URL = "https://icaet-dev.wesleyreisz.com/query"
+
+
+def test_negative_entry_expires_after_ttl(clock):
+    # Arrange
+    cache = NegativeCache(ttl=30.0, clock=clock)
+    cache.set("fp", "key", {"error": "API error 400: bad question"})
+    
+    # Act
+    before = cache.get("fp", "key")
+    clock.now = 30.0
+    after = cache.get("fp", "key")
+    
+    # Assert
+    assert before == {"error": "API error 400: bad question"}
+    assert after is None
+    assert len(cache) == 0
+
+
+def test_negative_entries_are_scoped_to_credentials():
+    # Arrange
+    cache = NegativeCache()
+    cache.set(credentials_fingerprint("key-a", API_URL), "key", {"error": "API error 403: forbidden"})
+    
+    # Act
+    result = cache.get(credentials_fingerprint("key-b", API_URL), "key")
+    
+    # Assert
+    assert result is None
+
+
+def test_negative_cache_is_bounded():
+    # Arrange
+    cache = NegativeCache(max_entries=2)
+    
+    # Act
+    for key in ("a", "b", "c"):
+        cache.set("fp", key, {"error": key})
+    
+    # Assert
+    assert len(cache) == 2
+    assert cache.get("fp", "a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_rejected_credentials_do_not_expire(clock):
+    # Arrange
+    cache = NegativeCache(ttl=1.0, clock=clock)
+    fingerprint = credentials_fingerprint("bad-key", API_URL)
+    cache.reject_credentials(fingerprint, {"error": "API error 401: Unauthorized"})
+    
+    # Act
+    clock.now = 1e9
+    result = cache.rejected_credentials(fingerprint)
+    
+    # Assert
+    assert result == {"error": "API error 401: Unauthorized"}
+    assert cache.rejected_credentials(credentials_fingerprint("new-key", API_URL)) is None
+    assert cache.stats()["auth_short_circuits"] == 1
+
+
+def test_fingerprint_does_not_contain_key():
+    # Act
+    fingerprint = credentials_fingerprint("secret-api-key", API_URL)
+    
+    # Assert
+    assert "secret-api-key" not in fingerprint
+
+
+@pytest.mark.asyncio
+async def test_400_is_served_from_negative_cache(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(method="POST", url=API_URL, status_code=400, text="Invalid question")
+    
+    # Act
+    first = await _cached_query("?", "test-api-key", "test@example.com")
+    second = await _cached_query("?", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert first == second == {"error": "API error 400: Invalid question"}
+    assert len(httpx_mock.get_requests()) == 1
+    assert get_metrics().counter("query_errors", type="NegativeCached").value == 1
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_not_negatively_cached(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_RETRY_MAX_ATTEMPTS", "1")
+    httpx_mock.add_response(method="POST", url=API_URL, status_code=500, text="Internal Server Error", is_reusable=True)
+    
+    # Act
+    await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert len(httpx_mock.get_requests()) == 2
+    assert len(get_negative_cache()) == 0
+
+
+@pytest.mark.asyncio
+async def test_401_short_circuits_until_api_key_changes(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(method="POST", url=API_URL, status_code=401, text="Unauthorized")
+    httpx_mock.add_response(method="POST", url=API_URL, json={"answer": "Hello", "sources": []})
+    
+    # Act
+    first = await _query_impl("What is ICAET?", "bad-key", "test@example.com")
+    second = await _query_impl("Another question", "bad-key", "test@example.com")
+    fixed = await _query_impl("Another question", "good-key", "test@example.com")
+    
+    # Assert
+    assert first == {"error": "API error 401: Unauthorized"}
+    assert "ICAET_API_KEY was rejected" in second["error"]
+    assert fixed["answer"] == "Hello"
+    assert len(httpx_mock.get_requests()) == 2
+    assert get_metrics().counter("query_errors", type="InvalidApiKey").value == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_disabled(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_NEGATIVE_CACHE_ENABLED", "false")
+    httpx_mock.add_response(method="POST", url=API_URL, status_code=401, text="Unauthorized", is_reusable=True)
+    
+    # Act
+    await _query_impl("What is ICAET?", "bad-key", "test@example.com")
+    await _query_impl("What is ICAET?", "bad-key", "test@example.com")
+    
+    # Assert
+    assert get_negative_cache() is None
+    assert len(httpx_mock.get_requests()) == 2
@@ -0,0 +1,219 @@
+"""Tests for question popularity tracking and hot question refresh."""
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from icsaet_mcp import tools
+from icsaet_mcp.cache import cache_key, get_response_cache
+from icsaet_mcp.disk_cache import get_disk_cache
+from icsaet_mcp.metrics import get_metrics
+from icsaet_mcp.popularity import CountMinSketch, PopularityTracker, TopK, get_popularity_tracker, refresh_hot
+from icsaet_mcp.tools import _cached_query, _needs_refresh, _refresh_entry
+
+API_URL = "https://icaet-dev.wesleyreisz.com/query"
+
+
+def test_count_min_sketch_never_undercounts():
+    # Arrange
+    sketch = CountMinSketch(width=64, depth=4)
+    rng = random.Random(7)
+    truth = {}
+    
+    # Act
+    for _ in range(2000):
+        key = f"q{int(rng.paretovariate(1.2)) % 300}"
+        truth[key] = truth.get(key, 0) + 1
+        sketch.add(key)
+    
+    # Assert
+    assert all(sketch.estimate(key) >= count for key, count in truth.items())
+    assert sketch.estimate("q1") - truth["q1"] <= sketch.total * 4 / sketch.width
+
+
+def test_count_min_sketch_halve():
+    # Arrange
+    sketch = CountMinSketch()
+    sketch.add("hot", 10)
+    
+    # Act
+    sketch.halve()
+    
+    # Assert
+    assert sketch.estimate("hot") == 5
+    assert sketch.total == 5
+
+
+def test_top_k_keeps_highest_counts():
+    # Arrange
+    top = TopK(k=3)
+    
+    # Act
+    for key, count in [("a", 1), ("b", 5), ("c", 3), ("d", 2), ("a", 6), ("e", 1)]:
+        top.offer(key, count, key.upper())
+    
+    # Assert
+    assert top.items() == [("a", 6, "A"), ("b", 5, "B"), ("c", 3, "C")]
+
+
+def test_top_k_heap_stays_bounded():
+    # Arrange
+    top = TopK(k=2)
+    
+    # Act
+    for count in range(1, 200):
+        top.offer("hot", count, None)
+    
+    # Assert
+    assert len(top) == 1
+    assert len(top._heap) <= 4 * top.k + 16
+
+
+def test_tracker_ranks_frequent_questions():
+    # Arrange
+    tracker = PopularityTracker(k=2)
+    
+    # Act
+    for question, times in [("What is ICAET?", 5), ("Who spoke?", 3), ("Where is it?", 1)]:
+        for _ in range(times):
+            tracker.record(cache_key(question, "test@example.com"), question, "test@example.com")
+    
+    # Assert
+    assert [(question, count) for _, question, _, count in tracker.hottest()] == [("What is ICAET?", 5), ("Who spoke?", 3)]
+    assert [question for _, question, _, _ in tracker.hottest(min_count=4)] == ["What is ICAET?"]
+    assert tracker.stats()["top"][0] == {"question": "What is ICAET?", "count": 5}
+
+
+def test_tracker_decays_counts_every_half_life(clock):
+    # Arrange
+    tracker = PopularityTracker(half_life=60.0, clock=clock)
+    for _ in range(8):
+        tracker.record("key", "What is ICAET?", "test@example.com")
+    
+    # Act
+    clock.now = 130.0
+    hot = tracker.hottest()
+    
+    # Assert
+    assert hot[0][3] == 2
+    assert tracker.sketch.estimate("key") == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_hot_caps_concurrency_and_waits_while_busy():
+    # Arrange
+    active = 0
+    peak = 0
+    busy_checks = 0
+    
+    async def refresh(key, question, user_email):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "changed"
+    
+    def busy():
+        nonlocal busy_checks
+        busy_checks += 1
+        return busy_checks <= 2
+    
+    hot = [(f"k{i}", f"q{i}", "test@example.com", 5) for i in range(4)]
+    
+    # Act
+    outcomes = await refresh_hot(hot, lambda key: key != "k3", refresh, concurrency=2, busy=busy, poll_interval=0.001)
+    
+    # Assert
+    assert outcomes == {"changed": 3}
+    assert peak == 2
+    assert busy_checks > 3
+    assert get_metrics().counter("hot_refreshes", result="changed").value == 3
+
+
+@pytest.mark.asyncio
+async def test_hot_question_refreshed_before_expiry(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_HOT_REFRESH_ENABLED", "true")
+    httpx_mock.add_response(method="POST", url=API_URL, json={"answer": "Old answer", "sources": []})
+    httpx_mock.add_response(method="POST", url=API_URL, json={"answer": "New answer", "sources": []})
+    for _ in range(3):
+        await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    key = cache_key("What is ICAET?", "test@example.com")
+    cache = get_response_cache()
+    hot = get_popularity_tracker().hottest(min_count=3)
+    
+    # Act
+    fresh = _needs_refresh(key, lead=300.0)
+    later = time.monotonic() + 3500
+    cache._clock = lambda: later
+    due = _needs_refresh(key, lead=300.0)
+    outcome = await _refresh_entry(key, "What is ICAET?", "test@example.com")
+    
+    # Assert
+    assert [entry[0] for entry in hot] == [key]
+    assert fresh is False
+    assert due is True
+    assert outcome == "changed"
+    assert cache.peek(key).value["answer"] == "New answer"
+    assert _needs_refresh(key, lead=300.0) is False
+
+
+@pytest.mark.asyncio
+async def test_refresh_entry_fetches_evicted_question(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(method="POST", url=API_URL, json={"answer": "Fetched", "sources": []})
+    key = cache_key("What is ICAET?", "test@example.com")
+    
+    # Act
+    due = _needs_refresh(key, lead=300.0)
+    outcome = await _refresh_entry(key, "What is ICAET?", "test@example.com")
+    
+    # Assert
+    assert due is True
+    assert outcome == "fetched"
+    assert get_response_cache().peek(key).value == {"answer": "Fetched", "sources": []}
+
+
+@pytest.mark.asyncio
+async def test_refresh_entry_bypasses_disk_cache(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(method="POST", url=API_URL, json={"answer": "New", "sources": []})
+    key = cache_key("What is ICAET?", "test@example.com")
+    get_disk_cache().set(key, {"answer": "Old", "sources": []})
+    
+    # Act
+    outcome = await _refresh_entry(key, "What is ICAET?", "test@example.com")
+    
+    # Assert
+    assert outcome == "fetched"
+    assert len(httpx_mock.get_requests()) == 1
+    assert get_response_cache().peek(key).value["answer"] == "New"
+
+
+@pytest.mark.asyncio
+async def test_refresh_entry_skips_key_already_in_flight():
+    # Arrange
+    key = cache_key("What is ICAET?", "test@example.com")
+    pending = asyncio.get_running_loop().create_future()
+    tools._revalidations[key] = pending
+    
+    # Act
+    try:
+        outcome = await _refresh_entry(key, "What is ICAET?", "test@example.com")
+    finally:
+        tools._revalidations.pop(key, None)
+        pending.cancel()
+    
+    # Assert
+    assert outcome == "in_flight"
+
+
+def test_tracker_disabled_by_default():
+    # Act
+    tracker = get_popularity_tracker()
+    
+    # Assert
+    assert tracker is None
@@ -0,0 +1,250 @@
+"""Tests for upstream rate limiting and adaptive concurrency."""
+
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from icsaet_mcp.ratelimit import TokenBucket, UpstreamLimiter, get_upstream_limiter, parse_retry_after
+
+
+def _response(status_code, retry_after=None):
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return httpx.Response(status_code, headers=headers)
+
+
+def test_parse_retry_after_seconds():
+    # Arrange & Act
+    result = parse_retry_after("3")
+    
+    # Assert
+    assert result == 3.0
+
+
+def test_parse_retry_after_http_date():
+    # Arrange
+    now = time.time()
+    value = formatdate(now + 30, usegmt=True)
+    
+    # Act
+    result = parse_retry_after(value, now=now)
+    
+    # Assert
+    assert 28.0 <= result <= 31.0
+
+
+def test_parse_retry_after_invalid():
+    # Arrange & Act
+    result = parse_retry_after("soon")
+    
+    # Assert
+    assert result is None
+
+
+def test_token_bucket_allows_burst_then_spaces_requests(clock):
+    # Arrange
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+    
+    # Act
+    delays = [bucket.reserve() for _ in range(4)]
+    
+    # Assert
+    assert delays == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_token_bucket_refills_over_time(clock):
+    # Arrange
+    bucket = TokenBucket(rate=1.0, burst=1, clock=clock)
+    bucket.reserve()
+    
+    # Act
+    clock.now = 1.0
+    delay = bucket.reserve()
+    
+    # Assert
+    assert delay == 0.0
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_callers_over_concurrency_limit():
+    # Arrange
+    limiter = UpstreamLimiter(rate=0, initial_limit=2, max_limit=2)
+    active = 0
+    peak = 0
+    
+    async def call():
+        nonlocal active, peak
+        async with limiter.slot() as slot:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            slot.observe(_response(200))
+    
+    # Act
+    await asyncio.gather(*(call() for _ in range(6)))
+    
+    # Assert
+    assert peak == 2
+    assert limiter.stats()["acquired"] == 6
+    assert limiter.stats()["queue_depth"] == 0
+    assert limiter.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_additive_increase_on_success():
+    # Arrange
+    limiter = UpstreamLimiter(rate=0, initial_limit=2, max_limit=4)
+    
+    # Act
+    for _ in range(4):
+        async with limiter.slot() as slot:
+            slot.observe(_response(200))
+    
+    # Assert
+    assert limiter.stats()["limit"] == 3
+
+
+@pytest.mark.asyncio
+async def test_limiter_multiplicative_decrease_on_429():
+    # Arrange
+    limiter = UpstreamLimiter(rate=0, initial_limit=8)
+    
+    # Act
+    async with limiter.slot() as slot:
+        slot.observe(_response(429))
+    
+    # Assert
+    assert limiter.stats()["limit"] == 4
+    assert limiter.stats()["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_decreases_once_per_round_trip(clock):
+    # Arrange
+    limiter = UpstreamLimiter(rate=0, initial_limit=8, clock=clock)
+    first = await limiter.acquire()
+    second = await limiter.acquire()
+    clock.now = 1.0
+    
+    # Act
+    first.status_code = 503
+    limiter.release(first)
+    second.status_code = 503
+    limiter.release(second)
+    
+    # Assert
+    assert limiter.stats()["limit"] == 4
+    assert limiter.stats()["throttled"] == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_respects_retry_after():
+    # Arrange
+    limiter = UpstreamLimiter(rate=0, initial_limit=4)
+    async with limiter.slot() as slot:
+        slot.observe(_response(429, retry_after="0.05"))
+    
+    # Act
+    start = time.monotonic()
+    async with limiter.slot() as slot:
+        slot.observe(_response(200))
+    elapsed = time.monotonic() - start
+    
+    # Assert
+    assert elapsed >= 0.04
+    assert limiter.stats()["max_wait_seconds"] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_limiter_retry_after_pause_holds_no_slot():
+    # Arrange
+    limiter = UpstreamLimiter(rate=0, initial_limit=4)
+    async with limiter.slot() as slot:
+        slot.observe(_response(429, retry_after="0.05"))
+    
+    # Act
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    in_flight_during_pause = limiter.stats()["in_flight"]
+    limiter.release(await waiter)
+    
+    # Assert
+    assert in_flight_during_pause == 0
+    assert limiter.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_requeues_woken_waiter_at_front():
+    # Arrange
+    limiter = UpstreamLimiter(rate=0, initial_limit=2, max_limit=4)
+    first = await limiter.acquire()
+    second = await limiter.acquire()
+    order = []
+    
+    async def call(name):
+        async with limiter.slot() as slot:
+            order.append(name)
+            await asyncio.sleep(0)
+            slot.observe(_response(200))
+    
+    tasks = []
+    for name in ("w1", "w2", "w3"):
+        tasks.append(asyncio.create_task(call(name)))
+        await asyncio.sleep(0)
+    
+    # Act
+    first.status_code = 200
+    limiter.release(first)
+    second.status_code = 429
+    limiter.release(second)
+    await asyncio.gather(*tasks)
+    
+    # Assert
+    assert order == ["w1", "w2", "w3"]
+    assert limiter.stats()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_leaves_queue():
+    # Arrange
+    limiter = UpstreamLimiter(rate=0, initial_limit=1, max_limit=1)
+    held = await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    
+    # Act
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release(held)
+    
+    # Assert
+    assert limiter.stats()["queue_depth"] == 0
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_get_upstream_limiter_disabled(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_RATE_LIMIT_ENABLED", "false")
+    
+    # Act
+    limiter = get_upstream_limiter()
+    
+    # Assert
+    assert limiter is None
+
+
+def test_get_upstream_limiter_reads_environment(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CONCURRENCY_INITIAL", "3")
+    monkeypatch.setenv("ICAET_CONCURRENCY_MAX", "6")
+    
+    # Act
+    limiter = get_upstream_limiter()
+    
+    # Assert
+    assert limiter.stats()["limit"] == 3
+    assert limiter.max_limit == 6
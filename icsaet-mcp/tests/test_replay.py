@@ -0,0 +1,189 @@
+"""Tests for record/replay of upstream traffic."""
+
+import gzip
+import json
+
+import pytest
+
+from icsaet_mcp.replay import EXACT, RECORD, REPLAY, ReplayArchive, get_replay_archive
+from icsaet_mcp.tools import _query_impl
+
+
+def test_record_appends_compressed_lines(tmp_path):
+    # Arrange
+    path = tmp_path / "replay" / "archive.jsonl.gz"
+    archive = ReplayArchive(path, RECORD)
+    
+    # Act
+    archive.record("What is ICAET?", "a@example.com", 200, '{"answer": "A"}', 0.25)
+    archive.record("What is TDD?", "a@example.com", 503, "Service unavailable", 0.5)
+    
+    # Assert
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry["question"] for entry in entries] == ["What is ICAET?", "What is TDD?"]
+    assert entries[0]["latency_ms"] == 250.0
+    assert entries[1]["status_code"] == 503
+    assert "a@example.com" not in json.dumps(entries)
+    assert archive.stats()["recorded"] == 2
+
+
+def test_replay_matches_normalized_question(tmp_path):
+    # Arrange
+    path = tmp_path / "archive.jsonl.gz"
+    ReplayArchive(path, RECORD).record("What is ICAET?", "a@example.com", 200, '{"answer": "A"}', 0.1)
+    archive = ReplayArchive(path, REPLAY)
+    
+    # Act
+    entry = archive.lookup("  what is icaet ", "a@example.com")
+    
+    # Assert
+    assert entry["body"] == '{"answer": "A"}'
+    assert archive.stats()["replayed"] == 1
+
+
+def test_replay_exact_match_requires_identical_text(tmp_path):
+    # Arrange
+    path = tmp_path / "archive.jsonl.gz"
+    ReplayArchive(path, RECORD).record("What is ICAET?", "a@example.com", 200, '{"answer": "A"}', 0.1)
+    archive = ReplayArchive(path, REPLAY, match=EXACT)
+    
+    # Act
+    normalized = archive.lookup("what is icaet", "a@example.com")
+    exact = archive.lookup("What is ICAET?", "a@example.com")
+    
+    # Assert
+    assert normalized is None
+    assert exact is not None
+    assert archive.stats()["misses"] == 1
+
+
+def test_replay_latest_recording_wins(tmp_path):
+    # Arrange
+    path = tmp_path / "archive.jsonl.gz"
+    recorder = ReplayArchive(path, RECORD)
+    recorder.record("What is ICAET?", "a@example.com", 200, '{"answer": "Old"}', 0.1)
+    recorder.record("What is ICAET?", "a@example.com", 200, '{"answer": "New"}', 0.1)
+    
+    # Act
+    archive = ReplayArchive(path, REPLAY)
+    
+    # Assert
+    assert len(archive) == 1
+    assert archive.lookup("What is ICAET?", "a@example.com")["body"] == '{"answer": "New"}'
+
+
+def test_replay_skips_truncated_tail(tmp_path):
+    # Arrange
+    path = tmp_path / "archive.jsonl.gz"
+    ReplayArchive(path, RECORD).record("What is ICAET?", "a@example.com", 200, '{"answer": "A"}', 0.1)
+    with open(path, "ab") as f:
+        f.write(gzip.compress(b'{"key": "x"}\n')[:10])
+    
+    # Act
+    archive = ReplayArchive(path, REPLAY)
+    
+    # Assert
+    assert len(archive) == 1
+
+
+def test_replay_missing_archive_is_empty(tmp_path):
+    # Act
+    archive = ReplayArchive(tmp_path / "missing.jsonl.gz", REPLAY)
+    
+    # Assert
+    assert len(archive) == 0
+
+
+@pytest.mark.asyncio
+async def test_replay_sleeps_recorded_latency(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "archive.jsonl.gz"
+    ReplayArchive(path, RECORD).record("What is ICAET?", "a@example.com", 200, '{"answer": "A"}', 0.2)
+    archive = ReplayArchive(path, REPLAY, replay_latency=True)
+    slept = []
+    
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+    
+    monkeypatch.setattr("icsaet_mcp.replay.asyncio.sleep", fake_sleep)
+    
+    # Act
+    response = await archive.replay("What is ICAET?", "a@example.com", "http://localhost/query")
+    
+    # Assert
+    assert slept == [0.2]
+    assert response.json() == {"answer": "A"}
+
+
+def test_invalid_mode_rejected(tmp_path):
+    # Act / Assert
+    with pytest.raises(ValueError):
+        ReplayArchive(tmp_path / "archive.jsonl.gz", "rewind")
+
+
+def test_get_replay_archive_off_by_default(monkeypatch):
+    # Arrange
+    monkeypatch.delenv("ICAET_REPLAY_MODE", raising=False)
+    
+    # Act
+    archive = get_replay_archive()
+    
+    # Assert
+    assert archive is None
+
+
+@pytest.mark.asyncio
+async def test_recorded_queries_replay_offline(httpx_mock, tmp_path, monkeypatch):
+    # Arrange
+    from icsaet_mcp.replay import reset_replay_archive
+    
+    monkeypatch.setenv("ICAET_DISK_CACHE_ENABLED", "false")
+    monkeypatch.setenv("ICAET_REPLAY_PATH", str(tmp_path / "archive.jsonl.gz"))
+    monkeypatch.setenv("ICAET_REPLAY_MODE", "record")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Recorded answer"},
+        status_code=200
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        text="Not found",
+        status_code=404
+    )
+    live_ok = await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    live_error = await _query_impl("What is XYZ?", "test-api-key", "test@example.com")
+    reset_replay_archive()
+    monkeypatch.setenv("ICAET_REPLAY_MODE", "replay")
+    
+    # Act
+    replayed_ok = await _query_impl("what is icaet", "test-api-key", "test@example.com")
+    replayed_error = await _query_impl("What is XYZ?", "test-api-key", "test@example.com")
+    missing = await _query_impl("Never asked", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert replayed_ok == live_ok == {"answer": "Recorded answer"}
+    assert replayed_error == live_error
+    assert "No recorded response" in missing["error"]
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_ignores_disk_cache(tmp_path, monkeypatch):
+    # Arrange
+    from icsaet_mcp.cache import cache_key
+    from icsaet_mcp.disk_cache import get_disk_cache
+    
+    path = tmp_path / "archive.jsonl.gz"
+    ReplayArchive(path, RECORD).record("What is ICAET?", "test@example.com", 200, '{"answer": "Archived"}', 0.1)
+    get_disk_cache().set(cache_key("What is ICAET?", "test@example.com"), {"answer": "From disk"})
+    monkeypatch.setenv("ICAET_REPLAY_PATH", str(path))
+    monkeypatch.setenv("ICAET_REPLAY_MODE", "replay")
+    
+    # Act
+    result = await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert result == {"answer": "Archived"}
@@ -0,0 +1,140 @@
+"""Tests for the retry policy."""
+
+import httpx
+import pytest
+
+from icsaet_mcp.retry import RetryPolicy, call_with_retry, get_retry_policy
+
+
+def _attempts(*outcomes):
+    calls = []
+    
+    async def attempt(remaining):
+        calls.append(remaining)
+        outcome = outcomes[len(calls) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+    
+    return attempt, calls
+
+
+def test_backoff_is_capped_exponential_with_full_jitter():
+    # Arrange
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, rng=lambda: 1.0)
+    
+    # Act
+    delays = [policy.backoff(attempt) for attempt in range(1, 6)]
+    
+    # Assert
+    assert delays == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_backoff_jitter_scales_delay():
+    # Arrange
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, rng=lambda: 0.25)
+    
+    # Act
+    delay = policy.backoff(3)
+    
+    # Assert
+    assert delay == 1.0
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_retries_gateway_errors():
+    # Arrange
+    attempt, calls = _attempts(502, 504, 200)
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    
+    # Act
+    response = await call_with_retry(attempt, policy)
+    
+    # Assert
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_does_not_retry_client_errors():
+    # Arrange
+    attempt, calls = _attempts(400)
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    
+    # Act
+    response = await call_with_retry(attempt, policy)
+    
+    # Assert
+    assert response.status_code == 400
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_does_not_retry_500():
+    # Arrange
+    attempt, calls = _attempts(500)
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    
+    # Act
+    response = await call_with_retry(attempt, policy)
+    
+    # Assert
+    assert response.status_code == 500
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_retries_read_timeout_then_raises():
+    # Arrange
+    attempt, calls = _attempts(httpx.ReadTimeout("slow"), httpx.ReadTimeout("slow"))
+    policy = RetryPolicy(max_attempts=2, base_delay=0)
+    
+    # Act & Assert
+    with pytest.raises(httpx.ReadTimeout):
+        await call_with_retry(attempt, policy)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_does_not_retry_write_errors():
+    # Arrange
+    attempt, calls = _attempts(httpx.WriteError("broken pipe"))
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    
+    # Act & Assert
+    with pytest.raises(httpx.WriteError):
+        await call_with_retry(attempt, policy)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_stops_at_deadline(clock):
+    # Arrange
+    calls = []
+    
+    async def attempt(remaining):
+        calls.append(remaining)
+        clock.now += 4.0
+        return httpx.Response(503)
+    
+    policy = RetryPolicy(max_attempts=10, base_delay=2.0, max_delay=2.0, deadline=5.0, rng=lambda: 1.0)
+    
+    # Act
+    response = await call_with_retry(attempt, policy, clock=clock)
+    
+    # Assert
+    assert response.status_code == 503
+    assert calls == [5.0]
+
+
+def test_get_retry_policy_reads_environment(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_RETRY_MAX_ATTEMPTS", "5")
+    monkeypatch.setenv("ICAET_RETRY_DEADLINE", "10")
+    
+    # Act
+    policy = get_retry_policy()
+    
+    # Assert
+    assert policy.max_attempts == 5
+    assert policy.deadline == 10.0
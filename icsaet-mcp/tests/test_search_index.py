@@ -0,0 +1,276 @@
+"""Tests for the local BM25 search index."""
+
+import gzip
+import threading
+
+import pytest
+
+from icsaet_mcp.search_index import (
+    PersistentSearchIndex,
+    SearchIndex,
+    answer_text,
+    close_search_index,
+    get_search_index,
+    open_search_index,
+    read_documents,
+    source_names,
+    tokenize,
+)
+from icsaet_mcp.tools import _cached_query, _search_cached_impl
+
+
+def _index() -> SearchIndex:
+    index = SearchIndex()
+    index.add("1", "What did Leslie Miley talk about?", "Leslie Miley talked about engineering culture and inclusion.", ["miley.txt"])
+    index.add("2", "What was said about pair programming?", "Pair programming improves code quality and knowledge sharing.", ["pairing.txt"])
+    index.add("3", "What metrics measure team velocity?", "Teams track cycle time, throughput and velocity.", ["metrics.txt"])
+    return index
+
+
+def test_tokenize_drops_stopwords_and_short_tokens():
+    # Act
+    tokens = tokenize("What is the ROI of TDD, in 2 words?")
+    
+    # Assert
+    assert tokens == ["roi", "tdd", "words"]
+
+
+def test_search_ranks_matching_document_first():
+    # Arrange
+    index = _index()
+    
+    # Act
+    results = index.search("pair programming quality")
+    
+    # Assert
+    assert results[0]["question"] == "What was said about pair programming?"
+    assert results[0]["sources"] == ["pairing.txt"]
+    assert len(results) == 1
+
+
+def test_search_matches_sources():
+    # Arrange
+    index = _index()
+    
+    # Act
+    results = index.search("metrics")
+    
+    # Assert
+    assert results[0]["question"] == "What metrics measure team velocity?"
+
+
+def test_rare_terms_weigh_more():
+    # Arrange
+    index = SearchIndex()
+    index.add("a", "q1", "culture culture agile", [])
+    index.add("b", "q2", "kanban agile", [])
+    index.add("c", "q3", "agile agile", [])
+    
+    # Act
+    results = index.search("agile kanban")
+    
+    # Assert
+    assert results[0]["question"] == "q2"
+
+
+def test_search_without_known_terms_is_empty():
+    # Arrange
+    index = _index()
+    
+    # Act
+    results = index.search("what is it")
+    
+    # Assert
+    assert results == []
+
+
+def test_readding_document_replaces_it():
+    # Arrange
+    index = _index()
+    
+    # Act
+    index.add("2", "What was said about mob programming?", "Mob programming spreads knowledge.", [])
+    
+    # Assert
+    assert len(index) == 3
+    assert index.search("pair") == []
+    assert index.search("mob")[0]["question"] == "What was said about mob programming?"
+
+
+def test_index_is_bounded():
+    # Arrange
+    index = SearchIndex(max_documents=2)
+    
+    # Act
+    for doc_id, word in enumerate(["alpha", "beta", "gamma"]):
+        index.add(str(doc_id), word, word, [])
+    
+    # Assert
+    assert len(index) == 2
+    assert index.search("alpha") == []
+    assert index.stats()["evictions"] == 1
+
+
+def test_remove_clears_postings():
+    # Arrange
+    index = _index()
+    
+    # Act
+    for doc_id in ("1", "2", "3"):
+        index.remove(doc_id)
+    
+    # Assert
+    assert index.stats()["terms"] == 0
+    assert index.search("velocity") == []
+
+
+def test_snippet_centers_on_query_term():
+    # Arrange
+    index = SearchIndex()
+    index.add("1", "q", "filler " * 100 + "kanban boards limit work in progress", [])
+    
+    # Act
+    snippet = index.search("kanban")[0]["snippet"]
+    
+    # Assert
+    assert snippet.startswith("...")
+    assert "kanban" in snippet
+
+
+def test_save_and_load_round_trip(tmp_path):
+    # Arrange
+    path = tmp_path / "index" / "answers.json.gz"
+    _index().save(path)
+    
+    # Act
+    loaded = SearchIndex()
+    count = loaded.load(path)
+    
+    # Assert
+    assert count == 3
+    assert loaded.search("velocity")[0]["question"] == "What metrics measure team velocity?"
+    assert gzip.decompress(path.read_bytes()).startswith(b'{"version":1')
+
+
+def test_persistent_index_saves_every_n_additions(tmp_path):
+    # Arrange
+    path = tmp_path / "answers.json.gz"
+    index = PersistentSearchIndex(path, save_every=2)
+    
+    # Act
+    index.add_result("1", "What is ICAET?", {"answer": "A conference", "sources": ["about.txt"]})
+    saved_after_one = path.exists()
+    index.add_result("2", "What is TDD?", {"answer": "Test-driven development"})
+    
+    # Assert
+    assert saved_after_one is False
+    assert len(PersistentSearchIndex(path)) == 2
+
+
+def test_persistent_index_merges_documents_saved_by_another_process(tmp_path):
+    # Arrange
+    path = tmp_path / "answers.json.gz"
+    first = PersistentSearchIndex(path)
+    second = PersistentSearchIndex(path)
+    first.add_result("1", "What is ICAET?", {"answer": "A conference"})
+    first.flush()
+    
+    # Act
+    second.add_result("2", "What is TDD?", {"answer": "Test-driven development"})
+    second.flush()
+    
+    # Assert
+    assert len(second) == 2
+    assert {row[0] for row in read_documents(path)} == {"1", "2"}
+
+
+def test_persistent_index_starts_empty_when_file_corrupt(tmp_path):
+    # Arrange
+    path = tmp_path / "answers.json.gz"
+    path.write_bytes(b"not gzip")
+    
+    # Act
+    index = PersistentSearchIndex(path)
+    
+    # Assert
+    assert len(index) == 0
+
+
+def test_answer_text_and_sources_from_result():
+    # Act
+    text = answer_text({"data": "x", "sources": [{"title": "t"}]})
+    sources = source_names({"answer": "a", "sources": ["s", {"title": "t"}]})
+    
+    # Assert
+    assert text == '{"data": "x"}'
+    assert sources == ["s", '{"title": "t"}']
+
+
+def test_close_search_index_flushes_unsaved_documents(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "answers.json.gz"
+    monkeypatch.setenv("ICAET_SEARCH_INDEX_PATH", str(path))
+    get_search_index().add_result("1", "What is ICAET?", {"answer": "A conference"})
+    
+    # Act
+    close_search_index()
+    
+    # Assert
+    assert len(get_search_index()) == 1
+
+
+@pytest.mark.asyncio
+async def test_open_search_index_loads_file_off_the_event_loop(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "answers.json.gz"
+    monkeypatch.setenv("ICAET_SEARCH_INDEX_PATH", str(path))
+    get_search_index().add_result("1", "What is ICAET?", {"answer": "A conference"})
+    close_search_index()
+    loaded_on = []
+    load = PersistentSearchIndex.load
+    
+    def recording_load(self, index_path):
+        loaded_on.append(threading.current_thread())
+        return load(self, index_path)
+    
+    monkeypatch.setattr(PersistentSearchIndex, "load", recording_load)
+    
+    # Act
+    index = await open_search_index()
+    
+    # Assert
+    assert len(index) == 1
+    assert loaded_on and loaded_on[0] is not threading.main_thread()
+    assert await open_search_index() is index
+
+
+@pytest.mark.asyncio
+async def test_search_cached_finds_previously_fetched_answer(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Pair programming improves code quality.", "sources": ["pairing.txt"]},
+        status_code=200
+    )
+    await _cached_query("What was said about pair programming?", "test-api-key", "test@example.com")
+    
+    # Act
+    result = await _search_cached_impl("code quality")
+    
+    # Assert
+    assert result["documents"] == 1
+    assert result["results"][0]["question"] == "What was said about pair programming?"
+    assert result["results"][0]["sources"] == ["pairing.txt"]
+
+
+@pytest.mark.asyncio
+async def test_search_cached_disabled(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_SEARCH_INDEX_ENABLED", "false")
+    
+    # Act
+    result = await _search_cached_impl("anything")
+    
+    # Assert
+    assert "error" in result
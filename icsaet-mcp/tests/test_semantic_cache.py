@@ -0,0 +1,222 @@
+"""Tests for the semantic near-duplicate cache."""
+
+import pytest
+
+from icsaet_mcp.semantic_cache import (
+    SemanticCache,
+    content_words,
+    get_semantic_cache,
+    jaccard,
+    question_numbers,
+    question_type,
+    shingles
+)
+from icsaet_mcp.tools import _cached_query
+
+
+def test_content_words_drop_question_words_and_possessives():
+    # Act
+    first = content_words("What did Leslie Miley talk about?")
+    second = content_words("Summarize Leslie Miley's talk")
+    
+    # Assert
+    assert first == ["leslie", "miley", "talk"]
+    assert second == ["leslie", "miley", "talk"]
+
+
+def test_question_type_takes_the_first_interrogative():
+    # Act / Assert
+    assert question_type("When did Leslie Miley talk?") == "when"
+    assert question_type("Whose talk covered testing?") == "who"
+    assert question_type("What did Leslie Miley say about why teams fail?") == "what"
+    assert question_type("Summarize Leslie Miley's talk") == "what"
+
+
+@pytest.mark.parametrize("question", ["Why did Leslie Miley talk?", "Where did Leslie Miley talk?"])
+def test_different_question_type_misses(question):
+    # Arrange
+    cache = SemanticCache()
+    cache.set("When did Leslie Miley talk?", "a@example.com", {"answer": "Tuesday"})
+    
+    # Act
+    match = cache.get(question, "a@example.com")
+    
+    # Assert
+    assert match is None
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("What talks were given about testing in 2023?", "What talks were given about testing in 2024?"),
+    ("What were the top 3 themes across the conference keynotes?", "What were the top 5 themes across the conference keynotes?"),
+    ("What did speakers say about continuous delivery on day 1?", "What did speakers say about continuous delivery on day 2?"),
+])
+def test_questions_with_different_numbers_miss(cached, asked):
+    # Arrange
+    assert jaccard(shingles(cached), shingles(asked)) >= 0.8
+    cache = SemanticCache()
+    cache.set(cached, "a@example.com", {"answer": "Cached"})
+    
+    # Act
+    match = cache.get(asked, "a@example.com")
+    
+    # Assert
+    assert match is None
+
+
+def test_question_numbers_are_sorted_and_distinct():
+    # Act / Assert
+    assert question_numbers("Compare 2024 and 2023 talks from 2024") == "2023 2024"
+    assert question_numbers("What did Leslie Miley talk about?") == ""
+
+
+def test_different_topics_are_not_similar():
+    # Act
+    similarity = jaccard(
+        shingles("What did speakers say about pair programming?"),
+        shingles("What did speakers say about mob programming?")
+    )
+    
+    # Assert
+    assert similarity < 0.8
+
+
+def test_paraphrase_served_from_cache():
+    # Arrange
+    cache = SemanticCache()
+    cache.set("What did Leslie Miley talk about?", "a@example.com", {"answer": "Talk"})
+    
+    # Act
+    match = cache.get("Summarize Leslie Miley's talk", "a@example.com")
+    
+    # Assert
+    assert match == ({"answer": "Talk"}, 1.0)
+    assert cache.stats()["hits"] == 1
+
+
+def test_dissimilar_question_misses():
+    # Arrange
+    cache = SemanticCache()
+    cache.set("What did speakers say about pair programming?", "a@example.com", {"answer": "Pair"})
+    
+    # Act
+    match = cache.get("What did speakers say about mob programming?", "a@example.com")
+    
+    # Assert
+    assert match is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_threshold_is_configurable():
+    # Arrange
+    cache = SemanticCache(threshold=0.5)
+    cache.set("What did speakers say about pair programming?", "a@example.com", {"answer": "Pair"})
+    
+    # Act
+    match = cache.get("What did speakers say about mob programming?", "a@example.com")
+    
+    # Assert
+    assert match is not None
+    assert 0.5 <= match[1] < 0.8
+
+
+def test_entries_scoped_to_user():
+    # Arrange
+    cache = SemanticCache()
+    cache.set("What did Leslie Miley talk about?", "a@example.com", {"answer": "Talk"})
+    
+    # Act
+    match = cache.get("What did Leslie Miley talk about?", "b@example.com")
+    
+    # Assert
+    assert match is None
+
+
+def test_index_is_bounded():
+    # Arrange
+    cache = SemanticCache(max_entries=2)
+    
+    # Act
+    for topic in ("pair programming", "technical debt", "code review"):
+        cache.set(f"What was said about {topic}?", "a@example.com", {"answer": topic})
+    
+    # Assert
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("What was said about pair programming?", "a@example.com") is None
+    assert cache.get("Tell me about code review", "a@example.com")[0] == {"answer": "code review"}
+
+
+def test_evicted_entries_leave_no_buckets():
+    # Arrange
+    cache = SemanticCache(max_entries=1)
+    
+    # Act
+    cache.set("What was said about pair programming?", "a@example.com", {"answer": "pair"})
+    cache.set("What was said about technical debt?", "a@example.com", {"answer": "debt"})
+    
+    # Assert
+    assert cache.stats()["buckets"] == cache.bands
+
+
+def test_expired_entries_miss(clock):
+    # Arrange
+    cache = SemanticCache(ttl=10.0, clock=clock)
+    cache.set("What did Leslie Miley talk about?", "a@example.com", {"answer": "Talk"})
+    clock.now = 11.0
+    
+    # Act
+    match = cache.get("Summarize Leslie Miley's talk", "a@example.com")
+    
+    # Assert
+    assert match is None
+    assert len(cache) == 0
+
+
+def test_question_without_content_words_is_not_indexed():
+    # Arrange
+    cache = SemanticCache()
+    
+    # Act
+    stored = cache.set("What is it?", "a@example.com", {"answer": "?"})
+    
+    # Assert
+    assert stored is False
+    assert cache.get("What is it?", "a@example.com") is None
+
+
+def test_invalid_band_configuration_rejected():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        SemanticCache(num_perm=64, bands=10)
+
+
+def test_get_semantic_cache_disabled_by_default(monkeypatch):
+    # Arrange
+    monkeypatch.delenv("ICAET_SEMANTIC_CACHE_ENABLED", raising=False)
+    
+    # Act
+    cache = get_semantic_cache()
+    
+    # Assert
+    assert cache is None
+
+
+@pytest.mark.asyncio
+async def test_cached_query_reuses_answer_for_paraphrase(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_SEMANTIC_CACHE_ENABLED", "true")
+    monkeypatch.setenv("ICAET_DISK_CACHE_ENABLED", "false")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Leslie talked about culture"},
+        status_code=200
+    )
+    
+    # Act
+    first = await _cached_query("What did Leslie Miley talk about?", "test-api-key", "test@example.com")
+    second = await _cached_query("Summarize Leslie Miley's talk", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert first == second
+    assert len(httpx_mock.get_requests()) == 1
@@ -0,0 +1,152 @@
+"""Tests for single-flight coalescing."""
+
+import asyncio
+
+import pytest
+
+from icsaet_mcp.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_singleflight_coalesces_concurrent_calls():
+    # Arrange
+    flights = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+    
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"answer": "shared"}
+    
+    # Act
+    tasks = [asyncio.create_task(flights.do("key", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+    
+    # Assert
+    assert calls == 1
+    assert all(result == {"answer": "shared"} for result in results)
+    assert flights.stats()["leaders"] == 1
+    assert flights.stats()["coalesced"] == 4
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_different_keys_run_separately():
+    # Arrange
+    flights = SingleFlight()
+    calls = []
+    
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key
+    
+    # Act
+    results = await asyncio.gather(
+        flights.do("a", lambda: fetch("a")),
+        flights.do("b", lambda: fetch("b"))
+    )
+    
+    # Assert
+    assert results == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+    assert flights.stats()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_failure_fans_out_to_all_waiters():
+    # Arrange
+    flights = SingleFlight()
+    release = asyncio.Event()
+    
+    async def fetch():
+        await release.wait()
+        raise RuntimeError("upstream exploded")
+    
+    # Act
+    tasks = [asyncio.create_task(flights.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Assert
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_cancelled_waiter_does_not_cancel_others():
+    # Arrange
+    flights = SingleFlight()
+    release = asyncio.Event()
+    
+    async def fetch():
+        await release.wait()
+        return "done"
+    
+    leader = asyncio.create_task(flights.do("key", fetch))
+    follower = asyncio.create_task(flights.do("key", fetch))
+    await asyncio.sleep(0)
+    
+    # Act
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    result = await follower
+    
+    # Assert
+    assert result == "done"
+    assert leader.cancelled()
+    assert flights.stats()["cancelled_waiters"] == 1
+    assert flights.stats()["abandoned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_cancels_call_when_all_waiters_leave():
+    # Arrange
+    flights = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+    
+    async def fetch():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    waiter = asyncio.create_task(flights.do("key", fetch))
+    await started.wait()
+    
+    # Act
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    await asyncio.sleep(0)
+    
+    # Assert
+    assert flights.stats()["abandoned"] == 1
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_new_call_after_completion():
+    # Arrange
+    flights = SingleFlight()
+    calls = 0
+    
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+    
+    # Act
+    first = await flights.do("key", fetch)
+    second = await flights.do("key", fetch)
+    
+    # Assert
+    assert (first, second) == (1, 2)
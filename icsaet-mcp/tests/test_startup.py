@@ -0,0 +1,147 @@
+"""Startup-time regression tests.
+
+Cursor starts a fresh server process per window, so anything imported or
+initialized before the MCP handshake is paid on every launch. These tests
+run the server in a subprocess and fail if startup grows.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Modules that must only be loaded on the first tool call, never at startup.
+DEFERRED_MODULES = ("httpx", "httpcore", "h2")
+
+# Packages whose import cost belongs to fastmcp rather than to this server.
+FRAMEWORK_PACKAGES = ("fastmcp", "mcp", "mcp_types", "pydantic", "pydantic_core", "griffe")
+
+# Import time the server may add on top of fastmcp, in milliseconds.
+OWN_IMPORT_BUDGET_MS = 50
+
+# Time to first handshake allowed relative to a bare FastMCP server.
+HANDSHAKE_RATIO = 1.5
+HANDSHAKE_SLACK_SECONDS = 0.5
+
+
+def _env(tmp_path: Path) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "ICAET_API_KEY": "test-api-key-12345",
+        "USER_EMAIL": "test@example.com",
+        "HOME": str(tmp_path),
+        "USERPROFILE": str(tmp_path),
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    })
+    return env
+
+
+def _import_tree(tmp_path: Path) -> list[tuple[str, int, list]]:
+    """Run -X importtime on the server entry point and return the import tree.
+    
+    Each node is (module, cumulative_us, children). importtime prints
+    children before their parent, one indentation level deeper.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import icsaet_mcp.__main__"],
+        env=_env(tmp_path),
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    pending: list[tuple[int, tuple[str, int, list]]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        children = []
+        while pending and pending[-1][0] > depth:
+            children.insert(0, pending.pop()[1])
+        pending.append((depth, (name.strip(), int(cumulative), children)))
+    return [node for _, node in pending]
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        yield from _walk(node[2])
+
+
+def _own_cost_us(node) -> int:
+    """Cumulative import time of node minus any framework subtrees below it."""
+    name, cumulative, children = node
+    if name.split(".")[0] in FRAMEWORK_PACKAGES:
+        return 0
+    return cumulative - sum(child[1] - _own_cost_us(child) for child in children)
+
+
+def _handshake_seconds(command: list[str], env: dict) -> float:
+    """Start an MCP server over stdio and time the initialize round trip."""
+    request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": "startup-test", "version": "1.0"}
+        }
+    }
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        process.stdin.write(json.dumps(request) + "\n")
+        process.stdin.flush()
+        response = json.loads(process.stdout.readline())
+        elapsed = time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait(timeout=10)
+    assert response["id"] == 1 and "result" in response
+    return elapsed
+
+
+def test_startup_defers_heavy_modules(tmp_path):
+    # Act
+    imported = {node[0] for node in _walk(_import_tree(tmp_path))}
+    
+    # Assert
+    assert "icsaet_mcp.tools" in imported
+    assert not imported.intersection(DEFERRED_MODULES)
+
+
+def test_startup_own_import_time_within_budget(tmp_path):
+    # Act
+    costs = []
+    for _ in range(3):
+        roots = [node for node in _import_tree(tmp_path) if node[0] == "icsaet_mcp.__main__"]
+        costs.append(_own_cost_us(roots[0]) / 1000)
+    
+    # Assert
+    assert min(costs) <= OWN_IMPORT_BUDGET_MS, f"own import time {min(costs):.1f} ms"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stdio handshake timing is unreliable on Windows")
+def test_time_to_first_handshake_within_budget(tmp_path):
+    # Arrange
+    env = _env(tmp_path)
+    bare = [sys.executable, "-c", "from fastmcp import FastMCP; FastMCP('bare').run()"]
+    server = [sys.executable, "-m", "icsaet_mcp"]
+    
+    # Act
+    baseline = min(_handshake_seconds(bare, env) for _ in range(2))
+    elapsed = min(_handshake_seconds(server, env) for _ in range(2))
+    
+    # Assert
+    budget = baseline * HANDSHAKE_RATIO + HANDSHAKE_SLACK_SECONDS
+    assert elapsed <= budget, f"handshake took {elapsed:.2f}s, budget {budget:.2f}s (bare fastmcp {baseline:.2f}s)"
@@ -0,0 +1,208 @@
+"""Tests for structured logging."""
+
+import json
+import logging
+import queue
+
+import pytest
+
+from icsaet_mcp.logging_config import StructuredQueueHandler
+from icsaet_mcp.structured_logging import (
+    CorrelationFilter,
+    JsonFormatter,
+    StructuredMessage,
+    TextFormatter,
+    correlation_id,
+    correlation_scope,
+    get_logger,
+)
+
+
+def _record(msg, level=logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("icsaet_mcp.test", level, __file__, 1, msg, None, None)
+
+
+def test_structured_message_renders_fields():
+    # Arrange
+    message = StructuredMessage("API request failed", {"status_code": 500, "error": "HTTPStatusError"})
+    
+    # Act
+    rendered = str(message)
+    
+    # Assert
+    assert rendered == "API request failed [status_code=500, error=HTTPStatusError]"
+
+
+def test_structured_message_without_fields():
+    # Act / Assert
+    assert str(StructuredMessage("Disk cache hit", {})) == "Disk cache hit"
+
+
+def test_lazy_field_skipped_when_level_disabled(caplog):
+    # Arrange
+    calls = 0
+    
+    def expensive():
+        nonlocal calls
+        calls += 1
+        return "value"
+    
+    logger = get_logger("icsaet_mcp.test_lazy")
+    caplog.set_level(logging.INFO, logger="icsaet_mcp.test_lazy")
+    
+    # Act
+    logger.debug("Query question", question=expensive)
+    
+    # Assert
+    assert calls == 0
+    assert caplog.records == []
+
+
+def test_lazy_field_evaluated_once_when_enabled(caplog):
+    # Arrange
+    calls = 0
+    
+    def expensive():
+        nonlocal calls
+        calls += 1
+        return "value"
+    
+    logger = get_logger("icsaet_mcp.test_lazy")
+    caplog.set_level(logging.DEBUG, logger="icsaet_mcp.test_lazy")
+    
+    # Act
+    logger.debug("Query question", question=expensive)
+    text = caplog.records[0].getMessage()
+    caplog.records[0].getMessage()
+    
+    # Assert
+    assert text == "Query question [question=value]"
+    assert calls == 1
+
+
+def test_fields_may_be_named_message(caplog):
+    # Arrange
+    logger = get_logger("icsaet_mcp.test_fields")
+    caplog.set_level(logging.ERROR, logger="icsaet_mcp.test_fields")
+    
+    # Act
+    logger.error("API request failed", error="RequestError", message="boom")
+    
+    # Assert
+    assert caplog.records[0].getMessage() == "API request failed [error=RequestError, message=boom]"
+    assert caplog.records[0].funcName == "test_fields_may_be_named_message"
+
+
+def test_correlation_scope_sets_and_restores():
+    # Act
+    with correlation_scope("outer") as outer:
+        with correlation_scope() as inner:
+            inside = correlation_id.get()
+        after_inner = correlation_id.get()
+    after = correlation_id.get()
+    
+    # Assert
+    assert outer == "outer"
+    assert inside == inner and len(inner) == 12
+    assert after_inner == "outer"
+    assert after is None
+
+
+def test_text_formatter_appends_request_id():
+    # Arrange
+    formatter = TextFormatter("%(levelname)s %(message)s")
+    structured = _record(StructuredMessage("Cache hit", {"question_length": 12}))
+    plain = _record("Server ready")
+    
+    # Act
+    with correlation_scope("abc123"):
+        CorrelationFilter().filter(structured)
+        CorrelationFilter().filter(plain)
+    
+    # Assert
+    assert formatter.format(structured) == "INFO Cache hit [question_length=12, request_id=abc123]"
+    assert formatter.format(plain) == "INFO Server ready [request_id=abc123]"
+
+
+def test_text_formatter_without_correlation_id():
+    # Arrange
+    formatter = TextFormatter("%(message)s")
+    record = _record(StructuredMessage("Cache hit", {"question_length": 12}))
+    CorrelationFilter().filter(record)
+    
+    # Act / Assert
+    assert formatter.format(record) == "Cache hit [question_length=12]"
+
+
+def test_json_formatter_emits_fields():
+    # Arrange
+    record = _record(StructuredMessage("API request successful", {"status_code": 200, "size": lambda: 42}))
+    with correlation_scope("abc123"):
+        CorrelationFilter().filter(record)
+    
+    # Act
+    entry = json.loads(JsonFormatter().format(record))
+    
+    # Assert
+    assert entry["message"] == "API request successful"
+    assert entry["status_code"] == 200
+    assert entry["size"] == 42
+    assert entry["request_id"] == "abc123"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "icsaet_mcp.test"
+    assert "ts" in entry
+
+
+def test_json_formatter_plain_message_and_exception():
+    # Arrange
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        import sys
+        record = logging.LogRecord("x", logging.ERROR, __file__, 1, "Failed %s", ("hard",), sys.exc_info())
+    
+    # Act
+    entry = json.loads(JsonFormatter().format(record))
+    
+    # Assert
+    assert entry["message"] == "Failed hard"
+    assert "ValueError: boom" in entry["exception"]
+    assert "request_id" not in entry
+
+
+def test_queue_handler_keeps_structure_and_resolves_fields():
+    # Arrange
+    log_queue = queue.Queue()
+    handler = StructuredQueueHandler(log_queue)
+    handler.addFilter(CorrelationFilter())
+    calls = []
+    
+    # Act
+    with correlation_scope("abc123"):
+        handler.handle(_record(StructuredMessage("Query question", {"question": lambda: calls.append(1) or "q"})))
+    handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "value %d", (5,), None))
+    structured = log_queue.get_nowait()
+    plain = log_queue.get_nowait()
+    
+    # Assert
+    assert isinstance(structured.msg, StructuredMessage)
+    assert structured.msg.fields == {"question": "q"}
+    assert structured.correlation_id == "abc123"
+    assert calls == [1]
+    assert plain.msg == "value 5" and plain.args is None
+
+
+@pytest.mark.asyncio
+async def test_correlation_id_follows_child_tasks():
+    # Arrange
+    import asyncio
+    
+    async def child():
+        return correlation_id.get()
+    
+    # Act
+    with correlation_scope("parent"):
+        seen = await asyncio.create_task(child())
+    
+    # Assert
+    assert seen == "parent"
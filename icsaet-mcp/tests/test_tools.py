@@ -1,9 +1,21 @@
 """Tests for MCP tools."""
 
+import asyncio
+import json
+import time
+
 import httpx
 import pytest
 
-from icsaet_mcp.tools import _query_impl
+from icsaet_mcp.cache import cache_key, get_response_cache
+from icsaet_mcp.circuit_breaker import get_circuit_breaker
+from icsaet_mcp.disk_cache import close_disk_cache
+from icsaet_mcp.hedging import get_hedger
+from icsaet_mcp.metrics import get_metrics
+from icsaet_mcp.ratelimit import get_upstream_limiter
+from icsaet_mcp.structured_logging import correlation_id, correlation_scope
+from icsaet_mcp import tools
+from icsaet_mcp.tools import _cached_query, _query_impl, _query_many_impl, _server_stats_impl
 
 
 @pytest.mark.asyncio
@@ -112,9 +124,10 @@ async def test_query_timeout_error(httpx_mock):
 
 
 @pytest.mark.asyncio
-async def test_query_connection_error(httpx_mock):
+async def test_query_connection_error(httpx_mock, monkeypatch):
     # Arrange
-    httpx_mock.add_exception(httpx.ConnectError("Connection failed"))
+    monkeypatch.setenv("ICAET_RETRY_BASE_DELAY", "0")
+    httpx_mock.add_exception(httpx.ConnectError("Connection failed"), is_reusable=True)
     
     # Act
     result = await _query_impl("test question", "test-api-key", "test@example.com")
@@ -122,6 +135,7 @@ async def test_query_connection_error(httpx_mock):
     # Assert
     assert "error" in result
     assert "Request failed" in result["error"]
+    assert len(httpx_mock.get_requests()) == 3
 
 
 @pytest.mark.asyncio
@@ -213,3 +227,657 @@ async def test_query_uses_correct_endpoint(httpx_mock):
     request = httpx_mock.get_request()
     assert str(request.url) == "https://icaet-dev.wesleyreisz.com/query"
     assert request.method == "POST"
+
+
+@pytest.mark.asyncio
+async def test_cached_query_serves_repeat_from_cache(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Cached answer", "sources": []},
+        status_code=200
+    )
+    
+    # Act
+    first = await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    second = await _cached_query("  what is icaet ", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert first == second
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_query_does_not_cache_errors(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        status_code=500,
+        text="Internal Server Error"
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Recovered", "sources": []},
+        status_code=200
+    )
+    
+    # Act
+    first = await _cached_query("test question", "test-api-key", "test@example.com")
+    second = await _cached_query("test question", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert "error" in first
+    assert second["answer"] == "Recovered"
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_query_disabled_always_calls_upstream(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_ENABLED", "false")
+    monkeypatch.setenv("ICAET_DISK_CACHE_ENABLED", "false")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Test", "sources": []},
+        status_code=200,
+        is_reusable=True
+    )
+    
+    # Act
+    await _cached_query("test", "test-api-key", "test@example.com")
+    await _cached_query("test", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_served_from_disk_cache_after_restart(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Persisted answer", "sources": []},
+        status_code=200
+    )
+    await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    close_disk_cache()
+    
+    # Act
+    result = await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert result["answer"] == "Persisted answer"
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_query_coalesces_concurrent_identical_questions(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Shared answer", "sources": []},
+        status_code=200
+    )
+    
+    # Act
+    results = await asyncio.gather(*[
+        _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+        for _ in range(5)
+    ])
+    
+    # Assert
+    assert all(result["answer"] == "Shared answer" for result in results)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+async def _stale_then_revalidate(question: str) -> dict:
+    """Move the cache past its soft TTL, request the question again and wait for the background refresh."""
+    later = time.monotonic() + 61
+    get_response_cache()._clock = lambda: later
+    result = await _cached_query(question, "test-api-key", "test@example.com")
+    await asyncio.gather(*tools._revalidations.values())
+    return result
+
+
+@pytest.mark.asyncio
+async def test_stale_answer_served_while_refreshing(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_SOFT_TTL", "60")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Old answer", "sources": []},
+        status_code=200
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "New answer", "sources": []},
+        status_code=200
+    )
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Act
+    stale = await _stale_then_revalidate("What is ICAET?")
+    refreshed = await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    metrics = get_metrics()
+    assert stale["answer"] == "Old answer"
+    assert refreshed["answer"] == "New answer"
+    assert metrics.counter("cache_hits", tier="stale").value == 1
+    assert metrics.counter("revalidations", result="changed").value == 1
+
+
+@pytest.mark.asyncio
+async def test_revalidation_sends_etag_and_accepts_304(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_SOFT_TTL", "60")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Old answer", "sources": []},
+        headers={"ETag": '"v1"'},
+        status_code=200
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        status_code=304
+    )
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Act
+    stale = await _stale_then_revalidate("What is ICAET?")
+    
+    # Assert
+    requests = httpx_mock.get_requests()
+    assert stale["answer"] == "Old answer"
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert get_metrics().counter("revalidations", result="not_modified").value == 1
+
+
+@pytest.mark.asyncio
+async def test_revalidation_detects_unchanged_content(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_SOFT_TTL", "60")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Same answer", "sources": []},
+        status_code=200,
+        is_reusable=True
+    )
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Act
+    await _stale_then_revalidate("What is ICAET?")
+    
+    # Assert
+    assert get_metrics().counter("revalidations", result="unchanged").value == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_revalidation_keeps_stale_answer(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_SOFT_TTL", "60")
+    monkeypatch.setenv("ICAET_RETRY_MAX_ATTEMPTS", "1")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Old answer", "sources": []},
+        status_code=200
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        status_code=500,
+        text="Internal Server Error"
+    )
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Act
+    await _stale_then_revalidate("What is ICAET?")
+    
+    # Assert
+    assert get_response_cache().get(cache_key("What is ICAET?", "test@example.com"))["answer"] == "Old answer"
+    assert get_metrics().counter("revalidations", result="error").value == 1
+
+
+@pytest.mark.asyncio
+async def test_revalidation_with_open_circuit_fails_instead_of_serving_disk_copy(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_SOFT_TTL", "60")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Old answer", "sources": []},
+        status_code=200
+    )
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    breaker = get_circuit_breaker()
+    for _ in range(breaker.min_calls):
+        breaker.record(False, 0.1)
+    
+    # Act
+    stale = await _stale_then_revalidate("What is ICAET?")
+    
+    # Assert
+    cache = get_response_cache()
+    entry = cache.peek(cache_key("What is ICAET?", "test@example.com"))
+    assert stale["answer"] == "Old answer"
+    assert cache.is_stale(entry)
+    assert entry.refresh_failures == 1
+    assert get_metrics().counter("revalidations", result="error").value == 1
+    assert get_metrics().counter("revalidations", result="unchanged").value == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_revalidation_is_not_retried_until_backoff_passes(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CACHE_SOFT_TTL", "60")
+    monkeypatch.setenv("ICAET_CACHE_REFRESH_BACKOFF", "30")
+    monkeypatch.setenv("ICAET_RETRY_MAX_ATTEMPTS", "1")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Old answer", "sources": []},
+        status_code=200
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        status_code=500,
+        text="Internal Server Error",
+        is_reusable=True
+    )
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    await _stale_then_revalidate("What is ICAET?")
+    
+    # Act
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    scheduled_during_backoff = len(tools._revalidations)
+    later = time.monotonic() + 61 + 31
+    get_response_cache()._clock = lambda: later
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    scheduled_after_backoff = len(tools._revalidations)
+    await asyncio.gather(*tools._revalidations.values())
+    
+    # Assert
+    assert scheduled_during_backoff == 0
+    assert scheduled_after_backoff == 1
+    assert len(httpx_mock.get_requests()) == 3
+    assert get_metrics().counter("revalidations", result="error").value == 2
+
+
+@pytest.mark.asyncio
+async def test_query_many_returns_results_in_input_order(httpx_mock):
+    # Arrange
+    for answer in ("first", "second", "third"):
+        httpx_mock.add_response(
+            method="POST",
+            url="https://icaet-dev.wesleyreisz.com/query",
+            match_json={"email": "test@example.com", "question": f"Question {answer}"},
+            json={"answer": answer, "sources": []},
+            status_code=200
+        )
+    questions = ["Question first", "Question second", "Question third"]
+    
+    # Act
+    result = await _query_many_impl(questions, "test-api-key", "test@example.com")
+    
+    # Assert
+    assert [item["question"] for item in result["results"]] == questions
+    assert [item["result"]["answer"] for item in result["results"]] == ["first", "second", "third"]
+
+
+@pytest.mark.asyncio
+async def test_query_many_reports_per_item_errors(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        match_json={"email": "test@example.com", "question": "good"},
+        json={"answer": "ok", "sources": []},
+        status_code=200
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        match_json={"email": "test@example.com", "question": "bad"},
+        status_code=400,
+        text="Bad Request"
+    )
+    
+    # Act
+    result = await _query_many_impl(["good", "bad"], "test-api-key", "test@example.com")
+    
+    # Assert
+    assert result["results"][0]["result"]["answer"] == "ok"
+    assert "400" in result["results"][1]["result"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_query_many_respects_concurrency_limit(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_QUERY_MANY_CONCURRENCY", "2")
+    active = 0
+    peak = 0
+    
+    async def fake_query(question, api_key, user_email):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"answer": question}
+    
+    monkeypatch.setattr("icsaet_mcp.tools._cached_query", fake_query)
+    
+    # Act
+    result = await _query_many_impl([f"q{i}" for i in range(6)], "test-api-key", "test@example.com")
+    
+    # Assert
+    assert peak == 2
+    assert len(result["results"]) == 6
+
+
+@pytest.mark.asyncio
+async def test_query_many_rejects_oversized_batch(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_QUERY_MANY_MAX_QUESTIONS", "2")
+    
+    # Act
+    result = await _query_many_impl(["a", "b", "c"], "test-api-key", "test@example.com")
+    
+    # Assert
+    assert "error" in result
+    assert "Too many questions" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_query_many_invokes_callback_as_completed(monkeypatch):
+    # Arrange
+    async def fake_query(question, api_key, user_email):
+        await asyncio.sleep(0.02 if question == "slow" else 0)
+        return {"answer": question}
+    
+    monkeypatch.setattr("icsaet_mcp.tools._cached_query", fake_query)
+    seen = []
+    
+    async def on_result(index, result, completed):
+        seen.append((index, result["answer"], completed))
+    
+    # Act
+    await _query_many_impl(["slow", "fast"], "test-api-key", "test@example.com", on_result=on_result)
+    
+    # Assert
+    assert seen == [(1, "fast", 1), (0, "slow", 2)]
+
+
+@pytest.mark.asyncio
+async def test_query_many_tool_streams_progress(monkeypatch):
+    # Arrange
+    from fastmcp import Client
+    from icsaet_mcp.server import mcp
+    
+    async def fake_query(question, api_key, user_email):
+        return {"answer": question}
+    
+    monkeypatch.setattr("icsaet_mcp.tools._cached_query", fake_query)
+    progress = []
+    
+    async def progress_handler(value, total, message):
+        progress.append((value, total, json.loads(message)))
+    
+    # Act
+    async with Client(mcp, progress_handler=progress_handler) as client:
+        result = await client.call_tool(
+            "query_many",
+            {"questions": ["a", "b"], "return_as_completed": True}
+        )
+    
+    # Assert
+    assert [item["result"]["answer"] for item in result.data["results"]] == ["a", "b"]
+    assert len(progress) == 2
+    assert progress[-1][0] == 2
+    assert progress[-1][1] == 2
+
+
+@pytest.mark.asyncio
+async def test_query_429_reduces_upstream_concurrency(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        status_code=429,
+        text="Too Many Requests"
+    )
+    limiter = get_upstream_limiter()
+    initial_limit = limiter.stats()["limit"]
+    
+    # Act
+    result = await _query_impl("test question", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert "429" in result["error"]
+    assert limiter.stats()["limit"] < initial_limit
+    assert limiter.stats()["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_query_retries_transient_503(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_RETRY_BASE_DELAY", "0")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        status_code=503,
+        text="Service Unavailable"
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Recovered", "sources": []},
+        status_code=200
+    )
+    
+    # Act
+    result = await _query_impl("test question", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert result["answer"] == "Recovered"
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_with_hedging_enabled(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_HEDGE_ENABLED", "true")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Test answer", "sources": []},
+        status_code=200
+    )
+    
+    # Act
+    result = await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert result["answer"] == "Test answer"
+    assert get_hedger().stats()["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_query_fails_fast_when_circuit_open(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_BREAKER_MIN_CALLS", "2")
+    monkeypatch.setenv("ICAET_RETRY_MAX_ATTEMPTS", "1")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        status_code=500,
+        text="Internal Server Error",
+        is_reusable=True
+    )
+    await _query_impl("first", "test-api-key", "test@example.com")
+    await _query_impl("second", "test-api-key", "test@example.com")
+    
+    # Act
+    result = await _query_impl("third", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert "Circuit breaker open" in result["error"]
+    assert len(httpx_mock.get_requests()) == 2
+    assert get_circuit_breaker().stats()["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_breaker_latency_excludes_waiting_for_a_slot(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_CONCURRENCY_INITIAL", "1")
+    monkeypatch.setenv("ICAET_CONCURRENCY_MAX", "1")
+    monkeypatch.setenv("ICAET_BREAKER_SLOW_CALL_SECONDS", "0.3")
+    
+    async def slow_upstream(request):
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"answer": "ok", "sources": []})
+    
+    httpx_mock.add_callback(slow_upstream, is_reusable=True)
+    
+    # Act
+    await asyncio.gather(*(
+        _query_impl(f"Question number {i}", "test-api-key", "test@example.com") for i in range(4)
+    ))
+    
+    # Assert
+    stats = get_circuit_breaker().stats()
+    assert stats["calls"] == 4
+    assert stats["slow_rate"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_query_serves_stale_disk_entry_when_circuit_open(httpx_mock, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_DISK_CACHE_TTL", "0.01")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Old answer", "sources": []},
+        status_code=200
+    )
+    await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    await asyncio.sleep(0.02)
+    breaker = get_circuit_breaker()
+    for _ in range(breaker.min_calls):
+        breaker.record(False, 0.1)
+    
+    # Act
+    result = await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    assert result["answer"] == "Old answer"
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_query_many_tags_each_question_with_batch_correlation_id(monkeypatch):
+    # Arrange
+    seen = {}
+    
+    async def fake_query(question, api_key, user_email):
+        seen[question] = correlation_id.get()
+        return {"answer": question}
+    
+    monkeypatch.setattr("icsaet_mcp.tools._cached_query", fake_query)
+    
+    # Act
+    with correlation_scope("batch1"):
+        await _query_many_impl(["a", "b"], "test-api-key", "test@example.com")
+    
+    # Assert
+    assert seen == {"a": "batch1.0", "b": "batch1.1"}
+
+
+@pytest.mark.asyncio
+async def test_cached_query_records_metrics(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Test answer"},
+        status_code=200
+    )
+    
+    # Act
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    snapshot = get_metrics().snapshot()
+    counters = snapshot["counters"]
+    assert counters["queries"] == 2
+    assert counters["upstream_requests"] == 1
+    assert counters["upstream_responses{status=200}"] == 1
+    assert counters["cache_hits{tier=memory}"] == 1
+    assert counters["bytes_in"] == len(b'{"answer":"Test answer"}')
+    assert counters["bytes_out"] > 0
+    assert snapshot["gauges"]["queries_in_flight"] == 0
+    assert snapshot["histograms"]["query_latency"]["count"] == 2
+    assert snapshot["histograms"]["upstream_latency"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_query_errors_counted_by_type(httpx_mock):
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        status_code=404,
+        text="Not found"
+    )
+    
+    # Act
+    await _query_impl("What is ICAET?", "test-api-key", "test@example.com")
+    
+    # Assert
+    counters = get_metrics().snapshot()["counters"]
+    assert counters["query_errors{type=HTTPStatusError}"] == 1
+    assert counters["upstream_responses{status=404}"] == 1
+
+
+def test_server_stats_includes_component_stats():
+    # Act
+    stats = _server_stats_impl()
+    
+    # Assert
+    assert set(stats) == {"counters", "gauges", "histograms", "components"}
+    assert stats["components"]["response_cache"]["entries"] == 0
+    assert stats["components"]["hedger"] is None
+    assert "coalesced" in stats["components"]["singleflight"]
+
+
+@pytest.mark.asyncio
+async def test_server_stats_tool_and_resource(monkeypatch):
+    # Arrange
+    from fastmcp import Client
+    from icsaet_mcp.server import mcp
+    
+    get_metrics().counter("queries").inc()
+    
+    # Act
+    async with Client(mcp) as client:
+        result = await client.call_tool("server_stats", {})
+        resource = await client.read_resource("icaet://server-stats")
+    
+    # Assert
+    assert result.data["counters"]["queries"] == 1
+    assert json.loads(resource[0].text)["counters"]["queries"] == 1
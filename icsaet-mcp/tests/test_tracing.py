@@ -0,0 +1,206 @@
+"""Tests for tracing spans."""
+
+import json
+import random
+import threading
+
+import pytest
+
+from icsaet_mcp.http_client import aclose_client
+from icsaet_mcp.structured_logging import correlation_scope
+from icsaet_mcp.tools import _cached_query
+from icsaet_mcp.tracing import NdjsonExporter, Tracer, get_tracer, record_http_event, reset_tracer, span
+
+
+def _tracer(sample_rate=1.0):
+    exported = []
+    tracer = Tracer(sample_rate=sample_rate, exporter=exported.extend, rng=random.Random(1))
+    return tracer, exported
+
+
+def test_tracer_exports_nested_spans_with_parent_ids():
+    # Arrange
+    tracer, exported = _tracer()
+    
+    # Act
+    with tracer.trace("query", question_length=5):
+        with span("upstream.attempt") as attempt:
+            attempt.set(status_code=200)
+            with span("json.decode"):
+                pass
+    
+    # Assert
+    by_name = {item["name"]: item for item in exported}
+    assert list(by_name) == ["query", "upstream.attempt", "json.decode"]
+    assert by_name["query"]["parent_id"] is None
+    assert by_name["query"]["attributes"] == {"question_length": 5}
+    assert by_name["upstream.attempt"]["parent_id"] == by_name["query"]["span_id"]
+    assert by_name["upstream.attempt"]["attributes"] == {"status_code": 200}
+    assert by_name["json.decode"]["parent_id"] == by_name["upstream.attempt"]["span_id"]
+    assert len({item["trace_id"] for item in exported}) == 1
+
+
+def test_trace_id_is_correlation_id():
+    # Arrange
+    tracer, exported = _tracer()
+    
+    # Act
+    with correlation_scope("abc123"):
+        with tracer.trace("query"):
+            pass
+    
+    # Assert
+    assert exported[0]["trace_id"] == "abc123"
+
+
+def test_unsampled_trace_records_nothing():
+    # Arrange
+    tracer, exported = _tracer(sample_rate=0.0)
+    
+    # Act
+    with tracer.trace("query") as root:
+        with span("upstream.attempt") as child:
+            record_http_event("connection.connect_tcp.started")
+    
+    # Assert
+    assert root is None
+    assert child is None
+    assert exported == []
+    assert tracer.stats() == {"sample_rate": 0.0, "started": 1, "sampled": 0}
+
+
+def test_sample_rate_selects_fraction_of_traces():
+    # Arrange
+    tracer, exported = _tracer(sample_rate=0.25)
+    
+    # Act
+    for _ in range(1000):
+        with tracer.trace("query"):
+            pass
+    
+    # Assert
+    assert 150 < tracer.sampled < 350
+    assert len(exported) == tracer.sampled
+
+
+def test_span_records_exception_type():
+    # Arrange
+    tracer, exported = _tracer()
+    
+    # Act
+    with pytest.raises(ValueError):
+        with tracer.trace("query"):
+            with span("json.decode"):
+                raise ValueError("bad json")
+    
+    # Assert
+    assert [item["attributes"]["error"] for item in exported] == ["ValueError", "ValueError"]
+
+
+def test_http_events_become_phase_spans():
+    # Arrange
+    tracer, exported = _tracer()
+    
+    # Act
+    with tracer.trace("query"):
+        with span("upstream.attempt"):
+            for event in (
+                "connection.connect_tcp.started", "connection.connect_tcp.complete",
+                "http11.send_request_headers.started", "http11.send_request_headers.complete",
+                "http11.receive_response_headers.started", "http11.receive_response_headers.failed",
+                "http11.response_closed.started", "http11.response_closed.complete"
+            ):
+                record_http_event(event)
+    
+    # Assert
+    phases = {item["name"]: item for item in exported if item["name"].startswith("http.")}
+    assert list(phases) == ["http.connect", "http.send_headers", "http.server_wait"]
+    assert phases["http.server_wait"]["attributes"] == {"error": "failed"}
+    attempt = next(item for item in exported if item["name"] == "upstream.attempt")
+    assert all(item["parent_id"] == attempt["span_id"] for item in phases.values())
+
+
+def test_ndjson_exporter_appends_and_rotates(tmp_path):
+    # Arrange
+    path = tmp_path / "traces" / "traces.ndjson"
+    exporter = NdjsonExporter(path, max_bytes=50)
+    
+    # Act
+    exporter.export([{"name": "query", "duration_ms": 1.0}, {"name": "json.decode", "duration_ms": 0.1}])
+    exporter.export([{"name": "query", "duration_ms": 2.0}])
+    exporter.close()
+    
+    # Assert
+    rotated = [json.loads(line) for line in (tmp_path / "traces" / "traces.ndjson.1").read_text().splitlines()]
+    current = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [item["name"] for item in rotated] == ["query", "json.decode"]
+    assert current == [{"name": "query", "duration_ms": 2.0}]
+
+
+def test_ndjson_exporter_disables_itself_when_unwritable(tmp_path):
+    # Arrange
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    exporter = NdjsonExporter(blocker / "traces.ndjson")
+    
+    # Act
+    exporter.export([{"name": "query"}])
+    exporter.flush()
+    
+    # Assert
+    assert exporter.unavailable is True
+    assert exporter.exported == 0
+    exporter.close()
+
+
+def test_ndjson_exporter_writes_on_background_thread(tmp_path, monkeypatch):
+    # Arrange
+    exporter = NdjsonExporter(tmp_path / "traces.ndjson")
+    writers = []
+    write = exporter._write
+    monkeypatch.setattr(exporter, "_write", lambda spans: (writers.append(threading.current_thread().name), write(spans)))
+    
+    # Act
+    exporter.export([{"name": "query"}])
+    exporter.close()
+    
+    # Assert
+    assert writers == ["icaet-trace-writer"]
+    assert exporter.exported == 1
+    assert exporter._thread is None
+
+
+def test_get_tracer_disabled_by_default(monkeypatch):
+    # Arrange
+    monkeypatch.delenv("ICAET_TRACE_SAMPLE_RATE", raising=False)
+    
+    # Act
+    tracer = get_tracer()
+    
+    # Assert
+    assert tracer is None
+
+
+@pytest.mark.asyncio
+async def test_query_trace_breaks_down_upstream_call(fault_server, tmp_path, monkeypatch):
+    # Arrange
+    server = await fault_server()
+    trace_path = tmp_path / "traces.ndjson"
+    monkeypatch.setenv("ICAET_API_URL", f"{server.url}/query")
+    monkeypatch.setenv("ICAET_TRACE_SAMPLE_RATE", "1")
+    monkeypatch.setenv("ICAET_TRACE_PATH", str(trace_path))
+    
+    # Act
+    with correlation_scope("req1"):
+        result = await _cached_query("What is ICAET?", "test-api-key", "test@example.com")
+    await aclose_client()
+    reset_tracer()
+    
+    # Assert
+    assert "error" not in result
+    spans = [json.loads(line) for line in trace_path.read_text().splitlines()]
+    names = [item["name"] for item in spans]
+    assert names[0] == "query"
+    for name in ("disk_cache.get", "upstream.attempt", "http.connect", "http.server_wait", "http.download", "json.decode", "disk_cache.set"):
+        assert name in names
+    assert {item["trace_id"] for item in spans} == {"req1"}
@@ -2,7 +2,14 @@
 
 import pytest
 
-from icsaet_mcp.utils import sanitize_api_key, sanitize_email, sanitize_question
+from icsaet_mcp.utils import (
+    env_bool,
+    env_float,
+    env_int,
+    sanitize_api_key,
+    sanitize_email,
+    sanitize_question,
+)
 
 
 def test_sanitize_api_key_normal():
@@ -191,3 +198,71 @@ def test_sanitize_question_custom_max_len():
     # Assert
     assert result == "Hello..."
 
+
+def test_env_int_valid(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_TEST_INT", "42")
+    
+    # Act
+    result = env_int("ICAET_TEST_INT", 7)
+    
+    # Assert
+    assert result == 42
+
+
+def test_env_int_invalid_falls_back(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_TEST_INT", "not-a-number")
+    
+    # Act
+    result = env_int("ICAET_TEST_INT", 7)
+    
+    # Assert
+    assert result == 7
+
+
+def test_env_float_unset_falls_back(monkeypatch):
+    # Arrange
+    monkeypatch.delenv("ICAET_TEST_FLOAT", raising=False)
+    
+    # Act
+    result = env_float("ICAET_TEST_FLOAT", 1.5)
+    
+    # Assert
+    assert result == 1.5
+
+
+def test_env_float_valid(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_TEST_FLOAT", "0.25")
+    
+    # Act
+    result = env_float("ICAET_TEST_FLOAT", 1.5)
+    
+    # Assert
+    assert result == 0.25
+
+
+def test_env_bool_truthy_and_falsy(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_TEST_BOOL", "yes")
+    
+    # Act
+    truthy = env_bool("ICAET_TEST_BOOL", False)
+    monkeypatch.setenv("ICAET_TEST_BOOL", "0")
+    falsy = env_bool("ICAET_TEST_BOOL", True)
+    
+    # Assert
+    assert truthy is True
+    assert falsy is False
+
+
+def test_env_bool_invalid_falls_back(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_TEST_BOOL", "maybe")
+    
+    # Act
+    result = env_bool("ICAET_TEST_BOOL", True)
+    
+    # Assert
+    assert result is True
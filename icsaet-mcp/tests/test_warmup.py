@@ -0,0 +1,209 @@
+"""Tests for cache warm-up."""
+
+import asyncio
+import json
+
+import pytest
+
+from icsaet_mcp import tools
+from icsaet_mcp.metrics import get_metrics
+from icsaet_mcp.popularity import get_popularity_tracker
+from icsaet_mcp.tools import _cached_query
+from icsaet_mcp.warmup import example_questions, load_question_file, run_warmup, warm_cache, warmup_questions, warmup_task
+
+
+def test_example_questions_parsed_from_prompt():
+    # Act
+    questions = example_questions()
+    
+    # Assert
+    assert len(questions) == 10
+    assert questions[0] == "What did Leslie Miley talk about?"
+
+
+def test_load_question_file_skips_blank_lines_and_comments(tmp_path):
+    # Arrange
+    path = tmp_path / "questions.txt"
+    path.write_text("# Team questions\nWhat is ICAET?\n\n  What is TDD?  \n")
+    
+    # Act
+    questions = load_question_file(path)
+    
+    # Assert
+    assert questions == ["What is ICAET?", "What is TDD?"]
+
+
+def test_load_question_file_missing_is_empty(tmp_path):
+    # Act
+    questions = load_question_file(tmp_path / "missing.txt")
+    
+    # Assert
+    assert questions == []
+
+
+def test_warmup_questions_puts_file_first_and_deduplicates(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "questions.txt"
+    path.write_text("What is ICAET?\nwhat did leslie miley talk about\n")
+    monkeypatch.setenv("ICAET_WARMUP_FILE", str(path))
+    
+    # Act
+    questions = warmup_questions()
+    
+    # Assert
+    assert questions[:2] == ["What is ICAET?", "what did leslie miley talk about"]
+    assert "What did Leslie Miley talk about?" not in questions
+    assert len(questions) == 11
+
+
+def test_warmup_questions_without_examples_and_capped(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "questions.txt"
+    path.write_text("Q1\nQ2\nQ3\n")
+    monkeypatch.setenv("ICAET_WARMUP_FILE", str(path))
+    monkeypatch.setenv("ICAET_WARMUP_EXAMPLES", "false")
+    monkeypatch.setenv("ICAET_WARMUP_MAX_QUESTIONS", "2")
+    
+    # Act
+    questions = warmup_questions()
+    
+    # Assert
+    assert questions == ["Q1", "Q2"]
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_respects_concurrency():
+    # Arrange
+    running = 0
+    peak = 0
+    
+    async def fetch(question):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"answer": question}
+    
+    # Act
+    counts = await warm_cache([f"Q{i}" for i in range(6)], fetch, concurrency=2)
+    
+    # Assert
+    assert peak == 2
+    assert counts == {"fetched": 6, "errors": 0, "skipped": 0}
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_stops_after_consecutive_errors():
+    # Arrange
+    calls = []
+    
+    async def fetch(question):
+        calls.append(question)
+        return {"error": "API error 401"}
+    
+    # Act
+    counts = await warm_cache([f"Q{i}" for i in range(10)], fetch, concurrency=1, max_consecutive_errors=3)
+    
+    # Assert
+    assert len(calls) == 3
+    assert counts == {"fetched": 0, "errors": 3, "skipped": 7}
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_waits_while_busy():
+    # Arrange
+    busy_checks = iter([True, True, False])
+    fetched = []
+    
+    async def fetch(question):
+        fetched.append(question)
+        return {"answer": question}
+    
+    # Act
+    counts = await warm_cache(["Q"], fetch, busy=lambda: next(busy_checks), poll_interval=0)
+    
+    # Assert
+    assert fetched == ["Q"]
+    assert counts["fetched"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_warmup_fills_response_cache(httpx_mock, tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "questions.txt"
+    path.write_text("What is ICAET?\n")
+    monkeypatch.setattr(tools, "ICAET_API_KEY", "warmup-api-key")
+    monkeypatch.setattr(tools, "USER_EMAIL", "warmup@example.com")
+    monkeypatch.setenv("ICAET_WARMUP_FILE", str(path))
+    monkeypatch.setenv("ICAET_WARMUP_EXAMPLES", "false")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Warm answer"},
+        status_code=200
+    )
+    
+    # Act
+    await run_warmup()
+    result = await _cached_query("What is ICAET?", "warmup-api-key", "warmup@example.com")
+    
+    # Assert
+    request = httpx_mock.get_request()
+    assert result == {"answer": "Warm answer"}
+    assert request.headers["x-api-key"] == "warmup-api-key"
+    assert json.loads(request.content)["email"] == "warmup@example.com"
+
+
+@pytest.mark.asyncio
+async def test_run_warmup_is_not_counted_as_queries(httpx_mock, tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "questions.txt"
+    path.write_text("What is ICAET?\n")
+    monkeypatch.setenv("ICAET_WARMUP_FILE", str(path))
+    monkeypatch.setenv("ICAET_WARMUP_EXAMPLES", "false")
+    monkeypatch.setenv("ICAET_HOT_REFRESH_ENABLED", "true")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://icaet-dev.wesleyreisz.com/query",
+        json={"answer": "Warm answer"},
+        status_code=200
+    )
+    
+    # Act
+    await run_warmup()
+    
+    # Assert
+    assert get_metrics().counter("queries").value == 0
+    assert get_metrics().gauge("queries_in_flight").value == 0
+    assert get_popularity_tracker().recorded == 0
+
+
+@pytest.mark.asyncio
+async def test_warmup_task_disabled_by_default(monkeypatch):
+    # Arrange
+    monkeypatch.delenv("ICAET_WARMUP_ENABLED", raising=False)
+    tasks_before = len(asyncio.all_tasks())
+    
+    # Act
+    async with warmup_task():
+        running = len(asyncio.all_tasks())
+    
+    # Assert
+    assert running == tasks_before
+
+
+@pytest.mark.asyncio
+async def test_warmup_task_cancelled_on_exit(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ICAET_WARMUP_ENABLED", "true")
+    monkeypatch.setenv("ICAET_WARMUP_DELAY", "60")
+    tasks_before = len(asyncio.all_tasks())
+    
+    # Act
+    async with warmup_task():
+        running = len(asyncio.all_tasks())
+    
+    # Assert
+    assert running == tasks_before + 1
+    assert len(asyncio.all_tasks()) == tasks_before